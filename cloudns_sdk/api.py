@@ -7,8 +7,13 @@ Email: komal.paudyal@icloud.com
 This module provides a Python interface to interact with the ClouDNS API.
 """
 
+import copy
+import time
 import requests
-from .rate_limit import rate_limited
+from .rate_limit import AdaptiveRateLimiter, PriorityScheduler, is_throttled
+from .circuit_breaker import CircuitBreaker
+from .bulk import BulkExecutor
+from .planner import LatencyTracker, Plan
 from .exceptions import ClouDNSAPIException
 from .failover import FailoverAPI
 from .domains import DomainNameAPI
@@ -17,47 +22,201 @@ from .zone import DNSZoneAPI
 class ClouDNSAPI:
     BASE_URL = "https://api.cloudns.net"
     RATE_LIMIT_PER_SECOND = 20
+    THROTTLE_RETRIES = 3
+    POOL_MAXSIZE = 32
+    REQUEST_TIMEOUT = 30.0
+    _rate_limiter = AdaptiveRateLimiter(RATE_LIMIT_PER_SECOND)
+    _circuit_breaker = CircuitBreaker()
 
-    def __init__(self, auth_id=None, auth_password=None):
+    def __init__(self, auth_id=None, auth_password=None, lanes=None, default_lane=None, rate_limiter=None,
+                 circuit_breaker=None, session=None, record_cache=None, timeout=None):
         """
         Initializes the ClouDNSAPI instance with authentication credentials.
 
         Args:
             auth_id (int or str): The authentication ID for accessing the ClouDNS API.
             auth_password (str): The authentication password associated with the auth_id.
+            lanes (iterable, optional): Priority lanes (rate_limit.Lane) sharing the request rate limit.
+                Defaults to 'interactive' (weight 4) and 'bulk' (weight 1).
+            default_lane (str, optional): Lane used by calls that do not select one. Defaults to the first lane.
+            rate_limiter (RateLimiter, optional): Rate limiter backend, e.g. a rate_limit.FileRateLimiter shared by
+                all processes on the host, or a rate_limit.RedisRateLimiter shared by all hosts. Defaults to an
+                AdaptiveRateLimiter shared by all clients of this process, which lowers its rate of at most
+                RATE_LIMIT_PER_SECOND when the API throttles requests. Its current rate is reported by
+                `scheduler.limiter.stats()`.
+            circuit_breaker (CircuitBreaker, optional): Circuit breaker failing requests fast while an endpoint
+                family ('dns', 'domains', 'failover', ...) is down. Defaults to a breaker shared by all clients
+                of this process.
+            session (requests.Session, optional): HTTP session whose connection pool is used by all requests.
+                Defaults to a new session keeping up to POOL_MAXSIZE connections alive.
+            record_cache (RecordCache, optional): Enables skipping `modify_record` calls that would not change
+                the record; the number of skipped calls is `record_cache.suppressed`. Defaults to None.
+            timeout (float, optional): Seconds to wait for the API to connect and respond before the request
+                fails with requests.Timeout. Defaults to REQUEST_TIMEOUT.
         """
         self.auth_id = auth_id
         self.auth_password = auth_password
+        self.scheduler = PriorityScheduler(rate_limiter or self._rate_limiter, lanes, default_lane)
+        self.circuit_breaker = circuit_breaker or self._circuit_breaker
+        self.session = session or self._new_session()
+        self.timeout = timeout or self.REQUEST_TIMEOUT
+        self.latencies = LatencyTracker()
+        self.record_cache = record_cache
+        self._lane = None
+        self._init_apis()
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_MAXSIZE)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _init_apis(self):
         self.failover = FailoverAPI(self._auth_params, self.make_request)
         self.zone = DNSZoneAPI(self._auth_params, self.make_request, self.auth_id, self.auth_password)
+        self.zone.records.record_cache = self.record_cache
         self.domains = DomainNameAPI(self._auth_params, self.make_request, self.auth_id, self.auth_password)
 
-    @rate_limited(RATE_LIMIT_PER_SECOND)
-    def make_request(self, endpoint, method='GET', params=None, data=None):
+    def lane(self, name):
+        """
+        Context manager selecting the priority lane of all requests made by the current thread.
+
+        Args:
+            name (str): Name of the lane (e.g., 'interactive' or 'bulk').
+
+        Example:
+            with api.lane('bulk'):
+                api.zone.records.add_record('example.com', 'A', '1.3.3.1')
+        """
+        return self.scheduler.lane(name)
+
+    def in_lane(self, name):
+        """
+        Returns a view of the client whose requests use the given priority lane, from any thread.
+
+        The view shares credentials and the request scheduler with this client. Use it to hand a lane to
+        components that make requests from their own worker threads.
+
+        Args:
+            name (str): Name of the lane (e.g., 'bulk').
+
+        Returns:
+            ClouDNSAPI: The client view.
+
+        Raises:
+            ValueError: If the lane does not exist.
+        """
+        if name not in self.scheduler.lanes:
+            raise ValueError(f"Unknown lane: {name}. Expected one of {', '.join(self.scheduler.lanes)}.")
+        client = copy.copy(self)
+        client._lane = name
+        client._init_apis()
+        return client
+
+    def bulk(self, max_workers=8, lane=None, on_progress=None, max_pending=None, raise_on_failed=True,
+             keep_results=False):
+        """
+        Returns a bulk executor running SDK calls concurrently on this client's connection pool and rate limit.
+
+        Args:
+            max_workers (int, optional): Number of worker threads. Defaults to 8.
+            lane (str, optional): Priority lane of the calls (e.g., 'bulk').
+            on_progress (callable, optional): Called as `on_progress(completed, submitted, result)` after
+                each task.
+            max_pending (int, optional): Maximum number of queued or running tasks. Defaults to max_workers * 4.
+            raise_on_failed (bool, optional): Treat 'Failed' status responses as errors. Defaults to True.
+            keep_results (bool, optional): Keep the outcome of every task for `results()`. Defaults to False.
+
+        Returns:
+            BulkExecutor: The executor.
+
+        Example:
+            with api.bulk(lane='bulk', keep_results=True) as bulk:
+                futures = bulk.map('zone.records.delete_record', [('example.com', 1), ('example.com', 2)])
+            results = bulk.results()
+        """
+        return BulkExecutor(self, max_workers, lane, on_progress, max_pending, raise_on_failed, keep_results)
+
+    def dry_run(self, allow_reads=True):
+        """
+        Starts a dry run: SDK calls made through the returned plan's client are recorded, not sent.
+
+        Args:
+            allow_reads (bool, optional): Send read requests, so that operations depending on listings plan
+                exactly what they would do. Defaults to True.
+
+        Returns:
+            Plan: The plan; use `plan.client` to run the operation, then `plan.summary()` and `plan.estimate()`.
+
+        Example:
+            plan = api.dry_run()
+            plan.client.zone.records.modify_record('example.com', 123, host='www', record='1.2.3.4', ttl=300)
+            plan.estimate()
+        """
+        return Plan(self, allow_reads)
+
+    def make_request(self, endpoint, method='GET', params=None, data=None, lane=None):
         """
         Makes an HTTP request to the ClouDNS API.
 
+        Throttled requests (see rate_limit.is_throttled) are reported to the rate limiter and retried up to
+        THROTTLE_RETRIES times; the response of the last attempt is handled like any other. Network errors,
+        including requests that time out after `timeout` seconds, and HTTP 5xx responses count as failures of
+        the endpoint's circuit breaker. The circuit is checked before the request waits for a call slot and
+        again before every attempt is sent, so requests queued while the circuit opened are not sent.
+
         Args:
             endpoint (str): The API endpoint to send the request to (e.g., 'ip/get-my-ip.json').
             method (str): The HTTP method to use ('GET' or 'POST'). Default is 'GET'.
             params (dict): Optional. Query parameters for the request.
             data (dict): Optional. Data to send as the body of the request for POST methods.
+            lane (str): Optional. Priority lane of the request. Defaults to the lane selected with `lane`,
+                the lane of an `in_lane` view, or the scheduler's default lane.
 
         Returns:
             dict: JSON response from the API.
 
         Raises:
-            ValueError: If an unsupported HTTP method is provided.
+            ValueError: If an unsupported HTTP method or an unknown lane is provided.
+            RateLimitQueueFull: If the lane already has its maximum number of waiting requests.
+            CircuitOpenError: If the circuit breaker of the endpoint family is open.
+            requests.Timeout: If the API does not respond within `timeout` seconds.
             ClouDNSAPIException: If the API responds with an error status code.
         """
+        if method not in ('GET', 'POST'):
+            raise ValueError("Unsupported HTTP method")
+        lane = lane or self.scheduler.current_lane() or self._lane
         url = f"{self.BASE_URL}/{endpoint}"
         params = params or {}
-        if method == 'GET':
-            response = requests.get(url, params=params)
-        elif method == 'POST':
-            response = requests.post(url, data=data or {})
+        limiter = self.scheduler.limiter
+        self.circuit_breaker.check(endpoint)
+        for attempt in range(self.THROTTLE_RETRIES + 1):
+            self.scheduler.acquire(lane)
+            family = self.circuit_breaker.before_call(endpoint)
+            try:
+                started = time.perf_counter()
+                if method == 'GET':
+                    response = self.session.get(url, params=params, timeout=self.timeout)
+                else:
+                    response = self.session.post(url, data=data or {}, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.circuit_breaker.record_failure(family, e)
+                raise
+            except BaseException:
+                self.circuit_breaker.release(family)
+                raise
+            self.latencies.record(endpoint, time.perf_counter() - started)
+            if not is_throttled(response):
+                limiter.record_success()
+                break
+            limiter.record_throttle()
+            if attempt < self.THROTTLE_RETRIES:
+                self.circuit_breaker.release(family)
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure(family, f"HTTP {response.status_code}")
         else:
-            raise ValueError("Unsupported HTTP method")
+            self.circuit_breaker.record_success(family)
 
         if response.status_code != 200:
             raise ClouDNSAPIException(response.json())
@@ -0,0 +1,226 @@
+"""
+Account-wide backup of ClouDNS zones into a streamed, compressed tar archive.
+
+Can be used as a library (`AccountBackup`) or as a command:
+
+    CLOUDNS_AUTH_ID=... CLOUDNS_AUTH_PASSWORD=... python -m cloudns_sdk.backup backup.tar.gz \
+        --previous backup-yesterday.tar.gz.manifest.json
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .crawler import IncrementalCrawler
+from .exceptions import ClouDNSAPIException
+
+MANIFEST_VERSION = 1
+
+
+def _open_archive(path, compression):
+    """
+    Opens a tar archive for streamed writing. Returns (tar, closers), closers being closed after the tar.
+    """
+    if compression == 'gz':
+        return tarfile.open(path, mode='w|gz'), []
+    if compression == 'zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard is required for zst backups. Install it with 'pip install zstandard'.")
+        raw = open(path, 'wb')
+        writer = zstandard.ZstdCompressor().stream_writer(raw)
+        return tarfile.open(fileobj=writer, mode='w|'), [writer, raw]
+    if compression is None:
+        return tarfile.open(path, mode='w|'), []
+    raise ValueError(f"Unsupported compression: {compression}. Expected 'gz', 'zst' or None.")
+
+
+def load_manifest(path):
+    """
+    Loads a backup manifest written next to an archive.
+
+    Args:
+        path (str): Path of the manifest file.
+
+    Returns:
+        dict: The manifest.
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+class AccountBackup:
+    """
+    Backs up every zone of the account into a single streamed tar archive plus a JSON manifest.
+
+    Zones are enumerated with `DNSZoneAPI.iter_zones` and exported concurrently with
+    `TransferAPI.export_records_in_bind` (`SlaveZoneAPI.export_slave_zone` for slave zones). All calls go
+    through the client's `make_request` and therefore share its rate limit. Each export is written to the
+    archive as soon as it arrives, and at most a few exports are held in memory at a time.
+
+    When a previous manifest is given, zones whose SOA serial is unchanged are not exported again, and
+    zones whose export has the same SHA-256 as before are not written again. The manifest entry of such a
+    zone points at the archive that holds its content.
+
+    Args:
+        zone_api (DNSZoneAPI): Zone API used to list and export zones.
+        max_workers (int, optional): Number of concurrent exports. Defaults to 8.
+        compression (str, optional): 'gz', 'zst' (requires the zstandard package) or None. Defaults to 'gz'.
+        use_serials (bool, optional): Skip exporting zones whose SOA serial matches the previous manifest.
+            Defaults to True.
+
+    Example:
+        backup = AccountBackup(api.zone)
+        manifest = backup.run('backup.tar.gz', previous_manifest='old.tar.gz.manifest.json')
+    """
+
+    def __init__(self, zone_api, max_workers=8, compression='gz', use_serials=True):
+        self.zone_api = zone_api
+        self.max_workers = max_workers
+        self.compression = compression
+        self.use_serials = use_serials
+        self._signatures = IncrementalCrawler(zone_api, signature='soa')
+
+    def export_zone(self, zone, zone_type=None):
+        """
+        Exports a single zone.
+
+        Args:
+            zone (str): Domain name to export.
+            zone_type (str, optional): Type of the zone, as returned by `list_zones`. Slave zones are exported
+                with `SlaveZoneAPI.export_slave_zone`.
+
+        Returns:
+            bytes: The exported zone content.
+
+        Raises:
+            ClouDNSAPIException: If the API reports a failure.
+        """
+        if zone_type == 'slave':
+            response = self.zone_api.slaves.export_slave_zone(zone)
+        else:
+            response = self.zone_api.transfer.export_records_in_bind(zone)
+        if not isinstance(response, dict) or response.get('status') == 'Failed':
+            raise ClouDNSAPIException(response if isinstance(response, dict) else {})
+        content = response['zone'] if 'zone' in response else json.dumps(response, sort_keys=True)
+        return content.encode('utf-8')
+
+    def _backup_zone(self, zone, zone_type, previous):
+        signature = None
+        if self.use_serials and zone_type != 'slave':
+            try:
+                signature = self._signatures.zone_signature(zone)
+            except Exception:
+                signature = None
+        if previous and signature is not None and previous.get('signature') == signature:
+            return signature, None
+        return signature, self.export_zone(zone, zone_type)
+
+    def run(self, path, previous_manifest=None, zones=None, manifest_path=None):
+        """
+        Runs a backup.
+
+        Args:
+            path (str): Path of the archive to write.
+            previous_manifest (str or dict, optional): Manifest of a previous backup, or its path.
+            zones (iterable, optional): Zone dicts (with 'name' and 'type') or domain names to back up.
+                Defaults to every zone of the account.
+            manifest_path (str, optional): Where to write the manifest. Defaults to `path` + '.manifest.json'.
+
+        Returns:
+            dict: The manifest, with an entry per zone and a 'failed' mapping of zones to error messages.
+        """
+        if isinstance(previous_manifest, str):
+            previous_manifest = load_manifest(previous_manifest)
+        previous_zones = (previous_manifest or {}).get('zones', {})
+        if zones is None:
+            zones = self.zone_api.iter_zones()
+        archive_name = os.path.basename(path)
+        manifest = {'version': MANIFEST_VERSION, 'archive': archive_name, 'created': time.time(), 'zones': {},
+                    'failed': {}}
+
+        tar, closers = _open_archive(path, self.compression)
+
+        def write(zone, zone_type, future):
+            try:
+                signature, content = future.result()
+            except Exception as e:
+                manifest['failed'][zone] = str(e)
+                return
+            previous = previous_zones.get(zone)
+            if content is None:
+                manifest['zones'][zone] = dict(previous, unchanged=True)
+                return
+            digest = hashlib.sha256(content).hexdigest()
+            if previous and previous.get('sha256') == digest:
+                manifest['zones'][zone] = dict(previous, signature=signature, unchanged=True)
+                return
+            member = f"zones/{zone}.zone"
+            info = tarfile.TarInfo(member)
+            info.size = len(content)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(content))
+            manifest['zones'][zone] = {'type': zone_type, 'sha256': digest, 'size': len(content),
+                                       'signature': signature, 'archive': archive_name, 'member': member}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = {}
+                for zone in zones:
+                    name, zone_type = (zone['name'], zone.get('type')) if isinstance(zone, dict) else (zone, None)
+                    future = executor.submit(self._backup_zone, name, zone_type, previous_zones.get(name))
+                    pending[future] = (name, zone_type)
+                    if len(pending) >= self.max_workers * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            write(*pending.pop(future), future)
+                for future in list(pending):
+                    write(*pending.pop(future), future)
+
+            manifest_bytes = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+            info = tarfile.TarInfo('manifest.json')
+            info.size = len(manifest_bytes)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(manifest_bytes))
+        finally:
+            tar.close()
+            for closer in closers:
+                closer.close()
+
+        with open(manifest_path or f"{path}.manifest.json", 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        return manifest
+
+
+def main(argv=None):
+    """
+    Command line entry point: `python -m cloudns_sdk.backup`.
+
+    Credentials are read from the CLOUDNS_AUTH_ID and CLOUDNS_AUTH_PASSWORD environment variables.
+    """
+    from .api import ClouDNSAPI
+
+    parser = argparse.ArgumentParser(description="Back up all ClouDNS zones into a compressed tar archive.")
+    parser.add_argument('path', help="Archive to write (e.g., backup.tar.gz).")
+    parser.add_argument('--previous', help="Manifest of a previous backup, used to skip unchanged zones.")
+    parser.add_argument('--compression', choices=['gz', 'zst', 'none'], default='gz')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args(argv)
+
+    api = ClouDNSAPI(os.environ.get('CLOUDNS_AUTH_ID'), os.environ.get('CLOUDNS_AUTH_PASSWORD'))
+    backup = AccountBackup(api.zone, max_workers=args.workers,
+                           compression=None if args.compression == 'none' else args.compression)
+    manifest = backup.run(args.path, previous_manifest=args.previous)
+    unchanged = sum(1 for entry in manifest['zones'].values() if entry.get('unchanged'))
+    print(f"Backed up {len(manifest['zones'])} zones ({unchanged} unchanged), {len(manifest['failed'])} failed.")
+    return 1 if manifest['failed'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,335 @@
+import io
+import os
+import re
+
+CLASSES = {'IN', 'CH', 'HS', 'CS'}
+NAME_TYPES = {'CNAME', 'NS', 'PTR', 'DNAME', 'ALIAS'}
+SSHFP_ALGORITHMS = {'1': 'RSA', '2': 'DSA', '3': 'ECDSA', '4': 'ED25519'}
+SSHFP_ALGORITHM_CODES = {name: code for code, name in SSHFP_ALGORITHMS.items()}
+TTL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+TTL_PATTERN = re.compile(r'^(\d+[smhdwSMHDW]?)+$')
+
+
+def parse_ttl(value):
+    """
+    Parses a BIND TTL, with optional unit suffixes (e.g., '3600', '1h', '1h30m').
+
+    Args:
+        value (str): TTL as written in a zone file.
+
+    Returns:
+        int: TTL in seconds.
+    """
+    if value.isdigit():
+        return int(value)
+    return sum(int(number) * TTL_UNITS[unit.lower() or 's'] for number, unit in re.findall(r'(\d+)([a-zA-Z]?)', value))
+
+
+def _tokenize(line, tokens, depth):
+    """
+    Splits one physical line into tokens, honouring quotes, comments and parentheses.
+
+    Returns the new parenthesis depth.
+    """
+    position, length = 0, len(line)
+    while position < length:
+        char = line[position]
+        if char in ' \t\r\n':
+            position += 1
+        elif char == ';':
+            break
+        elif char == '(':
+            depth += 1
+            position += 1
+        elif char == ')':
+            depth -= 1
+            position += 1
+        elif char == '"':
+            position += 1
+            value = []
+            while position < length and line[position] != '"':
+                if line[position] == '\\' and position + 1 < length:
+                    position += 1
+                value.append(line[position])
+                position += 1
+            tokens.append(''.join(value))
+            position += 1
+        else:
+            start = position
+            while position < length and line[position] not in ' \t\r\n;()"':
+                position += 1
+            tokens.append(line[start:position])
+    return depth
+
+
+def _logical_lines(source):
+    tokens, depth, starts_blank = [], 0, False
+    for line in source:
+        if not tokens and depth == 0:
+            if not line.strip() or line.lstrip().startswith(';'):
+                continue
+            starts_blank = line[0] in ' \t'
+        depth = _tokenize(line, tokens, depth)
+        if depth <= 0 and tokens:
+            yield starts_blank, tokens
+            tokens, depth = [], 0
+    if tokens:
+        yield starts_blank, tokens
+
+
+def _absolute(name, origin):
+    if name.endswith('.'):
+        return name[:-1]
+    if origin is None:
+        raise ValueError(f"Relative name {name!r} found but no origin is known: pass zone or add an $ORIGIN "
+                         f"directive.")
+    if name == '@':
+        return origin
+    return f"{name}.{origin}" if origin else name
+
+
+def _relative(name, zone):
+    name = name.lower()
+    if zone:
+        if name == zone:
+            return ''
+        if name.endswith('.' + zone):
+            return name[:-len(zone) - 1]
+    return name
+
+
+def _rdata_fields(record_type, rdata, origin):
+    if record_type in NAME_TYPES:
+        return {'record': _absolute(rdata[0], origin)}
+    if record_type == 'MX':
+        return {'priority': int(rdata[0]), 'record': _absolute(rdata[1], origin)}
+    if record_type == 'SRV':
+        return {'priority': int(rdata[0]), 'weight': int(rdata[1]), 'port': int(rdata[2]),
+                'record': _absolute(rdata[3], origin)}
+    if record_type in ('TXT', 'SPF'):
+        return {'record': ''.join(rdata)}
+    if record_type == 'CAA':
+        return {'caa_flag': int(rdata[0]), 'caa_type': rdata[1], 'caa_value': ' '.join(rdata[2:])}
+    if record_type == 'SSHFP':
+        return {'algorithm': SSHFP_ALGORITHMS.get(rdata[0], rdata[0]), 'fptype': int(rdata[1]),
+                'record': ''.join(rdata[2:])}
+    if record_type in ('TLSA', 'SMIMEA'):
+        return {'tlsa_usage': int(rdata[0]), 'tlsa_selector': int(rdata[1]), 'tlsa_matching_type': int(rdata[2]),
+                'record': ''.join(rdata[3:])}
+    if record_type == 'DS':
+        return {'key_tag': int(rdata[0]), 'algorithm': int(rdata[1]), 'digest_type': int(rdata[2]),
+                'record': ''.join(rdata[3:])}
+    if record_type == 'RP':
+        return {'mail': rdata[0], 'txt': rdata[1]}
+    if record_type == 'NAPTR':
+        return {'order': rdata[0], 'pref': rdata[1], 'flag': rdata[2], 'params': rdata[3], 'regexp': rdata[4],
+                'replace': rdata[5]}
+    if record_type == 'HINFO':
+        return {'cpu': rdata[0], 'os': rdata[1]}
+    return {'record': ' '.join(rdata)}
+
+
+def parse_bind(source, zone=None, ttl=3600, base_dir=None, _origin=None, _state=None):
+    """
+    Lazily parses a BIND zone file into SDK record dicts.
+
+    The source is read line by line, so arbitrarily large zone files are parsed with constant memory.
+    $ORIGIN, $TTL and $INCLUDE directives, multi-line (parenthesised) records, quoted strings and comments
+    are supported. Owner names are converted to hosts relative to `zone` ('' for the apex), as used by
+    `RecordsAPI.add_record`.
+
+    Args:
+        source (file or str or iterable): Open text file, zone file content, or any iterable of lines.
+        zone (str, optional): Domain name of the zone. Defaults to the first $ORIGIN found; a relative name
+            or '@' before any $ORIGIN then raises ValueError.
+        ttl (int, optional): TTL used until a $TTL directive is found. Defaults to 3600.
+        base_dir (str, optional): Directory $INCLUDE paths are resolved against. Defaults to the directory
+            of `source` when it is a named file, otherwise the current directory.
+
+    Yields:
+        dict: Record data with 'host', 'type', 'ttl' and the type-specific fields (e.g., 'record', 'priority').
+
+    Raises:
+        ValueError: If a relative name, '@' or a record without owner name appears while no origin is known.
+
+    Example:
+        with open('example.com.zone') as zone_file:
+            for record in parse_bind(zone_file, 'example.com'):
+                ...
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    if base_dir is None:
+        name = getattr(source, 'name', None)
+        base_dir = os.path.dirname(os.path.abspath(name)) if isinstance(name, str) else os.getcwd()
+    zone = zone.rstrip('.').lower() if zone else zone
+    state = _state if _state is not None else {'zone': zone, 'ttl': ttl}
+    origin = _origin or zone
+    owner = origin
+
+    for starts_blank, tokens in _logical_lines(source):
+        directive = tokens[0].upper()
+        if directive == '$ORIGIN':
+            origin = _absolute(tokens[1], origin).lower()
+            if state['zone'] is None:
+                state['zone'] = origin
+            continue
+        if directive == '$TTL':
+            state['ttl'] = parse_ttl(tokens[1])
+            continue
+        if directive == '$INCLUDE':
+            path = tokens[1] if os.path.isabs(tokens[1]) else os.path.join(base_dir, tokens[1])
+            include_origin = _absolute(tokens[2], origin).lower() if len(tokens) > 2 else origin
+            with open(path, encoding='utf-8') as include_file:
+                yield from parse_bind(include_file, base_dir=os.path.dirname(path), _origin=include_origin,
+                                      _state=state)
+            continue
+
+        if not starts_blank:
+            owner = _absolute(tokens[0], origin).lower()
+            tokens = tokens[1:]
+        elif owner is None:
+            raise ValueError("Record without an owner name found but no origin is known: pass zone or add an "
+                             "$ORIGIN directive.")
+
+        record_ttl = None
+        position = 0
+        while position < len(tokens):
+            token = tokens[position]
+            if token.upper() in CLASSES:
+                position += 1
+            elif record_ttl is None and TTL_PATTERN.match(token):
+                record_ttl = parse_ttl(token)
+                position += 1
+            else:
+                break
+        if position >= len(tokens):
+            continue
+
+        record_type = tokens[position].upper()
+        record = {'host': _relative(owner, state['zone']), 'type': record_type,
+                  'ttl': record_ttl if record_ttl is not None else state['ttl']}
+        record.update(_rdata_fields(record_type, tokens[position + 1:], origin))
+        yield record
+
+
+def _escape(value):
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _quote(value, split=False):
+    """
+    Quotes a value as a zone file string. With `split`, the value is cut into character-strings of at most
+    255 UTF-8 bytes, without splitting a character, before each of them is escaped.
+    """
+    value = str(value)
+    if not split:
+        return _escape(value)
+    data = value.encode('utf-8')
+    pieces, start = [], 0
+    while True:
+        end = min(start + 255, len(data))
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(data[start:end].decode('utf-8'))
+        start = end
+        if start >= len(data):
+            break
+    return ' '.join(_escape(piece) for piece in pieces)
+
+
+def _fqdn(value):
+    value = str(value)
+    return value if value.endswith('.') else f"{value}."
+
+
+def format_bind_record(record, zone=None):
+    """
+    Formats a single SDK record dict as a BIND zone file line.
+
+    Args:
+        record (dict): Record data as returned by `list_records` or `parse_bind`.
+        zone (str, optional): Domain name of the zone. When given, hosts are written fully qualified.
+
+    Returns:
+        str: Zone file line, without the trailing newline.
+    """
+    record_type = str(record['type']).upper()
+    host = record.get('host') or '@'
+    if zone and host != '@':
+        host = _fqdn(f"{host}.{zone}")
+    elif zone:
+        host = _fqdn(zone)
+
+    value = record.get('record')
+    if record_type in NAME_TYPES:
+        rdata = _fqdn(value)
+    elif record_type == 'MX':
+        rdata = f"{record.get('priority', 10)} {_fqdn(value)}"
+    elif record_type == 'SRV':
+        rdata = f"{record.get('priority', 0)} {record.get('weight', 0)} {record.get('port', 0)} {_fqdn(value)}"
+    elif record_type in ('TXT', 'SPF'):
+        rdata = _quote(value, split=True)
+    elif record_type == 'CAA':
+        rdata = f"{record.get('caa_flag', 0)} {record.get('caa_type')} {_quote(record.get('caa_value', ''))}"
+    elif record_type == 'SSHFP':
+        algorithm = SSHFP_ALGORITHM_CODES.get(record.get('algorithm'), record.get('algorithm'))
+        rdata = f"{algorithm} {record.get('fptype')} {value}"
+    elif record_type in ('TLSA', 'SMIMEA'):
+        rdata = f"{record.get('tlsa_usage')} {record.get('tlsa_selector')} {record.get('tlsa_matching_type')} {value}"
+    elif record_type == 'DS':
+        rdata = f"{record.get('key_tag')} {record.get('algorithm')} {record.get('digest_type')} {value}"
+    elif record_type == 'RP':
+        rdata = f"{record.get('mail')} {record.get('txt')}"
+    elif record_type == 'NAPTR':
+        rdata = f"{record.get('order')} {record.get('pref')} {_quote(record.get('flag', ''))} " \
+                f"{_quote(record.get('params', ''))} {_quote(record.get('regexp', ''))} {record.get('replace')}"
+    elif record_type == 'HINFO':
+        rdata = f"{_quote(record.get('cpu', ''))} {_quote(record.get('os', ''))}"
+    else:
+        rdata = value
+
+    ttl = record.get('ttl')
+    return f"{host}\t{ttl}\tIN\t{record_type}\t{rdata}" if ttl is not None else f"{host}\tIN\t{record_type}\t{rdata}"
+
+
+def iter_bind_lines(records, zone=None, ttl=None):
+    """
+    Lazily serializes SDK record dicts into BIND zone file lines.
+
+    Args:
+        records (iterable): Record dicts, e.g. from `list_records` pages or `parse_bind`.
+        zone (str, optional): Domain name of the zone. When given, an $ORIGIN directive is emitted first.
+        ttl (int, optional): When given, a $TTL directive is emitted first.
+
+    Yields:
+        str: Zone file lines, each terminated by a newline.
+    """
+    if zone:
+        yield f"$ORIGIN {_fqdn(zone)}\n"
+    if ttl is not None:
+        yield f"$TTL {ttl}\n"
+    for record in records:
+        yield format_bind_record(record) + '\n'
+
+
+def write_bind(records, destination, zone=None, ttl=None):
+    """
+    Streams SDK record dicts to a file object in BIND format.
+
+    Args:
+        records (iterable): Record dicts, e.g. from `list_records` pages or `parse_bind`.
+        destination (file): Writable text file object.
+        zone (str, optional): Domain name of the zone, emitted as $ORIGIN.
+        ttl (int, optional): Default TTL, emitted as $TTL.
+
+    Returns:
+        int: Number of records written.
+    """
+    for line in iter_bind_lines((), zone, ttl):
+        destination.write(line)
+    count = 0
+    for record in records:
+        destination.write(format_bind_record(record) + '\n')
+        count += 1
+    return count
@@ -0,0 +1,222 @@
+import threading
+from collections import namedtuple
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from .exceptions import ClouDNSAPIException
+
+BulkResult = namedtuple('BulkResult', ['method', 'args', 'kwargs', 'result', 'error'])
+
+
+def resolve_method(client, method):
+    """
+    Resolves a dotted SDK method path (e.g., 'zone.records.delete_record') against a client.
+
+    Args:
+        client (ClouDNSAPI): Client the path is resolved against.
+        method (str or callable): Dotted path, or an already bound method, returned as is.
+
+    Returns:
+        callable: The bound method.
+    """
+    if callable(method):
+        return method
+    target = client
+    for name in method.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+class BulkExecutor:
+    """
+    Runs SDK calls on a bounded thread pool that shares the client's connection pool and rate limit.
+
+    Each submitted call returns a `concurrent.futures.Future`. Responses with a 'Failed' status are turned
+    into ClouDNSAPIException errors (unless `raise_on_failed` is False), so every task either has a result
+    or an error. Outcomes are delivered through the futures and `on_progress`; the executor itself only
+    keeps the tasks that are queued or running, plus the counters `submitted`, `completed` and `failed`.
+    With `keep_results`, it also keeps every outcome for `results`, which then grows with the job.
+
+    At most `max_pending` tasks are queued or running at a time; `submit` blocks until a task finishes when
+    the limit is reached, so arbitrarily long task streams use bounded memory unless `keep_results` is set.
+
+    Args:
+        client (ClouDNSAPI): Client making the calls.
+        max_workers (int, optional): Number of worker threads. Defaults to 8.
+        lane (str, optional): Priority lane of all calls (see `ClouDNSAPI.in_lane`).
+        on_progress (callable, optional): Called as `on_progress(completed, submitted, result)` after each
+            task, from the worker thread that ran it.
+        max_pending (int, optional): Maximum number of queued or running tasks. Defaults to max_workers * 4.
+        raise_on_failed (bool, optional): Treat 'Failed' status responses as errors. Defaults to True.
+        keep_results (bool, optional): Keep the outcome of every task for `results`. Defaults to False.
+
+    Example:
+        with api.bulk(max_workers=8, lane='bulk', keep_results=True) as bulk:
+            for record_id in record_ids:
+                bulk.submit('zone.records.delete_record', 'example.com', record_id)
+        failed = [result for result in bulk.results() if result.error]
+    """
+
+    def __init__(self, client, max_workers=8, lane=None, on_progress=None, max_pending=None, raise_on_failed=True,
+                 keep_results=False):
+        self.client = client.in_lane(lane) if lane else client
+        self.on_progress = on_progress
+        self.raise_on_failed = raise_on_failed
+        self.keep_results = keep_results
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_pending or max_workers * 4)
+        self._idle = threading.Condition()
+        self._pending = {}
+        self._results = []
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._cancelled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.cancel()
+        self.shutdown()
+
+    def _call(self, function, args, kwargs):
+        result = function(*args, **kwargs)
+        if self.raise_on_failed and isinstance(result, dict) and result.get('status') == 'Failed':
+            raise ClouDNSAPIException(result)
+        return result
+
+    def _done(self, index, task):
+        result = self._result(task)
+        with self._idle:
+            del self._pending[task[3]]
+            self.completed += 1
+            if result.error is not None:
+                self.failed += 1
+            if self.keep_results:
+                self._results.append((index, result))
+            completed, submitted = self.completed, self.submitted
+            self._idle.notify_all()
+        self._slots.release()
+        if self.on_progress is not None:
+            self.on_progress(completed, submitted, result)
+
+    @staticmethod
+    def _result(task):
+        method, args, kwargs, future = task
+        if future.cancelled():
+            return BulkResult(method, args, kwargs, None, CancelledError())
+        error = future.exception()
+        return BulkResult(method, args, kwargs, None if error else future.result(), error)
+
+    def submit(self, method, *args, **kwargs):
+        """
+        Submits an SDK call.
+
+        Args:
+            method (str or callable): Dotted method path relative to the client (e.g.,
+                'zone.groups.change_group', 'failover.deactivate_failover'), or a bound SDK method.
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            Future: Future of the call's result.
+
+        Raises:
+            RuntimeError: If the executor was cancelled or shut down.
+        """
+        function = resolve_method(self.client, method)
+        self._slots.acquire()
+        with self._idle:
+            if self._cancelled:
+                self._slots.release()
+                raise RuntimeError("Cannot submit to a cancelled bulk executor.")
+            try:
+                future = self._executor.submit(self._call, function, args, kwargs)
+            except RuntimeError:
+                self._slots.release()
+                raise
+            task = (method, args, kwargs, future)
+            index = self.submitted
+            self._pending[future] = task
+            self.submitted += 1
+        future.add_done_callback(lambda _: self._done(index, task))
+        return future
+
+    def map(self, method, argument_lists):
+        """
+        Submits the same SDK call once per argument tuple.
+
+        Args:
+            method (str or callable): Dotted method path or bound SDK method.
+            argument_lists (iterable): Positional argument tuples.
+
+        Returns:
+            list: Futures, in submission order.
+        """
+        return [self.submit(method, *args) for args in argument_lists]
+
+    @property
+    def futures(self):
+        """
+        list: Futures of the tasks that are queued or running.
+        """
+        with self._idle:
+            return list(self._pending)
+
+    def cancel(self):
+        """
+        Cancels every task that has not started yet and rejects further submissions. Running calls finish.
+
+        Returns:
+            int: Number of cancelled tasks.
+        """
+        with self._idle:
+            self._cancelled = True
+            futures = list(self._pending)
+        return sum(1 for future in futures if future.cancel())
+
+    def wait(self):
+        """
+        Waits until every submitted task is finished.
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: not self._pending)
+
+    def results(self):
+        """
+        Waits for every task and returns their outcomes.
+
+        Returns:
+            list: BulkResult tuples in submission order, with either a result or an error.
+
+        Raises:
+            RuntimeError: If the executor was created without `keep_results`.
+        """
+        if not self.keep_results:
+            raise RuntimeError("Results are only kept by a bulk executor created with keep_results=True.")
+        self.wait()
+        with self._idle:
+            return [result for _, result in sorted(self._results, key=lambda item: item[0])]
+
+    def stats(self):
+        """
+        Returns the counters of the executor.
+
+        Returns:
+            dict: Tasks 'submitted', 'completed' and 'failed', and tasks 'pending' (queued or running).
+        """
+        with self._idle:
+            return {'submitted': self.submitted, 'completed': self.completed, 'failed': self.failed,
+                    'pending': len(self._pending)}
+
+    def shutdown(self, wait=True):
+        """
+        Stops the worker threads once every submitted task is finished.
+
+        Args:
+            wait (bool, optional): Block until the tasks are finished. Defaults to True.
+        """
+        self._executor.shutdown(wait=wait)
+        if wait:
+            self.wait()
@@ -0,0 +1,233 @@
+import threading
+import time
+
+from .exceptions import CircuitOpenError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+def endpoint_family(endpoint):
+    """
+    Returns the family of an API endpoint: 'failover' for DNS failover endpoints, otherwise the first path
+    segment (e.g., 'dns', 'domains').
+
+    Args:
+        endpoint (str): API endpoint (e.g., 'dns/records.json').
+
+    Returns:
+        str: Name of the family.
+    """
+    prefix, _, rest = endpoint.partition('/')
+    if prefix == 'dns' and 'failover' in rest:
+        return 'failover'
+    return prefix
+
+
+class _Circuit:
+    __slots__ = ('state', 'consecutive_failures', 'opened_at', 'probes', 'last_error', 'successes', 'failures',
+                 'rejected', 'opened')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.last_error = None
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker keeping a closed/open/half-open state per endpoint family.
+
+    A family's circuit opens after `failure_threshold` consecutive failures (network errors or HTTP 5xx
+    responses). While it is open, calls fail immediately with CircuitOpenError instead of waiting for the
+    rate limiter and the network. After `recovery_timeout` seconds the circuit becomes half-open and lets
+    up to `half_open_max_calls` probe calls through: a successful probe closes the circuit, a failed one
+    opens it again.
+
+    Args:
+        failure_threshold (int, optional): Consecutive failures that open a circuit. Defaults to 5.
+        recovery_timeout (float, optional): Seconds a circuit stays open before probing. Defaults to 30.
+        half_open_max_calls (int, optional): Concurrent probe calls allowed while half-open. Defaults to 1.
+        family (callable, optional): Maps an endpoint to its family. Defaults to `endpoint_family`.
+
+    Example:
+        api = ClouDNSAPI(auth_id, auth_password, circuit_breaker=CircuitBreaker(recovery_timeout=10))
+        api.circuit_breaker.stats()
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, half_open_max_calls=1, family=None):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.family = family or endpoint_family
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def _circuit(self, family):
+        circuit = self._circuits.get(family)
+        if circuit is None:
+            circuit = self._circuits[family] = _Circuit()
+        return circuit
+
+    def check(self, endpoint):
+        """
+        Fails fast if the circuit of an endpoint is open, without admitting a call.
+
+        Used before a call starts waiting for the rate limiter; the call is admitted with `before_call` once it
+        is about to be sent.
+
+        Args:
+            endpoint (str): API endpoint of the call.
+
+        Returns:
+            str: Family of the endpoint.
+
+        Raises:
+            CircuitOpenError: If the circuit of the family is open, or half-open with all probes in flight.
+        """
+        family = self.family(endpoint)
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None or circuit.state == CLOSED:
+                return family
+            retry_after = circuit.opened_at + self.recovery_timeout - time.monotonic()
+            if circuit.state == OPEN and retry_after > 0:
+                circuit.rejected += 1
+                raise CircuitOpenError(family, retry_after, circuit.last_error)
+            if circuit.state == HALF_OPEN and circuit.probes >= self.half_open_max_calls:
+                circuit.rejected += 1
+                raise CircuitOpenError(family, 0.0, circuit.last_error)
+        return family
+
+    def before_call(self, endpoint):
+        """
+        Admits a call to an endpoint, or fails fast if its circuit is open.
+
+        Every admitted call must be followed by `record_success`, `record_failure` or `release`.
+
+        Args:
+            endpoint (str): API endpoint of the call.
+
+        Returns:
+            str: Family of the endpoint.
+
+        Raises:
+            CircuitOpenError: If the circuit of the family is open, or half-open with all probes in flight.
+        """
+        family = self.family(endpoint)
+        with self._lock:
+            circuit = self._circuit(family)
+            if circuit.state == OPEN:
+                retry_after = circuit.opened_at + self.recovery_timeout - time.monotonic()
+                if retry_after > 0:
+                    circuit.rejected += 1
+                    raise CircuitOpenError(family, retry_after, circuit.last_error)
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+            if circuit.state == HALF_OPEN:
+                if circuit.probes >= self.half_open_max_calls:
+                    circuit.rejected += 1
+                    raise CircuitOpenError(family, 0.0, circuit.last_error)
+                circuit.probes += 1
+        return family
+
+    def record_success(self, family):
+        """
+        Records a successful call, closing a half-open circuit.
+
+        Args:
+            family (str): Family returned by `before_call`.
+        """
+        with self._lock:
+            circuit = self._circuit(family)
+            circuit.successes += 1
+            circuit.consecutive_failures = 0
+            if circuit.state == HALF_OPEN:
+                circuit.state = CLOSED
+                circuit.probes = 0
+
+    def record_failure(self, family, error=None):
+        """
+        Records a failed call, opening the circuit when the threshold is reached or a probe failed.
+
+        Args:
+            family (str): Family returned by `before_call`.
+            error (str or Exception, optional): Cause of the failure, reported by CircuitOpenError.
+        """
+        with self._lock:
+            circuit = self._circuit(family)
+            circuit.failures += 1
+            circuit.consecutive_failures += 1
+            circuit.last_error = str(error) if error is not None else None
+            if circuit.state == HALF_OPEN or (circuit.state == CLOSED
+                                              and circuit.consecutive_failures >= self.failure_threshold):
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+                circuit.opened += 1
+
+    def release(self, family):
+        """
+        Releases an admitted call that ended without telling anything about the service (e.g., it was
+        rejected locally before being sent).
+
+        Args:
+            family (str): Family returned by `before_call`.
+        """
+        with self._lock:
+            circuit = self._circuit(family)
+            if circuit.state == HALF_OPEN and circuit.probes > 0:
+                circuit.probes -= 1
+
+    def state(self, family):
+        """
+        Returns the state of a family's circuit.
+
+        Args:
+            family (str): Name of the family (e.g., 'dns').
+
+        Returns:
+            str: 'closed', 'open' or 'half-open'. An open circuit whose recovery timeout elapsed is reported
+            as 'half-open'.
+        """
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and time.monotonic() >= circuit.opened_at + self.recovery_timeout:
+                return HALF_OPEN
+            return circuit.state
+
+    def reset(self, family=None):
+        """
+        Closes the circuit of a family, or of every family.
+
+        Args:
+            family (str, optional): Name of the family. Defaults to all families.
+        """
+        with self._lock:
+            if family is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(family, None)
+
+    def stats(self):
+        """
+        Returns per-family states and counters.
+
+        Returns:
+            dict: Mapping of families to {'state', 'consecutive_failures', 'successes', 'failures', 'rejected',
+            'opened', 'last_error'}.
+        """
+        with self._lock:
+            families = list(self._circuits.items())
+        return {family: {'state': self.state(family), 'consecutive_failures': circuit.consecutive_failures,
+                         'successes': circuit.successes, 'failures': circuit.failures,
+                         'rejected': circuit.rejected, 'opened': circuit.opened, 'last_error': circuit.last_error}
+                for family, circuit in families}
@@ -0,0 +1,165 @@
+import heapq
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class _PendingWrite:
+    __slots__ = ('fields', 'futures', 'deadline')
+
+    def __init__(self, deadline):
+        self.fields = {}
+        self.futures = []
+        self.deadline = deadline
+
+
+class WriteCoalescer:
+    """
+    Merges rapid successive `modify_record` calls for the same record into a single request.
+
+    The first update of a record opens a window of `window` seconds. Updates of the same (domain, record ID)
+    arriving within the window are merged: `modify_record` replaces the whole record, so the last update
+    wins and only its fields are sent when the window closes, exactly as if the calls had been made one
+    after another. Every caller gets a future resolving with the response of the request that carried its
+    update (or its exception).
+
+    Writes of the same record are never sent concurrently: updates arriving while a request for the record
+    is in flight open a new window, which is sent after that request completes, so the last update always
+    wins.
+
+    Args:
+        records_api (RecordsAPI): Records API used to send the merged updates.
+        window (float, optional): Seconds updates of a record are collected before being sent. Defaults to 0.5.
+        max_workers (int, optional): Number of requests sent concurrently. Defaults to 4.
+
+    Example:
+        coalescer = WriteCoalescer(api.zone.records, window=1.0)
+        future = coalescer.modify_record('example.com', 123, host='home', record=ip, ttl=60)
+        future.result()
+    """
+
+    def __init__(self, records_api, window=0.5, max_workers=4):
+        self.records_api = records_api
+        self.window = window
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._in_flight = set()
+        self._deadlines = []
+        self._closed = False
+        self.submitted = 0
+        self.sent = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def modify_record(self, domain_name, record_id, **fields):
+        """
+        Queues an update of a record.
+
+        Args:
+            domain_name (str): Domain name of the zone.
+            record_id (int): ID of the record.
+            **fields: Arguments of `RecordsAPI.modify_record` (e.g., host, record, ttl), replacing those of
+                earlier updates of the record still waiting in the window.
+
+        Returns:
+            Future: Resolves with the API response of the request that carried this update.
+
+        Raises:
+            RuntimeError: If the coalescer is closed.
+        """
+        key = (domain_name, record_id)
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Cannot queue updates on a closed WriteCoalescer.")
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingWrite(time.monotonic() + self.window)
+                heapq.heappush(self._deadlines, (pending.deadline, key))
+                self._cond.notify()
+            pending.fields = fields
+            pending.futures.append(future)
+            self.submitted += 1
+        return future
+
+    def _run(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._deadlines and (self._deadlines[0][0] <= now or self._closed):
+                    _, key = heapq.heappop(self._deadlines)
+                    if key in self._in_flight:
+                        continue
+                    self._dispatch(key)
+                if self._closed and not self._pending and not self._in_flight:
+                    return
+                timeout = self._deadlines[0][0] - now if self._deadlines else None
+                self._cond.wait(timeout)
+
+    def _dispatch(self, key):
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        self._in_flight.add(key)
+        self.sent += 1
+        self._executor.submit(self._send, key, pending)
+
+    def _send(self, key, pending):
+        try:
+            response = self.records_api.modify_record(key[0], key[1], **pending.fields)
+        except Exception as e:
+            for future in pending.futures:
+                future.set_exception(e)
+        else:
+            for future in pending.futures:
+                future.set_result(response)
+        finally:
+            with self._cond:
+                self._in_flight.discard(key)
+                waiting = self._pending.get(key)
+                if waiting is not None:
+                    heapq.heappush(self._deadlines, (waiting.deadline, key))
+                self._cond.notify()
+
+    def flush(self):
+        """
+        Sends every queued update now and waits until all requests completed.
+        """
+        with self._cond:
+            futures = [future for pending in self._pending.values() for future in pending.futures]
+            self._deadlines = [(0.0, key) for key in self._pending]
+            heapq.heapify(self._deadlines)
+            self._cond.notify()
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    def close(self):
+        """
+        Sends the queued updates, waits for them and stops the coalescer.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown()
+
+    def stats(self):
+        """
+        Returns the counters of the coalescer.
+
+        Returns:
+            dict: Updates 'submitted', requests 'sent', updates 'merged' away, and 'pending' records.
+        """
+        with self._cond:
+            return {'submitted': self.submitted, 'sent': self.sent, 'pending': len(self._pending),
+                    'merged': self.submitted - self.sent - sum(len(p.futures) for p in self._pending.values())}
@@ -0,0 +1,343 @@
+import ipaddress
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class StringTable:
+    """
+    Interning table mapping strings to compact integer codes.
+
+    Each distinct string is stored once; columns hold its integer code instead of the string itself.
+    """
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def code(self, value):
+        """
+        Returns the code for a string, adding it to the table if needed.
+
+        Args:
+            value (str): String to intern.
+
+        Returns:
+            int: Code of the string.
+        """
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        """
+        Returns the code for a string without adding it.
+
+        Args:
+            value (str): String to look up.
+
+        Returns:
+            int or None: Code of the string, or None if it is not in the table.
+        """
+        return self._codes.get(value)
+
+    def codes_where(self, predicate):
+        """
+        Returns the set of codes whose string satisfies a predicate.
+
+        The predicate is evaluated once per distinct string rather than once per row.
+
+        Args:
+            predicate (callable): Function taking a string and returning a bool.
+
+        Returns:
+            set: Matching codes.
+        """
+        return {code for code, value in enumerate(self.values) if predicate(value)}
+
+
+class RecordColumns:
+    """
+    Columnar, array-backed store for large numbers of DNS records.
+
+    Numeric fields are kept in parallel `array.array` columns and string fields (zone, host, type and record
+    value) are stored as codes into shared `StringTable` instances. Filters are evaluated column by column,
+    with string predicates (such as network membership) evaluated once per distinct value, and as NumPy
+    boolean masks when NumPy is installed (see `where`).
+
+    Attributes:
+        ids (array): Record IDs.
+        ttls (array): Record TTLs.
+        statuses (array): Record statuses (1 active, 0 inactive, -1 unknown).
+        zones (array): Codes into `zone_table`.
+        hosts (array): Codes into `host_table`.
+        types (array): Codes into `type_table`.
+        records (array): Codes into `record_table`.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.ttls = array('l')
+        self.statuses = array('b')
+        self.zones = array('L')
+        self.hosts = array('L')
+        self.types = array('H')
+        self.records = array('L')
+        self.zone_table = StringTable()
+        self.host_table = StringTable()
+        self.type_table = StringTable()
+        self.record_table = StringTable()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _int(value, default):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def append(self, data, zone=''):
+        """
+        Appends a single record dict as returned by the API.
+
+        Args:
+            data (dict): Record data.
+            zone (str, optional): Domain name the record belongs to.
+        """
+        self.ids.append(self._int(data.get('id'), 0))
+        self.ttls.append(self._int(data.get('ttl'), 0))
+        self.statuses.append(self._int(data.get('status'), -1))
+        self.zones.append(self.zone_table.code(zone or ''))
+        self.hosts.append(self.host_table.code(data.get('host') or ''))
+        self.types.append(self.type_table.code(data.get('type') or ''))
+        self.records.append(self.record_table.code(data.get('record') or ''))
+
+    def extend(self, page, zone=''):
+        """
+        Appends one page of `list_records` results.
+
+        Args:
+            page (dict or list): Response from `list_records`, keyed by record ID (or an empty list).
+            zone (str, optional): Domain name the records belong to.
+        """
+        rows = page.values() if isinstance(page, dict) else page
+        for data in rows:
+            self.append(data, zone)
+
+    @classmethod
+    def from_pages(cls, pages, zone=''):
+        """
+        Builds a store from an iterable of `list_records` pages.
+
+        Args:
+            pages (iterable): Iterable of `list_records` responses, e.g. `RecordsAPI.iter_record_pages`.
+            zone (str, optional): Domain name the records belong to.
+
+        Returns:
+            RecordColumns: The populated store.
+        """
+        columns = cls()
+        for page in pages:
+            columns.extend(page, zone)
+        return columns
+
+    @classmethod
+    def from_zones(cls, records_api, zones, rows_per_page=100):
+        """
+        Builds a store holding all records of several zones.
+
+        Args:
+            records_api (RecordsAPI): Records API used to list records.
+            zones (iterable): Domain names to load.
+            rows_per_page (int, optional): Page size used for listing (default 100).
+
+        Returns:
+            RecordColumns: The populated store.
+        """
+        columns = cls()
+        for zone in zones:
+            for page in records_api.iter_record_pages(zone, rows_per_page=rows_per_page):
+                columns.extend(page, zone)
+        return columns
+
+    def row(self, index):
+        """
+        Returns a single row as a record dict.
+
+        Args:
+            index (int): Row index.
+
+        Returns:
+            dict: Record data, including the 'zone' it belongs to.
+        """
+        return {
+            'id': self.ids[index],
+            'zone': self.zone_table[self.zones[index]],
+            'host': self.host_table[self.hosts[index]],
+            'type': self.type_table[self.types[index]],
+            'record': self.record_table[self.records[index]],
+            'ttl': self.ttls[index],
+            'status': self.statuses[index],
+        }
+
+    def rows(self, indexes=None):
+        """
+        Iterates over rows as record dicts.
+
+        Args:
+            indexes (iterable, optional): Row indexes to return. Defaults to all rows.
+
+        Yields:
+            dict: Record data.
+        """
+        if indexes is None:
+            indexes = range(len(self))
+        for index in indexes:
+            yield self.row(index)
+
+    @staticmethod
+    def _narrow(indexes, column, predicate):
+        if indexes is None:
+            return [index for index, value in enumerate(column) if predicate(value)]
+        return [index for index in indexes if predicate(column[index])]
+
+    @staticmethod
+    def _predicate(op, operand):
+        if op == 'in':
+            return operand.__contains__
+        if op == 'gt':
+            return lambda value: value > operand
+        if op == 'lt':
+            return lambda value: value < operand
+        return lambda value: value == operand
+
+    @staticmethod
+    def _mask(column, op, operand):
+        view = numpy.frombuffer(column, dtype=column.typecode)
+        if op == 'in':
+            return numpy.isin(view, numpy.fromiter(operand, dtype=view.dtype, count=len(operand)))
+        if op == 'gt':
+            return view > operand
+        if op == 'lt':
+            return view < operand
+        return view == operand
+
+    def _conditions(self, zone, host, record_type, ttl_gt, ttl_lt, status, network, record_like):
+        """
+        Translates the filters of `where` into (column, op, operand) conditions, or None if nothing can match.
+        """
+        conditions = []
+        for table, column, value in ((self.zone_table, self.zones, zone), (self.host_table, self.hosts, host)):
+            if value is not None:
+                code = table.lookup(value)
+                if code is None:
+                    return None
+                conditions.append((column, 'eq', code))
+
+        if record_type is not None:
+            record_types = {record_type} if isinstance(record_type, str) else set(record_type)
+            conditions.append((self.types, 'in', self.type_table.codes_where(record_types.__contains__)))
+        if ttl_gt is not None:
+            conditions.append((self.ttls, 'gt', int(ttl_gt)))
+        if ttl_lt is not None:
+            conditions.append((self.ttls, 'lt', int(ttl_lt)))
+        if status is not None:
+            status = self._int(status, None)
+            if status is None:
+                return None
+            conditions.append((self.statuses, 'eq', status))
+
+        if network is not None:
+            network = ipaddress.ip_network(network, strict=False)
+
+            def in_network(value):
+                try:
+                    return ipaddress.ip_address(value) in network
+                except ValueError:
+                    return False
+
+            conditions.append((self.records, 'in', self.record_table.codes_where(in_network)))
+        if record_like is not None:
+            conditions.append((self.records, 'in', self.record_table.codes_where(lambda value: record_like in value)))
+
+        if any(op == 'in' and not operand for _, op, operand in conditions):
+            return None
+        return conditions
+
+    def where(self, zone=None, host=None, record_type=None, ttl_gt=None, ttl_lt=None, status=None, network=None,
+              record_like=None):
+        """
+        Returns the indexes of rows matching all given conditions.
+
+        String conditions are first resolved to sets of codes, with predicates evaluated once per distinct
+        value. When NumPy is installed, each condition is then evaluated as a boolean mask over a zero-copy
+        `numpy.frombuffer` view of its column (`numpy.isin` for code sets) and the masks are combined, so no
+        Python code runs per row. Without NumPy, rows are filtered with one Python comparison per row and
+        condition.
+
+        Args:
+            zone (str, optional): Domain name the record belongs to.
+            host (str, optional): Exact host of the record.
+            record_type (str or iterable, optional): Record type, or several record types.
+            ttl_gt (int or str, optional): Only rows with a TTL greater than this.
+            ttl_lt (int or str, optional): Only rows with a TTL lower than this.
+            status (int or str, optional): Only rows with this status (e.g., 1 or '1', as returned by the API).
+            network (str, optional): Only rows whose record value is an IP address within this network
+                (e.g., '10.0.0.0/8').
+            record_like (str, optional): Only rows whose record value contains this substring.
+
+        Returns:
+            list: Matching row indexes, in insertion order.
+
+        Example:
+            columns.where(record_type='A', ttl_gt=3600, network='10.0.0.0/8')
+        """
+        conditions = self._conditions(zone, host, record_type, ttl_gt, ttl_lt, status, network, record_like)
+        if conditions is None or not len(self):
+            return []
+        if not conditions:
+            return list(range(len(self)))
+
+        if numpy is not None:
+            mask = self._mask(*conditions[0])
+            for condition in conditions[1:]:
+                mask &= self._mask(*condition)
+            return numpy.flatnonzero(mask).tolist()
+
+        indexes = None
+        for column, op, operand in conditions:
+            indexes = self._narrow(indexes, column, self._predicate(op, operand))
+        return indexes
+
+    def to_numpy(self):
+        """
+        Exports the numeric and code columns as NumPy arrays.
+
+        The arrays share no memory with the store. String columns are exported as codes; decode them with
+        the matching string table (e.g., `numpy.array(columns.type_table.values)[arrays['types']]`).
+
+        Returns:
+            dict: Mapping of column name to `numpy.ndarray`.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError("NumPy is required for to_numpy(). Install it with 'pip install numpy'.")
+        return {
+            name: numpy.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode).copy()
+            for name in ('ids', 'ttls', 'statuses', 'zones', 'hosts', 'types', 'records')
+        }
@@ -0,0 +1,160 @@
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .exceptions import ClouDNSAPIException
+
+CrawlResult = namedtuple('CrawlResult', ['changed', 'unchanged', 'removed', 'failed'])
+
+
+class IncrementalCrawler:
+    """
+    Crawls the records of many zones, re-listing only the zones that changed since the previous run.
+
+    For every zone a cheap signature is fetched first: the SOA serial from `RecordsAPI.get_soa_details`, the
+    record count from `RecordsAPI.get_records_count`, or both. Records are only listed for zones whose signature
+    differs from the one stored by the previous run. Signatures are kept in memory and, when `state_path` is
+    given, persisted as JSON so that they survive between runs.
+
+    Args:
+        zone_api (DNSZoneAPI): Zone API used to enumerate zones and reach `records`.
+        state_path (str, optional): JSON file storing the signatures of the previous run.
+        signature (str, optional): Signature to compare: 'soa', 'count' or 'soa+count'. Defaults to 'soa'.
+        max_workers (int, optional): Number of zones processed concurrently. Defaults to 1.
+        rows_per_page (int, optional): Page size used for listing zones and records. Defaults to 100.
+
+    Example:
+        crawler = IncrementalCrawler(api.zone, state_path='signatures.json', max_workers=8)
+        result = crawler.crawl(on_changed=index.set_zone_records, on_removed=index.remove_zone)
+    """
+
+    SIGNATURES = ('soa', 'count', 'soa+count')
+
+    def __init__(self, zone_api, state_path=None, signature='soa', max_workers=1, rows_per_page=100):
+        if signature not in self.SIGNATURES:
+            raise ValueError(f"Invalid signature: {signature}. Expected one of {', '.join(self.SIGNATURES)}.")
+        self.zone_api = zone_api
+        self.records_api = zone_api.records
+        self.state_path = state_path
+        self.signature = signature
+        self.max_workers = max_workers
+        self.rows_per_page = rows_per_page
+        self.signatures = self._load_state()
+
+    def _load_state(self):
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as file:
+                return json.load(file)
+        return {}
+
+    def save_state(self):
+        """
+        Writes the current zone signatures to `state_path`, atomically replacing the previous file.
+        """
+        if not self.state_path:
+            return
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.signatures, file)
+        os.replace(temp_path, self.state_path)
+
+    def zone_signature(self, zone):
+        """
+        Fetches the current signature of a zone.
+
+        Args:
+            zone (str): Domain name or reverse zone name.
+
+        Returns:
+            str: Signature of the zone.
+
+        Raises:
+            ClouDNSAPIException: If the API reports a failure.
+        """
+        parts = []
+        if 'soa' in self.signature:
+            soa = self.records_api.get_soa_details(zone)
+            if not isinstance(soa, dict) or 'serialNumber' not in soa:
+                raise ClouDNSAPIException(soa if isinstance(soa, dict) else {})
+            parts.append(str(soa['serialNumber']))
+        if 'count' in self.signature:
+            count = self.records_api.get_records_count(zone)
+            if isinstance(count, dict) and count.get('status') == 'Failed':
+                raise ClouDNSAPIException(count)
+            parts.append(json.dumps(count, sort_keys=True))
+        return '/'.join(parts)
+
+    def _list_records(self, zone):
+        records = []
+        for page in self.records_api.iter_record_pages(zone, rows_per_page=self.rows_per_page):
+            records.extend(page.values() if isinstance(page, dict) else page)
+        return records
+
+    def _check_zone(self, zone, force):
+        signature = self.zone_signature(zone)
+        if not force and self.signatures.get(zone) == signature:
+            return signature, None
+        return signature, self._list_records(zone)
+
+    def crawl(self, zones=None, on_changed=None, on_removed=None, force=False):
+        """
+        Crawls the given zones (or all zones of the account) and re-lists the ones that changed.
+
+        Callbacks are invoked from the calling thread. A zone's new signature is only stored after its
+        `on_changed` callback returned, so a zone whose processing failed is picked up again on the next run.
+
+        Args:
+            zones (iterable, optional): Domain names to crawl. Defaults to every zone returned by
+                `DNSZoneAPI.iter_zones`; in that case zones missing from the account are reported as removed.
+            on_changed (callable, optional): Called as `on_changed(zone, records)` for every changed zone, where
+                records is the list of record dicts.
+            on_removed (callable, optional): Called as `on_removed(zone)` for every zone that no longer exists.
+            force (bool, optional): Re-list every zone regardless of its signature. Defaults to False.
+
+        Returns:
+            CrawlResult: Lists of changed, unchanged and removed zones, and a dict of failed zones to exceptions.
+        """
+        full_crawl = zones is None
+        if full_crawl:
+            zones = (zone['name'] for zone in self.zone_api.iter_zones(rows_per_page=self.rows_per_page))
+
+        changed, unchanged, removed, failed = [], [], [], {}
+        seen = set()
+
+        def handle(zone, future):
+            try:
+                signature, records = future.result()
+                if records is None:
+                    unchanged.append(zone)
+                    return
+                if on_changed:
+                    on_changed(zone, records)
+                self.signatures[zone] = signature
+                changed.append(zone)
+            except Exception as e:
+                failed[zone] = e
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = {}
+                for zone in zones:
+                    seen.add(zone)
+                    pending[executor.submit(self._check_zone, zone, force)] = zone
+                    if len(pending) >= self.max_workers * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            handle(pending.pop(future), future)
+                for future in list(pending):
+                    handle(pending.pop(future), future)
+
+            if full_crawl:
+                for zone in [zone for zone in self.signatures if zone not in seen]:
+                    if on_removed:
+                        on_removed(zone)
+                    del self.signatures[zone]
+                    removed.append(zone)
+        finally:
+            self.save_state()
+
+        return CrawlResult(changed, unchanged, removed, failed)
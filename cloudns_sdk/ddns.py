@@ -0,0 +1,236 @@
+import asyncio
+import json
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .exceptions import ClouDNSAPIException
+
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+FAILED = 'failed'
+
+DynamicUpdate = namedtuple('DynamicUpdate', ['domain_name', 'record_id', 'ip', 'status', 'error'])
+
+
+class DynamicDNSUpdater:
+    """
+    Pushes dynamic DNS updates for many records through their ClouDNS dynamic URLs.
+
+    Dynamic URLs are fetched once with `RecordsAPI.get_dynamic_url` (concurrently, through the client and its
+    rate limit) and cached. Updates are then sent by requesting the dynamic URLs directly, with up to
+    `max_concurrency` requests in flight over a pooled HTTP session. An update whose IP equals the last IP
+    successfully pushed for the record is not sent. When `state_path` is given, the cached URLs and last
+    pushed IPs are kept in a JSON file, so deduplication survives restarts.
+
+    Dynamic URLs set the record to the source address of the request unless the address is passed
+    explicitly; set `ip_param` to the name of the query parameter that carries it.
+
+    Args:
+        records_api (RecordsAPI): Records API used to fetch dynamic URLs and history.
+        max_workers (int, optional): Concurrent `get_dynamic_url` calls. Defaults to 8.
+        max_concurrency (int, optional): Concurrent dynamic URL requests. Defaults to 64.
+        timeout (float, optional): Timeout of a dynamic URL request, in seconds. Defaults to 10.
+        ip_param (str, optional): Query parameter carrying the IP address. Defaults to None.
+        state_path (str, optional): JSON file holding cached URLs and last pushed IPs, created with mode 0600.
+        session (requests.Session, optional): Session used for dynamic URL requests. Defaults to a new
+            session with a pool of `max_concurrency` connections.
+
+    Example:
+        updater = DynamicDNSUpdater(api.zone.records, ip_param='ip', state_path='ddns-state.json')
+        results = updater.push([('example.com', 123, '198.51.100.7'), ('example.com', 124, '198.51.100.8')])
+    """
+
+    def __init__(self, records_api, max_workers=8, max_concurrency=64, timeout=10.0, ip_param=None,
+                 state_path=None, session=None):
+        self.records_api = records_api
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.ip_param = ip_param
+        self.state_path = state_path
+        self.session = session or self._new_session()
+        self._lock = threading.Lock()
+        self._urls, self._last_ips = self._load_state()
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=self.max_concurrency)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @staticmethod
+    def _key(domain_name, record_id):
+        return f"{domain_name}/{record_id}"
+
+    def _load_state(self):
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as file:
+                state = json.load(file)
+            return state.get('urls', {}), state.get('ips', {})
+        return {}, {}
+
+    def save_state(self):
+        """
+        Writes the cached URLs and last pushed IPs to `state_path`, if set.
+
+        Dynamic URLs update records without any other credential, so the file is only readable by its owner
+        (mode 0600).
+        """
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {'urls': dict(self._urls), 'ips': dict(self._last_ips)}
+        temp_path = f"{self.state_path}.{threading.get_ident()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        if hasattr(os, 'fchmod'):
+            os.fchmod(fd, 0o600)
+        with open(fd, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.state_path)
+
+    def dynamic_url(self, domain_name, record_id):
+        """
+        Returns the dynamic URL of a record, fetching it on first use.
+
+        Args:
+            domain_name (str): Domain name containing the record.
+            record_id (int): ID of the record.
+
+        Returns:
+            str: The dynamic URL.
+
+        Raises:
+            ClouDNSAPIException: If the API does not return a URL.
+        """
+        key = self._key(domain_name, record_id)
+        with self._lock:
+            url = self._urls.get(key)
+        if url is not None:
+            return url
+        response = self.records_api.get_dynamic_url(domain_name, record_id)
+        if not isinstance(response, dict) or not response.get('url'):
+            raise ClouDNSAPIException(response if isinstance(response, dict) else {})
+        with self._lock:
+            self._urls[key] = response['url']
+        return response['url']
+
+    def load_urls(self, records):
+        """
+        Fetches the dynamic URLs of many records concurrently, skipping cached ones.
+
+        Args:
+            records (iterable): (domain name, record ID) pairs.
+
+        Returns:
+            dict: Mapping of (domain name, record ID) to the exception that prevented fetching its URL.
+        """
+        errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {(domain_name, record_id): executor.submit(self.dynamic_url, domain_name, record_id)
+                       for domain_name, record_id in records}
+            for record, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[record] = e
+        return errors
+
+    def invalidate(self, domain_name, record_id):
+        """
+        Forgets the cached URL and last pushed IP of a record (e.g., after `change_dynamic_url`).
+
+        Args:
+            domain_name (str): Domain name containing the record.
+            record_id (int): ID of the record.
+        """
+        key = self._key(domain_name, record_id)
+        with self._lock:
+            self._urls.pop(key, None)
+            self._last_ips.pop(key, None)
+
+    def _hit(self, url, ip):
+        params = {self.ip_param: ip} if self.ip_param and ip else None
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        if response.status_code != 200 or 'invalid' in response.text.lower():
+            raise ClouDNSAPIException({'status': 'Failed',
+                                       'statusDescription': f"HTTP {response.status_code}: {response.text.strip()}"})
+
+    async def _push_one(self, loop, executor, semaphore, domain_name, record_id, ip, force):
+        key = self._key(domain_name, record_id)
+        with self._lock:
+            if not force and ip is not None and self._last_ips.get(key) == ip:
+                return DynamicUpdate(domain_name, record_id, ip, UNCHANGED, None)
+        async with semaphore:
+            try:
+                url = await loop.run_in_executor(executor, self.dynamic_url, domain_name, record_id)
+                await loop.run_in_executor(executor, self._hit, url, ip)
+            except Exception as e:
+                if isinstance(e, ClouDNSAPIException):
+                    with self._lock:
+                        self._urls.pop(key, None)
+                return DynamicUpdate(domain_name, record_id, ip, FAILED, e)
+        if ip is not None:
+            with self._lock:
+                self._last_ips[key] = ip
+        return DynamicUpdate(domain_name, record_id, ip, UPDATED, None)
+
+    async def push_async(self, updates, force=False):
+        """
+        Pushes updates concurrently from asyncio code.
+
+        Args:
+            updates (iterable): (domain name, record ID, IP) tuples. Several updates of the same record are
+                reduced to the last one.
+            force (bool, optional): Send updates even when the IP did not change. Defaults to False.
+
+        Returns:
+            list: DynamicUpdate tuples with status 'updated', 'unchanged' or 'failed', in order of first
+            appearance of each record.
+        """
+        latest = {}
+        for domain_name, record_id, ip in updates:
+            latest[(domain_name, record_id)] = ip
+        loop = asyncio.get_event_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = await asyncio.gather(*(self._push_one(loop, executor, semaphore, domain_name, record_id, ip,
+                                                            force)
+                                             for (domain_name, record_id), ip in latest.items()))
+        self.save_state()
+        return results
+
+    def push(self, updates, force=False):
+        """
+        Pushes updates concurrently.
+
+        Args:
+            updates (iterable): (domain name, record ID, IP) tuples.
+            force (bool, optional): Send updates even when the IP did not change. Defaults to False.
+
+        Returns:
+            list: DynamicUpdate tuples (see `push_async`).
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.push_async(updates, force))
+        finally:
+            loop.close()
+
+    def history(self, domain_name, record_id, rows_per_page=20):
+        """
+        Lazily iterates over the dynamic URL history of a record, for auditing.
+
+        Args:
+            domain_name (str): Domain name containing the record.
+            record_id (int): ID of the record.
+            rows_per_page (int, optional): Entries fetched per call. Defaults to 20.
+
+        Returns:
+            generator: History entries, see `RecordsAPI.iter_dynamic_url_history`.
+        """
+        return self.records_api.iter_dynamic_url_history(domain_name, record_id, rows_per_page)
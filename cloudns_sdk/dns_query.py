@@ -0,0 +1,378 @@
+import asyncio
+import ipaddress
+import random
+import struct
+from collections import namedtuple
+
+from .exceptions import ClouDNSAPIException, DNSQueryError
+from .index import normalize_value
+
+RECORD_TYPE_CODES = {
+    'A': 1, 'NS': 2, 'CNAME': 5, 'SOA': 6, 'PTR': 12, 'HINFO': 13, 'MX': 15, 'TXT': 16, 'RP': 17,
+    'AAAA': 28, 'LOC': 29, 'SRV': 33, 'NAPTR': 35, 'CERT': 37, 'DNAME': 39, 'DS': 43, 'SSHFP': 44,
+    'TLSA': 52, 'SMIMEA': 53, 'OPENPGPKEY': 61, 'SPF': 99, 'CAA': 257,
+}
+RECORD_TYPE_NAMES = {code: name for name, code in RECORD_TYPE_CODES.items()}
+
+RCODE_NOERROR = 0
+
+DNSAnswer = namedtuple('DNSAnswer', ['name', 'type', 'ttl', 'value'])
+DNSResponse = namedtuple('DNSResponse', ['rcode', 'authoritative', 'truncated', 'answers'])
+
+
+def build_query(name, record_type, query_id=None):
+    """
+    Encodes a DNS query message for a single question.
+
+    Args:
+        name (str): Fully qualified name to query (e.g., 'www.example.com').
+        record_type (str): Record type (e.g., 'A', 'MX').
+        query_id (int, optional): Message ID. Defaults to a random ID.
+
+    Returns:
+        tuple: (query_id, message bytes)
+    """
+    if query_id is None:
+        query_id = random.randint(0, 0xFFFF)
+    header = struct.pack('!HHHHHH', query_id, 0, 1, 0, 0, 0)
+    question = b''
+    for label in name.rstrip('.').split('.'):
+        if label:
+            encoded = label.encode('idna')
+            question += struct.pack('!B', len(encoded)) + encoded
+    question += b'\x00' + struct.pack('!HH', RECORD_TYPE_CODES[record_type.upper()], 1)
+    return query_id, header + question
+
+
+def _read_name(message, offset):
+    labels = []
+    jumped = False
+    next_offset = offset
+    for _ in range(128):
+        if offset >= len(message):
+            raise DNSQueryError("Truncated name in DNS response.")
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            pointer = struct.unpack('!H', message[offset:offset + 2])[0] & 0x3FFF
+            if not jumped:
+                next_offset = offset + 2
+            jumped = True
+            offset = pointer
+        elif length == 0:
+            if not jumped:
+                next_offset = offset + 1
+            return '.'.join(labels), next_offset
+        else:
+            if offset + 1 + length > len(message):
+                raise DNSQueryError("Truncated name in DNS response.")
+            labels.append(message[offset + 1:offset + 1 + length].decode('ascii', 'replace'))
+            offset += 1 + length
+    raise DNSQueryError("Name compression loop in DNS response.")
+
+
+def _decode_rdata(message, offset, length, record_type):
+    if offset + length > len(message):
+        raise DNSQueryError("Truncated record data in DNS response.")
+    rdata = message[offset:offset + length]
+    if record_type == 'A':
+        return str(ipaddress.IPv4Address(rdata))
+    if record_type == 'AAAA':
+        return str(ipaddress.IPv6Address(rdata))
+    if record_type in ('NS', 'CNAME', 'PTR', 'DNAME'):
+        return _read_name(message, offset)[0]
+    if record_type == 'MX':
+        return _read_name(message, offset + 2)[0]
+    if record_type == 'SRV':
+        return _read_name(message, offset + 6)[0]
+    if record_type in ('TXT', 'SPF'):
+        strings, position = [], 0
+        while position < len(rdata):
+            size = rdata[position]
+            strings.append(rdata[position + 1:position + 1 + size].decode('utf-8', 'replace'))
+            position += 1 + size
+        return ''.join(strings)
+    if record_type == 'SOA':
+        mname, position = _read_name(message, offset)
+        rname, position = _read_name(message, position)
+        serial = struct.unpack('!I', message[position:position + 4])[0]
+        return f"{mname} {rname} {serial}"
+    if record_type == 'CAA':
+        tag_length = rdata[1]
+        tag = rdata[2:2 + tag_length].decode('ascii', 'replace')
+        return f"{rdata[0]} {tag} {rdata[2 + tag_length:].decode('utf-8', 'replace')}"
+    return rdata.hex()
+
+
+def parse_response(message, query_id=None):
+    """
+    Decodes a DNS response message.
+
+    Args:
+        message (bytes): Raw DNS message.
+        query_id (int, optional): Expected message ID.
+
+    Returns:
+        DNSResponse: Response code, flags and the decoded answer section.
+
+    Raises:
+        DNSQueryError: If the message is malformed or its ID does not match.
+    """
+    try:
+        return _parse_response(message, query_id)
+    except (struct.error, IndexError, ValueError) as e:
+        raise DNSQueryError(f"Malformed DNS response: {e}") from e
+
+
+def _parse_response(message, query_id):
+    if len(message) < 12:
+        raise DNSQueryError("DNS response is shorter than its header.")
+    message_id, flags, qdcount, ancount, _, _ = struct.unpack('!HHHHHH', message[:12])
+    if query_id is not None and message_id != query_id:
+        raise DNSQueryError("DNS response ID does not match the query.")
+
+    offset = 12
+    for _ in range(qdcount):
+        offset = _read_name(message, offset)[1] + 4
+
+    answers = []
+    for _ in range(ancount):
+        name, offset = _read_name(message, offset)
+        type_code, _, ttl, length = struct.unpack('!HHIH', message[offset:offset + 10])
+        offset += 10
+        record_type = RECORD_TYPE_NAMES.get(type_code, str(type_code))
+        answers.append(DNSAnswer(name, record_type, ttl, _decode_rdata(message, offset, length, record_type)))
+        offset += length
+
+    return DNSResponse(flags & 0x000F, bool(flags & 0x0400), bool(flags & 0x0200), answers)
+
+
+class _UDPQueryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, query_id, future):
+        self.query_id = query_id
+        self.future = future
+
+    def datagram_received(self, data, addr):
+        if len(data) >= 2 and struct.unpack('!H', data[:2])[0] == self.query_id and not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+class DNSQueryClient:
+    """
+    Minimal asyncio DNS client sending queries directly to authoritative name servers.
+
+    Queries are sent over UDP and retried over TCP when the response is truncated (or always over TCP when
+    `tcp` is True). No recursion is requested, so the answers reflect what the queried server itself holds.
+
+    Args:
+        timeout (float, optional): Seconds to wait for each attempt. Defaults to 2.
+        retries (int, optional): Number of attempts per query. Defaults to 2.
+        port (int, optional): Destination port. Defaults to 53.
+        tcp (bool, optional): Always use TCP. Defaults to False.
+        max_concurrency (int, optional): Maximum number of queries in flight. Defaults to 256.
+    """
+
+    def __init__(self, timeout=2.0, retries=2, port=53, tcp=False, max_concurrency=256):
+        self.timeout = timeout
+        self.retries = retries
+        self.port = port
+        self.tcp = tcp
+        self.max_concurrency = max_concurrency
+
+    async def _query_udp(self, server, query_id, message):
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        transport, _ = await loop.create_datagram_endpoint(lambda: _UDPQueryProtocol(query_id, future),
+                                                           remote_addr=(server, self.port))
+        try:
+            transport.sendto(message)
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            transport.close()
+
+    async def _query_tcp(self, server, message):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(server, self.port), self.timeout)
+        try:
+            writer.write(struct.pack('!H', len(message)) + message)
+            length = struct.unpack('!H', await asyncio.wait_for(reader.readexactly(2), self.timeout))[0]
+            return await asyncio.wait_for(reader.readexactly(length), self.timeout)
+        finally:
+            writer.close()
+
+    async def query(self, server, name, record_type):
+        """
+        Queries a single server.
+
+        Args:
+            server (str): IP address of the name server.
+            name (str): Fully qualified name to query.
+            record_type (str): Record type (e.g., 'A', 'MX').
+
+        Returns:
+            DNSResponse: The decoded response.
+
+        Raises:
+            DNSQueryError: If all attempts failed.
+        """
+        last_error = None
+        for _ in range(self.retries):
+            query_id, message = build_query(name, record_type)
+            try:
+                if not self.tcp:
+                    response = parse_response(await self._query_udp(server, query_id, message), query_id)
+                    if not response.truncated:
+                        return response
+                return parse_response(await self._query_tcp(server, message), query_id)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, DNSQueryError) as e:
+                last_error = e
+        raise DNSQueryError(f"Query for {name} {record_type} to {server} failed: {last_error!r}")
+
+    async def query_many(self, queries):
+        """
+        Runs many queries concurrently, bounded by `max_concurrency`.
+
+        Args:
+            queries (iterable): Tuples of (server, name, record_type).
+
+        Returns:
+            list: One DNSResponse or DNSQueryError per query, in the same order.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(server, name, record_type):
+            async with semaphore:
+                try:
+                    return await self.query(server, name, record_type)
+                except DNSQueryError as e:
+                    return e
+
+        return await asyncio.gather(*(run(*query) for query in queries))
+
+
+class PropagationVerifier:
+    """
+    Verifies record changes on the wire by querying every ClouDNS name server directly.
+
+    The authoritative name servers are learned from `DNSZoneAPI.get_available_name_servers`. Each changed
+    (host, type) pair is then queried on every server concurrently, and compared with the expected values.
+
+    Args:
+        zone_api (DNSZoneAPI): Zone API used to list the name servers.
+        client (DNSQueryClient, optional): DNS client used for the queries.
+        servers (dict, optional): Mapping of name server names to IP addresses. Skips the API lookup; useful
+            to test against a local stub server.
+
+    Example:
+        verifier = PropagationVerifier(api.zone)
+        result = verifier.verify('example.com', [('www', 'A', '203.0.113.7'), ('', 'MX', 'mx.example.net')])
+        # {'ns1.cloudns.net': {('www', 'A'): True, ('', 'MX'): True}, ...}
+    """
+
+    def __init__(self, zone_api=None, client=None, servers=None):
+        self.zone_api = zone_api
+        self.client = client or DNSQueryClient()
+        self.servers = servers
+
+    def name_servers(self, server_type=None, ipv6=False):
+        """
+        Returns the name servers to query.
+
+        Args:
+            server_type (str, optional): Only servers of this type (e.g., 'free' or 'premium').
+            ipv6 (bool, optional): Use the IPv6 addresses instead of IPv4. Defaults to False.
+
+        Returns:
+            dict: Mapping of name server names to IP addresses.
+
+        Raises:
+            ClouDNSAPIException: If the API reports a failure.
+        """
+        if self.servers is not None:
+            return dict(self.servers)
+        response = self.zone_api.get_available_name_servers()
+        if isinstance(response, dict):
+            raise ClouDNSAPIException(response)
+        address_key = 'ip6' if ipv6 else 'ip4'
+        return {server['name']: server[address_key] for server in response
+                if server.get(address_key) and (server_type is None or server.get('type') == server_type)}
+
+    @staticmethod
+    def _normalize_changes(changes):
+        expected = {}
+        for change in changes:
+            if isinstance(change, dict):
+                host, record_type, value = change.get('host', ''), change['type'], change.get('record')
+            else:
+                host, record_type, value = (tuple(change) + (None,))[:3]
+            values = expected.setdefault((host or '', record_type.upper()), set())
+            if value is not None:
+                values.add(normalize_value(value))
+        return expected
+
+    async def verify_async(self, zone, changes, servers=None):
+        """
+        Verifies changes on every name server.
+
+        Args:
+            zone (str): Domain name the records belong to.
+            changes (iterable): Changed records, as (host, type, value) tuples or record dicts. A (host, type)
+                pair with no value only checks that the name answers with at least one record of that type;
+                several values for the same pair must all be present.
+            servers (dict, optional): Mapping of name server names to IP addresses. Defaults to `name_servers()`.
+
+        Returns:
+            dict: Mapping of name server name to {(host, type): bool}.
+        """
+        servers = self.name_servers() if servers is None else servers
+        expected = self._normalize_changes(changes)
+        queries, keys = [], []
+        for server_name, address in servers.items():
+            for host, record_type in expected:
+                name = f"{host}.{zone}" if host else zone
+                queries.append((address, name, record_type))
+                keys.append((server_name, (host, record_type)))
+
+        responses = await self.client.query_many(queries)
+        result = {server_name: {} for server_name in servers}
+        for (server_name, key), response in zip(keys, responses):
+            if isinstance(response, Exception) or response.rcode != RCODE_NOERROR:
+                result[server_name][key] = False
+                continue
+            answered = {normalize_value(answer.value) for answer in response.answers if answer.type == key[1]}
+            wanted = expected[key]
+            result[server_name][key] = wanted <= answered if wanted else bool(answered)
+        return result
+
+    def verify(self, zone, changes, servers=None):
+        """
+        Synchronous wrapper around `verify_async`.
+
+        Args:
+            zone (str): Domain name the records belong to.
+            changes (iterable): Changed records, see `verify_async`.
+            servers (dict, optional): Mapping of name server names to IP addresses.
+
+        Returns:
+            dict: Mapping of name server name to {(host, type): bool}.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.verify_async(zone, changes, servers))
+        finally:
+            loop.close()
+
+    @staticmethod
+    def converged(result):
+        """
+        Returns True if every change was seen on every name server.
+
+        Args:
+            result (dict): Result of `verify` or `verify_async`.
+
+        Returns:
+            bool: True if fully converged.
+        """
+        return all(all(checks.values()) for checks in result.values())
@@ -5,4 +5,36 @@ class ClouDNSAPIException(Exception):
         super().__init__(self.description)
 
     def __str__(self):
-        return f"ClouDNSAPIException: {self.status} - {self.description}"
\ No newline at end of file
+        return f"ClouDNSAPIException: {self.status} - {self.description}"
+
+
+class DNSQueryError(Exception):
+    """
+    Raised when a DNS query cannot be completed (timeout, malformed response or network error).
+    """
+
+
+class RateLimitQueueFull(Exception):
+    """
+    Raised when a priority lane of the request scheduler already has its maximum number of waiting callers.
+    """
+
+    def __init__(self, lane, max_queue):
+        self.lane = lane
+        self.max_queue = max_queue
+        super().__init__(f"Lane '{lane}' already has {max_queue} waiting requests.")
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of making a request while the circuit breaker of its endpoint family is open.
+    """
+
+    def __init__(self, family, retry_after, last_error=None):
+        self.family = family
+        self.retry_after = retry_after
+        self.last_error = last_error
+        message = f"Circuit for '{family}' endpoints is open; retry in {retry_after:.1f}s."
+        if last_error:
+            message += f" Last error: {last_error}"
+        super().__init__(message)
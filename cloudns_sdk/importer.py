@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .bind import format_bind_record, parse_bind
+from .exceptions import ClouDNSAPIException
+
+ImportResult = namedtuple('ImportResult', ['zone', 'chunks', 'records', 'skipped_chunks'])
+
+
+def iter_bind_chunks(records, zone, max_bytes=262144, max_records=None, skip_types=('SOA',)):
+    """
+    Groups records into size-bounded BIND documents.
+
+    Args:
+        records (iterable): Record dicts, e.g. from `parse_bind`.
+        zone (str): Domain name of the zone, emitted as $ORIGIN in every chunk.
+        max_bytes (int, optional): Maximum size of a chunk in bytes (UTF-8). Defaults to 256 KiB.
+        max_records (int, optional): Maximum number of records per chunk. Defaults to no limit.
+        skip_types (iterable, optional): Record types left out of the chunks. Defaults to ('SOA',), since
+            the SOA record is managed by ClouDNS.
+
+    Yields:
+        tuple: (content, record_count) for each chunk.
+    """
+    header = f"$ORIGIN {zone.rstrip('.')}.\n"
+    lines, size = [], len(header)
+    for record in records:
+        if record.get('type') in skip_types:
+            continue
+        line = format_bind_record(record) + '\n'
+        line_size = len(line.encode('utf-8'))
+        if lines and (size + line_size > max_bytes or (max_records and len(lines) >= max_records)):
+            yield header + ''.join(lines), len(lines)
+            lines, size = [], len(header)
+        lines.append(line)
+        size += line_size
+    if lines:
+        yield header + ''.join(lines), len(lines)
+
+
+class ChunkedImporter:
+    """
+    Imports large zones through `TransferAPI.import_records` in size-bounded, resumable chunks.
+
+    Records of a zone are split into BIND chunks that are submitted one after another; only the first chunk
+    of a zone honours `delete_existing_records`. Failed chunks are retried with exponential backoff, and
+    independent zones are imported in parallel. When `checkpoint_path` is given, the SHA-256 digest of every
+    chunk imported is recorded after that chunk, so an interrupted job resumes where it stopped and a finished
+    zone is not imported again unless its content changed. Records are streamed: a chunk is built, compared
+    with the checkpoint and submitted before the next one is read.
+
+    Args:
+        transfer_api (TransferAPI): Transfer API used to import records.
+        max_bytes (int, optional): Maximum size of a chunk in bytes. Defaults to 256 KiB.
+        max_records (int, optional): Maximum number of records per chunk. Defaults to no limit.
+        max_workers (int, optional): Number of zones imported in parallel. Defaults to 4.
+        retries (int, optional): Attempts per chunk. Defaults to 3.
+        retry_delay (float, optional): Seconds before the first retry, doubled after each attempt. Defaults to 1.
+        checkpoint_path (str, optional): JSON file recording the progress of each zone.
+
+    Example:
+        importer = ChunkedImporter(api.zone.transfer, checkpoint_path='import-progress.json')
+        importer.import_zones({'example.com': 'example.com.zone'}, delete_existing_records=True)
+    """
+
+    def __init__(self, transfer_api, max_bytes=262144, max_records=None, max_workers=4, retries=3,
+                 retry_delay=1.0, checkpoint_path=None):
+        self.transfer_api = transfer_api
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.checkpoint_path = checkpoint_path
+        self._lock = threading.Lock()
+        self.progress = self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as file:
+                return json.load(file)
+        return {}
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        temp_path = f"{self.checkpoint_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.progress, file)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def _submit_chunk(self, zone, content, delete_existing_records, record_types):
+        delay = self.retry_delay
+        for attempt in range(self.retries):
+            try:
+                response = self.transfer_api.import_records(zone, format='bind', content=content,
+                                                            delete_existing_records=delete_existing_records,
+                                                            record_types=record_types)
+                if isinstance(response, dict) and response.get('status') == 'Failed':
+                    raise ClouDNSAPIException(response)
+                return response
+            except Exception:
+                if attempt + 1 >= self.retries:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    @staticmethod
+    def _file_digest(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1048576), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _chunks(self, zone, records):
+        if isinstance(records, str):
+            with open(records, encoding='utf-8') as zone_file:
+                yield from iter_bind_chunks(parse_bind(zone_file, zone), zone, self.max_bytes, self.max_records)
+        else:
+            yield from iter_bind_chunks(records, zone, self.max_bytes, self.max_records)
+
+    def _reset(self, zone, digest):
+        state = self.progress[zone] = {'digest': digest, 'chunks': [], 'completed': False,
+                                       'max_bytes': self.max_bytes, 'max_records': self.max_records}
+        self._save_checkpoint()
+        return state
+
+    def import_zone(self, zone, records, delete_existing_records=False, record_types=None):
+        """
+        Imports the records of a single zone in chunks.
+
+        The checkpoint of a zone lists the digests of the chunks already imported. Each chunk is compared with
+        the digest recorded at its position: matching chunks are skipped, so a completed zone with unchanged
+        content sends nothing and an interrupted import resumes after its last imported chunk. From the first
+        chunk that differs, the import continues with the new content. A zone file is also compared as a whole
+        with the digest of the file that was imported: it is not read at all when it was completed unchanged,
+        and starts afresh when it changed.
+
+        With `delete_existing_records`, content that changed after its first chunk cannot be resumed from a
+        record iterable, since the earlier chunks would have to be sent again after the deletion: the zone's
+        checkpoint is then reset and ValueError is raised, and the zone must be imported again from the start.
+
+        Args:
+            zone (str): Domain name to import records into.
+            records (iterable or str): Record dicts, or the path of a BIND zone file.
+            delete_existing_records (bool, optional): Delete existing records before importing. Only sent with
+                the first chunk. Defaults to False.
+            record_types (list, optional): Record types to import.
+
+        Returns:
+            ImportResult: Number of chunks and records submitted, and chunks skipped because the checkpoint
+            showed they were already imported.
+
+        Raises:
+            ValueError: If the checkpoint was written with different chunk limits, or the content changed after
+                its first chunk was imported with `delete_existing_records`.
+            ClouDNSAPIException: If a chunk still fails after all retries.
+        """
+        file_digest = self._file_digest(records) if isinstance(records, str) else None
+
+        with self._lock:
+            state = self.progress.get(zone)
+            if state is not None and (state['max_bytes'], state['max_records']) != (self.max_bytes,
+                                                                                   self.max_records):
+                raise ValueError(f"Checkpoint for {zone} was written with different chunk limits; cannot resume.")
+            if state is None or 'chunks' not in state or state.get('digest') != file_digest:
+                state = self._reset(zone, file_digest)
+            if file_digest is not None and state['completed']:
+                done = len(state['chunks'])
+                return ImportResult(zone, done, 0, done)
+            imported = state['chunks']
+
+        chunks = submitted = skipped = 0
+        for content, count in self._chunks(zone, records):
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            if chunks < len(imported) and imported[chunks] == digest:
+                skipped += 1
+                chunks += 1
+                continue
+            if chunks < len(imported):
+                self._diverged(zone, chunks, delete_existing_records, file_digest)
+            self._submit_chunk(zone, content, delete_existing_records and chunks == 0, record_types)
+            submitted += count
+            with self._lock:
+                del imported[chunks:]
+                imported.append(digest)
+                state['completed'] = False
+                self._save_checkpoint()
+            chunks += 1
+
+        if chunks < len(imported):
+            self._diverged(zone, chunks, delete_existing_records, file_digest)
+        with self._lock:
+            del imported[chunks:]
+            state['completed'] = True
+            self._save_checkpoint()
+        return ImportResult(zone, chunks, submitted, skipped)
+
+    def _diverged(self, zone, position, delete_existing_records, file_digest):
+        if position and delete_existing_records:
+            with self._lock:
+                self._reset(zone, file_digest)
+            raise ValueError(f"Content of {zone} changed after chunk {position} was imported with "
+                             f"delete_existing_records; its checkpoint was reset, import the zone again.")
+
+    def import_zones(self, zones, delete_existing_records=False, record_types=None):
+        """
+        Imports several zones in parallel.
+
+        Args:
+            zones (dict): Mapping of domain names to record iterables or BIND zone file paths.
+            delete_existing_records (bool, optional): Delete existing records before importing. Defaults to False.
+            record_types (list, optional): Record types to import.
+
+        Returns:
+            dict: Mapping of domain names to ImportResult, or to the exception that stopped the zone.
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.import_zone, zone, records, delete_existing_records, record_types): zone
+                       for zone, records in zones.items()}
+            for future, zone in futures.items():
+                try:
+                    results[zone] = future.result()
+                except Exception as e:
+                    results[zone] = e
+        return results
@@ -0,0 +1,245 @@
+import bisect
+import gzip
+import ipaddress
+import json
+import threading
+import time
+from collections import namedtuple
+
+IndexEntry = namedtuple('IndexEntry', ['zone', 'record_id', 'host', 'type'])
+
+
+def normalize_value(value):
+    """
+    Normalizes a record value so that equivalent spellings share one index key.
+
+    IP addresses are converted to their canonical compressed form, hostnames are lower-cased and stripped of
+    their trailing dot.
+
+    Args:
+        value (str): Record value (e.g., '203.0.113.7' or 'lb1.example.net.').
+
+    Returns:
+        str: Normalized value.
+    """
+    value = str(value).strip()
+    try:
+        return str(ipaddress.ip_address(value))
+    except ValueError:
+        return value.rstrip('.').lower()
+
+
+class ReverseIndex:
+    """
+    Account-wide reverse index from record values (IP addresses or targets) to the records pointing at them.
+
+    The index is built zone by zone from `RecordsAPI.list_records` and can be refreshed incrementally: refreshing
+    a zone replaces only that zone's entries. IP addresses are additionally kept in sorted arrays so that
+    whole networks can be queried with `lookup_network`. The index can be persisted to and loaded from a JSON
+    file (gzip-compressed when the path ends with '.gz').
+
+    Args:
+        records_api (RecordsAPI, optional): Records API used to list records when building or refreshing.
+        zone_api (DNSZoneAPI, optional): Zone API used to enumerate zones when building the whole index.
+
+    Example:
+        index = ReverseIndex(api.zone.records, api.zone)
+        index.build()
+        index.lookup('203.0.113.7')
+        index.lookup_network('10.0.0.0/8')
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, records_api=None, zone_api=None):
+        self.records_api = records_api
+        self.zone_api = zone_api
+        self._lock = threading.RLock()
+        self._values = {}
+        self._zones = {}
+        self._refreshed = {}
+        self._ip_keys = None
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._zones.values())
+
+    @property
+    def zones(self):
+        """
+        dict: Mapping of indexed zone names to the UNIX time they were last refreshed.
+        """
+        return dict(self._refreshed)
+
+    def build(self, zones=None, rows_per_page=100):
+        """
+        Builds the index for all zones of the account, or for the given zones.
+
+        Args:
+            zones (iterable, optional): Domain names to index. Defaults to every zone returned by
+                `DNSZoneAPI.iter_zones`.
+            rows_per_page (int, optional): Page size used for listing (default 100).
+
+        Returns:
+            ReverseIndex: The index itself.
+        """
+        if zones is None:
+            zones = (zone['name'] for zone in self.zone_api.iter_zones(rows_per_page=rows_per_page))
+        for zone in zones:
+            self.refresh_zone(zone, rows_per_page=rows_per_page)
+        return self
+
+    def refresh_zone(self, zone, rows_per_page=100):
+        """
+        Re-lists the records of a zone and replaces its entries in the index.
+
+        Args:
+            zone (str): Domain name to refresh.
+            rows_per_page (int, optional): Page size used for listing (default 100).
+        """
+        records = []
+        for page in self.records_api.iter_record_pages(zone, rows_per_page=rows_per_page):
+            records.extend(page.values() if isinstance(page, dict) else page)
+        self.set_zone_records(zone, records)
+
+    def set_zone_records(self, zone, records, refreshed=None):
+        """
+        Replaces the entries of a zone with the given records.
+
+        Args:
+            zone (str): Domain name the records belong to.
+            records (iterable): Record dicts as returned by the API (with 'id', 'host', 'type' and 'record').
+            refreshed (float, optional): UNIX time of the refresh. Defaults to now.
+        """
+        rows = [(normalize_value(record['record']), IndexEntry(zone, record['id'], record.get('host', ''),
+                                                               record.get('type')))
+                for record in records if record.get('record')]
+        with self._lock:
+            self._remove(zone)
+            self._zones[zone] = rows
+            for value, entry in rows:
+                self._values.setdefault(value, []).append(entry)
+            self._refreshed[zone] = time.time() if refreshed is None else refreshed
+            self._ip_keys = None
+
+    def remove_zone(self, zone):
+        """
+        Removes all entries of a zone from the index.
+
+        Args:
+            zone (str): Domain name to remove.
+        """
+        with self._lock:
+            self._remove(zone)
+            self._refreshed.pop(zone, None)
+            self._ip_keys = None
+
+    def _remove(self, zone):
+        for value in {value for value, _ in self._zones.pop(zone, ())}:
+            entries = self._values.get(value)
+            if entries is None:
+                continue
+            entries = [existing for existing in entries if existing.zone != zone]
+            if entries:
+                self._values[value] = entries
+            else:
+                del self._values[value]
+
+    def lookup(self, value):
+        """
+        Returns the records whose value equals the given IP address or target.
+
+        Args:
+            value (str): IP address or hostname (e.g., '203.0.113.7' or 'lb1.example.net').
+
+        Returns:
+            list: IndexEntry tuples of (zone, record_id, host, type).
+        """
+        return list(self._values.get(normalize_value(value), ()))
+
+    def _sorted_ips(self):
+        keys = self._ip_keys
+        if keys is None:
+            with self._lock:
+                pairs = {4: [], 6: []}
+                for value in self._values:
+                    try:
+                        address = ipaddress.ip_address(value)
+                    except ValueError:
+                        continue
+                    pairs[address.version].append((int(address), value))
+                keys = {}
+                for version, version_pairs in pairs.items():
+                    version_pairs.sort()
+                    keys[version] = ([number for number, _ in version_pairs], [value for _, value in version_pairs])
+                self._ip_keys = keys
+        return keys
+
+    def lookup_network(self, network):
+        """
+        Returns the records whose value is an IP address within the given network.
+
+        Args:
+            network (str): Network in CIDR notation (e.g., '10.0.0.0/8' or '2001:db8::/32').
+
+        Returns:
+            list: IndexEntry tuples of (zone, record_id, host, type), ordered by IP address.
+        """
+        network = ipaddress.ip_network(network, strict=False)
+        numbers, values = self._sorted_ips()[network.version]
+        start = bisect.bisect_left(numbers, int(network.network_address))
+        end = bisect.bisect_right(numbers, int(network.broadcast_address))
+        result = []
+        for value in values[start:end]:
+            result.extend(self._values.get(value, ()))
+        return result
+
+    def save(self, path):
+        """
+        Persists the index to a JSON file (gzip-compressed when the path ends with '.gz').
+
+        Args:
+            path (str): File path to write.
+        """
+        with self._lock:
+            data = {
+                'version': self.FORMAT_VERSION,
+                'zones': {
+                    zone: {
+                        'refreshed': self._refreshed.get(zone),
+                        'records': [[entry.record_id, entry.host, entry.type, value] for value, entry in rows],
+                    }
+                    for zone, rows in self._zones.items()
+                },
+            }
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, path, records_api=None, zone_api=None):
+        """
+        Loads an index previously written with `save`.
+
+        Args:
+            path (str): File path to read.
+            records_api (RecordsAPI, optional): Records API used for later refreshes.
+            zone_api (DNSZoneAPI, optional): Zone API used for later rebuilds.
+
+        Returns:
+            ReverseIndex: The loaded index.
+
+        Raises:
+            ValueError: If the file was written by an incompatible version.
+        """
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as file:
+            data = json.load(file)
+        if data.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported reverse index format version: {data.get('version')}")
+
+        index = cls(records_api, zone_api)
+        for zone, zone_data in data['zones'].items():
+            records = [{'id': record_id, 'host': host, 'type': record_type, 'record': value}
+                       for record_id, host, record_type, value in zone_data['records']]
+            index.set_zone_records(zone, records, refreshed=zone_data.get('refreshed'))
+        return index
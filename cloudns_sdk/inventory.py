@@ -0,0 +1,290 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+SECTIONS = ('records', 'soa', 'failover', 'mail_forwards', 'notes', 'cloud_domains', 'dnssec')
+
+InventoryResult = namedtuple('InventoryResult', ['zones', 'completed', 'skipped', 'failed'])
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, started REAL NOT NULL, finished REAL)',
+    'CREATE TABLE IF NOT EXISTS zones (name TEXT PRIMARY KEY, type TEXT, zone TEXT, status TEXT, data TEXT, '
+    'run INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS records (zone TEXT NOT NULL, id TEXT NOT NULL, host TEXT, type TEXT, '
+    'record TEXT, ttl TEXT, status TEXT, failover TEXT, data TEXT, PRIMARY KEY (zone, id))',
+    'CREATE TABLE IF NOT EXISTS failover (zone TEXT NOT NULL, record_id TEXT NOT NULL, data TEXT, '
+    'PRIMARY KEY (zone, record_id))',
+    'CREATE TABLE IF NOT EXISTS zone_data (zone TEXT NOT NULL, section TEXT NOT NULL, data TEXT, '
+    'PRIMARY KEY (zone, section))',
+    'CREATE TABLE IF NOT EXISTS account_data (section TEXT PRIMARY KEY, data TEXT, updated REAL NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS checkpoints (run INTEGER NOT NULL, zone TEXT NOT NULL, section TEXT NOT NULL, '
+    'error TEXT, updated REAL NOT NULL, PRIMARY KEY (run, zone, section))',
+)
+_ZONE_TABLES = ('records', 'failover', 'zone_data')
+
+
+class AccountInventory:
+    """
+    Crawls a whole account (zones, records, SOA, failover settings, mail forwards, notes, cloud domains,
+    DNSSEC and groups) into a local SQLite snapshot, concurrently and resumably.
+
+    Zones are enumerated page by page with `DNSZoneAPI.iter_zones` and processed by `max_workers` threads,
+    with at most twice that many zones queued. Each section of a zone ('records', 'soa', 'failover',
+    'mail_forwards', 'notes', 'cloud_domains', 'dnssec') is fetched and written in its own transaction,
+    together with a checkpoint, so an interrupted run resumed with `run(resume=True)` only fetches the
+    sections it had not completed. Failed sections are recorded in the checkpoint with their error and
+    retried by the next resumed run.
+
+    Requests are kept to what the account needs: failover settings are only fetched for records whose
+    `list_records` entry has failover enabled, and cloud domains only for zones listed with
+    `has_cloud_domains`. Section responses are stored as returned by the API (JSON in `data` columns), with
+    records and zones also split into columns for querying.
+
+    Args:
+        client (ClouDNSAPI): Client used for all requests, e.g. `api.in_lane('bulk')`.
+        path (str): Path of the SQLite database file.
+        max_workers (int, optional): Number of zones crawled concurrently. Defaults to 8.
+        sections (iterable, optional): Sections to crawl. Defaults to all of `SECTIONS`.
+        rows_per_page (int, optional): Page size used for listing zones and records. Defaults to 100.
+
+    Example:
+        inventory = AccountInventory(api.in_lane('bulk'), 'inventory.db', max_workers=16)
+        result = inventory.run()
+        rows = inventory.query('SELECT zone, type, COUNT(*) FROM records GROUP BY zone, type')
+    """
+
+    def __init__(self, client, path, max_workers=8, sections=None, rows_per_page=100):
+        sections = tuple(sections or SECTIONS)
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            raise ValueError(f"Invalid sections: {', '.join(sorted(unknown))}. "
+                             f"Expected any of {', '.join(SECTIONS)}.")
+        if 'failover' in sections and 'records' not in sections:
+            raise ValueError("The 'failover' section requires the 'records' section.")
+        self.client = client
+        self.zone_api = client.zone
+        self.path = path
+        self.max_workers = max_workers
+        self.sections = sections
+        self.rows_per_page = rows_per_page
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the snapshot database.
+        """
+        self._db.close()
+
+    def query(self, sql, params=()):
+        """
+        Runs a read query against the snapshot.
+
+        Args:
+            sql (str): SQL statement.
+            params (tuple, optional): Statement parameters.
+
+        Returns:
+            list: Result rows as tuples.
+        """
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _start_run(self, resume):
+        with self._lock, self._db:
+            row = self._db.execute('SELECT id FROM runs WHERE finished IS NULL ORDER BY id DESC LIMIT 1').fetchone()
+            if row is not None and resume:
+                return row[0]
+            self._db.execute('UPDATE runs SET finished = ? WHERE finished IS NULL', (time.time(),))
+            return self._db.execute('INSERT INTO runs (started) VALUES (?)', (time.time(),)).lastrowid
+
+    def _completed(self, run):
+        with self._lock:
+            rows = self._db.execute('SELECT zone, section FROM checkpoints WHERE run = ? AND error IS NULL',
+                                    (run,)).fetchall()
+        completed = {}
+        for zone, section in rows:
+            completed.setdefault(zone, set()).add(section)
+        return completed
+
+    def _save_zone(self, run, zone):
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO zones VALUES (?, ?, ?, ?, ?, ?)',
+                             (zone['name'], zone.get('type'), zone.get('zone'), zone.get('status'),
+                              json.dumps(zone), run))
+
+    def _checkpoint(self, run, zone, section, error=None):
+        self._db.execute('INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)',
+                         (run, zone, section, error, time.time()))
+
+    def _fetch_records(self, zone):
+        records = {}
+        for page in self.zone_api.records.iter_record_pages(zone, rows_per_page=self.rows_per_page):
+            for record in page.values():
+                records[str(record['id'])] = record
+        return records
+
+    def _write_records(self, run, zone, records):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM records WHERE zone = ?', (zone,))
+            self._db.executemany('INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', [
+                (zone, record_id, record.get('host'), record.get('type'), record.get('record'),
+                 record.get('ttl'), record.get('status'), record.get('failover'), json.dumps(record))
+                for record_id, record in records.items()])
+            self._checkpoint(run, zone, 'records')
+
+    def _stored_failover_ids(self, zone):
+        with self._lock:
+            rows = self._db.execute("SELECT id FROM records WHERE zone = ? AND failover = '1'", (zone,)).fetchall()
+        return [row[0] for row in rows]
+
+    def _write_failover(self, run, zone, settings):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM failover WHERE zone = ?', (zone,))
+            self._db.executemany('INSERT INTO failover VALUES (?, ?, ?)',
+                                 [(zone, record_id, json.dumps(data)) for record_id, data in settings.items()])
+            self._checkpoint(run, zone, 'failover')
+
+    def _write_section(self, run, zone, section, data):
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO zone_data VALUES (?, ?, ?)', (zone, section, json.dumps(data)))
+            self._checkpoint(run, zone, section)
+
+    def _fetch_section(self, zone, section):
+        if section == 'soa':
+            return self.zone_api.records.get_soa_details(zone)
+        if section == 'mail_forwards':
+            return self.zone_api.forward.list_mail_forwards(zone)
+        if section == 'notes':
+            return self.zone_api.notes.get_note(zone)
+        if section == 'cloud_domains':
+            return self.zone_api.cloud.list_cloud_domains(zone)
+        return {'available': self.zone_api.dnssec.is_dnssec_available(zone),
+                'ds_records': self.zone_api.dnssec.get_ds_records(zone)}
+
+    def _crawl_zone(self, run, zone, done, has_cloud):
+        errors = {}
+        records = None
+        for section in self.sections:
+            if section in done or (section == 'cloud_domains' and zone not in has_cloud):
+                continue
+            try:
+                if section == 'records':
+                    records = self._fetch_records(zone)
+                    self._write_records(run, zone, records)
+                elif section == 'failover':
+                    if 'records' not in done and records is None:
+                        raise RuntimeError("Records of the zone could not be listed.")
+                    record_ids = [record_id for record_id, record in records.items()
+                                  if str(record.get('failover')) == '1'] if records is not None \
+                        else self._stored_failover_ids(zone)
+                    self._write_failover(run, zone, {
+                        record_id: self.client.failover.get_failover_settings(zone, record_id)
+                        for record_id in record_ids})
+                else:
+                    self._write_section(run, zone, section, self._fetch_section(zone, section))
+            except Exception as e:
+                errors[section] = e
+                with self._lock, self._db:
+                    self._checkpoint(run, zone, section, f"{type(e).__name__}: {e}")
+        return errors
+
+    def _crawl_groups(self, run):
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM checkpoints WHERE run = ? AND zone = '' AND section = 'groups' "
+                                "AND error IS NULL", (run,)).fetchone():
+                return False
+        try:
+            groups = self.zone_api.groups.list_groups()
+        except Exception as e:
+            with self._lock, self._db:
+                self._checkpoint(run, '', 'groups', f"{type(e).__name__}: {e}")
+            raise
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO account_data VALUES (?, ?, ?)',
+                             ('groups', json.dumps(groups), time.time()))
+            self._checkpoint(run, '', 'groups')
+        return True
+
+    def _finish_run(self, run):
+        with self._lock, self._db:
+            for table in _ZONE_TABLES:
+                self._db.execute(f'DELETE FROM {table} WHERE zone IN (SELECT name FROM zones WHERE run < ?)', (run,))
+            self._db.execute('DELETE FROM zones WHERE run < ?', (run,))
+            self._db.execute('UPDATE runs SET finished = ? WHERE id = ?', (time.time(), run))
+
+    def run(self, resume=True, on_progress=None):
+        """
+        Crawls the account into the snapshot.
+
+        When every zone section completed, the run is closed and zones that no longer exist in the account
+        are removed from the snapshot. Otherwise the run stays open and the next `run(resume=True)` fetches
+        only the missing and failed sections.
+
+        Args:
+            resume (bool, optional): Continue the last unfinished run. With False a new run is started and
+                every section is fetched again. Defaults to True.
+            on_progress (callable, optional): Called as on_progress(zone, errors) after each crawled zone,
+                with a dict mapping failed sections to their exceptions.
+
+        Returns:
+            InventoryResult: Number of zones seen, and lists of zones completed, skipped (already complete
+            in the resumed run) and failed (mapping of zone to {section: exception}).
+        """
+        run = self._start_run(resume)
+        completed_sections = self._completed(run)
+        has_cloud = set()
+        if 'cloud_domains' in self.sections:
+            has_cloud = {zone['name'] for zone in self.zone_api.iter_zones(rows_per_page=self.rows_per_page,
+                                                                          has_cloud_domains=1)}
+        failed = {}
+        try:
+            self._crawl_groups(run)
+        except Exception as e:
+            failed[''] = {'groups': e}
+        completed, skipped = [], []
+        count = 0
+
+        def collect(zone, future):
+            errors = future.result()
+            if errors:
+                failed[zone] = errors
+            else:
+                completed.append(zone)
+            if on_progress:
+                on_progress(zone, errors)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            for zone in self.zone_api.iter_zones(rows_per_page=self.rows_per_page):
+                name = zone['name']
+                count += 1
+                self._save_zone(run, zone)
+                done = completed_sections.get(name, set())
+                wanted = {section for section in self.sections if section != 'cloud_domains' or name in has_cloud}
+                if wanted <= done:
+                    skipped.append(name)
+                    continue
+                pending[executor.submit(self._crawl_zone, run, name, done, has_cloud)] = name
+                if len(pending) >= self.max_workers * 2:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(pending.pop(future), future)
+            for future in list(pending):
+                collect(pending.pop(future), future)
+        if not failed:
+            self._finish_run(run)
+        return InventoryResult(count, completed, skipped, failed)
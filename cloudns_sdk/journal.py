@@ -0,0 +1,283 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .exceptions import CircuitOpenError, ClouDNSAPIException, RateLimitQueueFull
+
+PLANNED = 'planned'
+STARTED = 'started'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+IN_DOUBT = 'in-doubt'
+
+# Errors that prove an operation did not take effect: the API rejected it, or it was never sent.
+REJECTED_ERRORS = (ClouDNSAPIException, ValueError, CircuitOpenError, RateLimitQueueFull)
+
+JournalEntry = namedtuple('JournalEntry', ['job', 'key', 'method', 'args', 'status', 'result', 'error', 'updated'])
+JobResult = namedtuple('JobResult', ['succeeded', 'skipped', 'failed', 'in_doubt'])
+
+
+class Journal:
+    """
+    Append-only, durable journal of planned bulk operations and their outcomes, backed by SQLite.
+
+    Operations are recorded once in the `operations` table. Every state transition (planned, started,
+    succeeded, failed, in-doubt) is inserted as a new row of the `events` table and committed before the next
+    step, so after a crash the journal shows exactly which operations completed and which were in flight, and
+    the full history of each operation (e.g., a failed attempt followed by a later success) is kept. The
+    current status of an operation is its latest event, also available as the `current` view.
+
+    Args:
+        path (str): Path of the SQLite database file.
+    """
+
+    _CURRENT = ('SELECT o.job, o.key, o.method, o.args, e.status, e.result, e.error, e.recorded '
+                'FROM operations o JOIN events e ON e.id = (SELECT MAX(id) FROM events '
+                'WHERE job = o.job AND key = o.key)')
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS operations (job TEXT NOT NULL, key TEXT NOT NULL, '
+                             'method TEXT, args TEXT, planned REAL NOT NULL, PRIMARY KEY (job, key))')
+            self._db.execute('CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                             'job TEXT NOT NULL, key TEXT NOT NULL, status TEXT NOT NULL, result TEXT, error TEXT, '
+                             'recorded REAL NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS events_operation ON events (job, key, id)')
+            self._db.execute(f'CREATE VIEW IF NOT EXISTS current AS {self._CURRENT}')
+
+    def close(self):
+        """
+        Closes the journal database.
+        """
+        self._db.close()
+
+    def _status(self, job, key):
+        row = self._db.execute('SELECT status FROM events WHERE job = ? AND key = ? ORDER BY id DESC LIMIT 1',
+                               (job, key)).fetchone()
+        return row[0] if row else None
+
+    def plan(self, job, key, method, args):
+        """
+        Records a planned operation, unless the journal already knows it.
+
+        Args:
+            job (str): Job identifier.
+            key (str): Operation key, unique within the job.
+            method (str): Dotted path of the SDK method (e.g., 'zone.records.add_record').
+            args (dict): JSON-serializable arguments, stored for auditing.
+
+        Returns:
+            str: The current status of the operation.
+        """
+        with self._lock, self._db:
+            now = time.time()
+            inserted = self._db.execute('INSERT OR IGNORE INTO operations VALUES (?, ?, ?, ?, ?)',
+                                        (job, key, method, json.dumps(args, default=str), now)).rowcount
+            if inserted:
+                self._db.execute('INSERT INTO events (job, key, status, recorded) VALUES (?, ?, ?, ?)',
+                                 (job, key, PLANNED, now))
+                return PLANNED
+            return self._status(job, key)
+
+    def mark(self, job, key, status, result=None, error=None):
+        """
+        Appends a state transition of an operation.
+
+        Args:
+            job (str): Job identifier.
+            key (str): Operation key.
+            status (str): New status ('started', 'succeeded', 'failed' or 'in-doubt').
+            result (optional): JSON-serializable result of a succeeded operation.
+            error (str, optional): Error message of a failed operation.
+        """
+        with self._lock, self._db:
+            self._db.execute('INSERT INTO events (job, key, status, result, error, recorded) '
+                             'VALUES (?, ?, ?, ?, ?, ?)',
+                             (job, key, status, None if result is None else json.dumps(result, default=str), error,
+                              time.time()))
+
+    def statuses(self, job):
+        """
+        Returns the current status of every operation of a job.
+
+        Args:
+            job (str): Job identifier.
+
+        Returns:
+            dict: Mapping of operation keys to statuses.
+        """
+        with self._lock:
+            return dict(self._db.execute('SELECT key, status FROM current WHERE job = ?', (job,)).fetchall())
+
+    @staticmethod
+    def _entries(rows):
+        return [JournalEntry(row[0], row[1], row[2], json.loads(row[3]) if row[3] else None, row[4],
+                             json.loads(row[5]) if row[5] else None, row[6], row[7]) for row in rows]
+
+    def entries(self, job, status=None):
+        """
+        Returns the current journal entries of a job, one per operation.
+
+        Args:
+            job (str): Job identifier.
+            status (str, optional): Only entries whose current status is this one.
+
+        Returns:
+            list: JournalEntry tuples, with args and result decoded from JSON.
+        """
+        query = 'SELECT * FROM current WHERE job = ?'
+        params = (job,)
+        if status is not None:
+            query += ' AND status = ?'
+            params += (status,)
+        with self._lock:
+            return self._entries(self._db.execute(query, params).fetchall())
+
+    def history(self, job, key):
+        """
+        Returns every recorded state of an operation, oldest first.
+
+        Args:
+            job (str): Job identifier.
+            key (str): Operation key.
+
+        Returns:
+            list: JournalEntry tuples, one per state transition.
+        """
+        with self._lock:
+            rows = self._db.execute('SELECT o.job, o.key, o.method, o.args, e.status, e.result, e.error, e.recorded '
+                                    'FROM operations o JOIN events e ON e.job = o.job AND e.key = o.key '
+                                    'WHERE o.job = ? AND o.key = ? ORDER BY e.id', (job, key)).fetchall()
+        return self._entries(rows)
+
+
+class BulkJob:
+    """
+    Runs a planned list of SDK calls with a write-ahead journal, so that an interrupted job can be resumed.
+
+    The job is described by adding operations under deterministic keys. On every run, operations the journal
+    records as succeeded are skipped. An operation fails only when it was definitely not applied: the API
+    rejected it (ClouDNSAPIException) or it was never sent (validation, open circuit, full lane). Operations
+    whose outcome is unknown, because the call ended with a network error or timeout or because the process
+    died mid-call, are "in doubt": they are re-checked with the operation's `check` callable when one was
+    given, and otherwise handled according to `in_doubt`. They are never re-issued by `retry_failed`.
+
+    Args:
+        client (ClouDNSAPI): Client the dotted method paths are resolved against.
+        journal (Journal): Journal recording the operations.
+        job (str): Job identifier. Re-use the same identifier to resume a job.
+        in_doubt (str, optional): What to do with in-doubt operations that have no `check`: 'retry' re-issues
+            them, 'skip' treats them as succeeded, 'fail' leaves them in doubt and reports them in
+            `JobResult.in_doubt`. Defaults to 'fail'.
+
+    Example:
+        job = BulkJob(api, Journal('jobs.sqlite'), 'ttl-change-2024-10')
+        for record in records:
+            job.add(f"mod:{zone}:{record['id']}", 'zone.records.modify_record', zone, record['id'],
+                    host=record['host'], record=record['record'], ttl=300)
+        result = job.run(max_workers=4)
+    """
+
+    IN_DOUBT_POLICIES = ('retry', 'skip', 'fail')
+
+    def __init__(self, client, journal, job, in_doubt='fail'):
+        if in_doubt not in self.IN_DOUBT_POLICIES:
+            raise ValueError(f"Invalid in_doubt policy: {in_doubt}. "
+                             f"Expected one of {', '.join(self.IN_DOUBT_POLICIES)}.")
+        self.client = client
+        self.journal = journal
+        self.job = job
+        self.in_doubt = in_doubt
+        self._operations = []
+
+    def add(self, key, method, *args, check=None, **kwargs):
+        """
+        Adds an operation to the job.
+
+        Args:
+            key (str): Key identifying the operation within the job; must be the same on every run.
+            method (str): Dotted path of the SDK method, relative to the client (e.g., 'zone.records.add_record',
+                'failover.deactivate_failover', 'zone.register_domain_zone').
+            *args: Positional arguments of the method.
+            check (callable, optional): Called with the client for in-doubt operations; returns True if the
+                operation already took effect.
+            **kwargs: Keyword arguments of the method.
+        """
+        self._operations.append((key, method, args, kwargs, check))
+
+    def _resolve(self, method):
+        target = self.client
+        for name in method.split('.'):
+            target = getattr(target, name)
+        return target
+
+    def _run_operation(self, key, method, args, kwargs, check, status):
+        if status in (STARTED, IN_DOUBT):
+            if check is not None:
+                if check(self.client):
+                    self.journal.mark(self.job, key, SUCCEEDED)
+                    return SUCCEEDED, None
+            elif self.in_doubt == 'skip':
+                self.journal.mark(self.job, key, SUCCEEDED)
+                return SUCCEEDED, None
+            elif self.in_doubt == 'fail':
+                error = "Outcome unknown: the operation may have taken effect; resolve it with check or in_doubt."
+                self.journal.mark(self.job, key, IN_DOUBT, error=error)
+                return IN_DOUBT, error
+
+        self.journal.mark(self.job, key, STARTED)
+        try:
+            result = self._resolve(method)(*args, **kwargs)
+            if isinstance(result, dict) and result.get('status') == 'Failed':
+                raise ClouDNSAPIException(result)
+        except REJECTED_ERRORS as e:
+            self.journal.mark(self.job, key, FAILED, error=str(e))
+            return FAILED, str(e)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            self.journal.mark(self.job, key, IN_DOUBT, error=error)
+            return IN_DOUBT, error
+        self.journal.mark(self.job, key, SUCCEEDED, result=result)
+        return SUCCEEDED, None
+
+    def run(self, max_workers=1, retry_failed=True):
+        """
+        Runs every operation that has not succeeded yet.
+
+        Args:
+            max_workers (int, optional): Number of operations run concurrently. Defaults to 1, which keeps
+                the order in which operations were added.
+            retry_failed (bool, optional): Re-issue operations that failed in a previous run. Defaults to True.
+                In-doubt operations are not affected; see `in_doubt`.
+
+        Returns:
+            JobResult: Keys of succeeded and skipped operations, and dicts of failed and in-doubt keys to
+            error messages.
+        """
+        succeeded, skipped, failed, in_doubt = [], [], {}, {}
+        to_run = []
+        for key, method, args, kwargs, check in self._operations:
+            status = self.journal.plan(self.job, key, method, {'args': args, 'kwargs': kwargs})
+            if status == SUCCEEDED or (status == FAILED and not retry_failed):
+                skipped.append(key)
+            else:
+                to_run.append((key, method, args, kwargs, check, status))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(operation[0], executor.submit(self._run_operation, *operation)) for operation in to_run]
+            for key, future in futures:
+                status, error = future.result()
+                if status == SUCCEEDED:
+                    succeeded.append(key)
+                elif status == IN_DOUBT:
+                    in_doubt[key] = error
+                else:
+                    failed[key] = error
+        return JobResult(succeeded, skipped, failed, in_doubt)
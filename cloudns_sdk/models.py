@@ -0,0 +1,198 @@
+import sys
+
+
+class Record:
+    """
+    Compact, typed representation of a DNS record returned by `RecordsAPI.list_records` or `RecordsAPI.get_record`.
+
+    Records use `__slots__` instead of a per-instance dict, intern the host, type and zone strings so that
+    repeated values share one object, and keep numeric fields in their raw API form until they are first read.
+    Fields that are only present for some record types (priority, weight, port, CAA, TLSA, ...) are kept in
+    a small dict that is only allocated when the API returned any of them.
+
+    Attributes:
+        id (int): ID of the record.
+        zone (str): Domain name or reverse zone name the record belongs to, if known.
+        host (str): Host or subdomain of the record.
+        type (str): Type of the record (e.g., A, AAAA, MX, CNAME, etc.).
+        record (str): Record value (e.g., 10.10.10.10 or cname.cloudns.net).
+        ttl (int): Time-to-live value.
+        status (int): 1 if the record is active, 0 otherwise.
+        failover (int): 1 if failover is enabled for the record, 0 otherwise.
+        dynamicurl_status (int): 1 if the dynamic URL is enabled for the record, 0 otherwise.
+        extra (dict): Any remaining fields returned by the API for this record.
+    """
+
+    __slots__ = ('_id', 'zone', 'host', 'type', 'record', '_ttl', '_status', '_failover', '_dynamicurl_status',
+                 '_extra')
+
+    NUMERIC_FIELDS = ('id', 'ttl', 'status', 'failover', 'dynamicurl_status')
+    CORE_FIELDS = NUMERIC_FIELDS + ('host', 'type', 'record')
+
+    def __init__(self, id, host='', type='', record='', ttl=None, status=None, failover=None,
+                 dynamicurl_status=None, zone=None, extra=None):
+        self._id = id
+        self.zone = sys.intern(zone) if zone else zone
+        self.host = sys.intern(host or '')
+        self.type = sys.intern(type or '')
+        self.record = record
+        self._ttl = ttl
+        self._status = status
+        self._failover = failover
+        self._dynamicurl_status = dynamicurl_status
+        self._extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data, zone=None):
+        """
+        Builds a record from a single record dict as returned by the API.
+
+        Args:
+            data (dict): Record data (e.g., one value of the `list_records` response or a `get_record` response).
+            zone (str, optional): Domain name the record belongs to.
+
+        Returns:
+            Record: The record instance.
+        """
+        extra = None
+        for key, value in data.items():
+            if key not in cls.CORE_FIELDS:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        return cls(data.get('id'), data.get('host'), data.get('type'), data.get('record'),
+                   ttl=data.get('ttl'), status=data.get('status'), failover=data.get('failover'),
+                   dynamicurl_status=data.get('dynamicurl_status'), zone=zone, extra=extra)
+
+    @classmethod
+    def from_page(cls, page, zone=None):
+        """
+        Builds records from one page of `list_records` results.
+
+        Args:
+            page (dict or list): Response from `list_records`. The API returns a dict keyed by record ID,
+                or an empty list when there are no records.
+            zone (str, optional): Domain name the records belong to.
+
+        Returns:
+            list: List of Record instances.
+        """
+        rows = page.values() if isinstance(page, dict) else page
+        return [cls.from_dict(row, zone) for row in rows]
+
+    @classmethod
+    def from_pages(cls, pages, zone=None):
+        """
+        Lazily builds records from an iterable of `list_records` pages.
+
+        Args:
+            pages (iterable): Iterable of `list_records` responses.
+            zone (str, optional): Domain name the records belong to.
+
+        Yields:
+            Record: One record at a time, so that only a single page is held in memory.
+        """
+        for page in pages:
+            yield from cls.from_page(page, zone)
+
+    @staticmethod
+    def _to_int(value):
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return int(value)
+        except ValueError:
+            return value
+
+    @property
+    def id(self):
+        value = self._id
+        if value is not None and not isinstance(value, int):
+            value = self._id = self._to_int(value)
+        return value
+
+    @property
+    def ttl(self):
+        value = self._ttl
+        if value is not None and not isinstance(value, int):
+            value = self._ttl = self._to_int(value)
+        return value
+
+    @property
+    def status(self):
+        value = self._status
+        if value is not None and not isinstance(value, int):
+            value = self._status = self._to_int(value)
+        return value
+
+    @property
+    def failover(self):
+        value = self._failover
+        if value is not None and not isinstance(value, int):
+            value = self._failover = self._to_int(value)
+        return value
+
+    @property
+    def dynamicurl_status(self):
+        value = self._dynamicurl_status
+        if value is not None and not isinstance(value, int):
+            value = self._dynamicurl_status = self._to_int(value)
+        return value
+
+    @property
+    def extra(self):
+        return self._extra or {}
+
+    def get(self, key, default=None):
+        """
+        Returns a field by its API name, falling back to the type-specific fields.
+
+        Args:
+            key (str): Field name as used by the API (e.g., 'ttl', 'priority').
+            default: Value returned when the field is not present.
+
+        Returns:
+            The field value, or `default`.
+        """
+        if key in self.CORE_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default)
+
+    def to_dict(self):
+        """
+        Converts the record back to the dict shape used by the API.
+
+        Returns:
+            dict: Record data.
+        """
+        data = {}
+        for key in self.CORE_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        data.update(self.extra)
+        return data
+
+    def key(self):
+        """
+        Returns a tuple identifying the record content, ignoring its ID.
+
+        Useful for diffing two snapshots of a zone where records may have been re-created.
+
+        Returns:
+            tuple: (zone, host, type, record, ttl)
+        """
+        return self.zone, self.host, self.type, self.record, self.ttl
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+        return self.zone == other.zone and self.id == other.id and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash((self.zone, self.id))
+
+    def __repr__(self):
+        return f"Record(id={self.id!r}, zone={self.zone!r}, host={self.host!r}, type={self.type!r}, " \
+               f"record={self.record!r}, ttl={self.ttl!r})"
@@ -0,0 +1,373 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+_DONE = object()
+_POLL_INTERVAL = 0.1
+
+
+class _Failure:
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class _Stopped(Exception):
+    pass
+
+
+class Pipeline:
+    """
+    Lazily evaluated chain of stages connected by bounded queues.
+
+    Stages run in their own threads once iteration starts. Each stage reads from a bounded queue and blocks
+    when the queue after it is full, so the slowest stage (typically the rate-limited API calls) sets the
+    pace of the whole pipeline and at most a few `buffer`s of items are in memory at a time. A stage with
+    `workers` > 1 runs its function on that many threads.
+
+    An exception raised by a stage function stops the pipeline and is re-raised to the consumer, unless the
+    stage has an `on_error` handler, which is called as `on_error(item, exception)` and drops the item.
+    Closing the iterator early (e.g., `break`) stops every stage.
+
+    Pipelines can be consumed with `for` or, from asyncio code, with `async for`.
+
+    Args:
+        source (iterable): Items fed into the first stage (e.g., `DNSZoneAPI.iter_zones()`).
+        buffer (int, optional): Default size of the queues between stages. Defaults to 64.
+
+    Example:
+        pipeline = (Pipeline(api.zone.iter_zones())
+                    .flat_map(zone_records(api.zone.records), workers=4)
+                    .map(lower_ttl, on_error=log_error)
+                    .filter(None)
+                    .map(modify_records(api.zone.records), workers=8))
+        for zone, record, response in pipeline:
+            ...
+    """
+
+    def __init__(self, source, buffer=64):
+        self.source = source
+        self.buffer = buffer
+        self._stages = []
+
+    def _add(self, kind, function, workers, buffer, ordered, on_error):
+        if workers < 1:
+            raise ValueError("A stage needs at least one worker.")
+        pipeline = Pipeline(self.source, self.buffer)
+        pipeline._stages = self._stages + [(kind, function, workers, buffer or self.buffer, ordered, on_error)]
+        return pipeline
+
+    def map(self, function, workers=1, buffer=None, ordered=True, on_error=None):
+        """
+        Adds a stage replacing every item with `function(item)`.
+
+        Args:
+            function (callable): Function applied to each item.
+            workers (int, optional): Number of threads running the function. Defaults to 1.
+            buffer (int, optional): Size of the queue after the stage. Defaults to the pipeline's buffer.
+            ordered (bool, optional): Keep the order of the items when `workers` > 1. Defaults to True.
+            on_error (callable, optional): Called as `on_error(item, exception)` when the function raises;
+                the item is then dropped instead of stopping the pipeline.
+
+        Returns:
+            Pipeline: A new pipeline ending with the stage.
+        """
+        return self._add('map', function, workers, buffer, ordered, on_error)
+
+    def flat_map(self, function, workers=1, buffer=None, ordered=True, on_error=None):
+        """
+        Adds a stage replacing every item with the items of the iterable `function(item)`.
+
+        With a single worker the iterable is consumed lazily, one item at a time. With more workers each
+        iterable is collected in its worker before its items are passed on.
+
+        Args:
+            function (callable): Function returning an iterable for each item.
+            workers (int, optional): Number of threads running the function. Defaults to 1.
+            buffer (int, optional): Size of the queue after the stage. Defaults to the pipeline's buffer.
+            ordered (bool, optional): Keep the order of the items when `workers` > 1. Defaults to True.
+            on_error (callable, optional): Called as `on_error(item, exception)` when the function raises.
+
+        Returns:
+            Pipeline: A new pipeline ending with the stage.
+        """
+        return self._add('flat_map', function, workers, buffer, ordered, on_error)
+
+    def filter(self, predicate, buffer=None):
+        """
+        Adds a stage keeping only the items for which `predicate(item)` is true.
+
+        Args:
+            predicate (callable or None): Predicate; None keeps truthy items.
+            buffer (int, optional): Size of the queue after the stage. Defaults to the pipeline's buffer.
+
+        Returns:
+            Pipeline: A new pipeline ending with the stage.
+        """
+        return self._add('filter', predicate or bool, 1, buffer, True, None)
+
+    def batch(self, size, buffer=None):
+        """
+        Adds a stage grouping items into lists of up to `size` items.
+
+        Args:
+            size (int): Maximum number of items per list.
+            buffer (int, optional): Size of the queue after the stage. Defaults to the pipeline's buffer.
+
+        Returns:
+            Pipeline: A new pipeline ending with the stage.
+        """
+        return self._add('batch', size, 1, buffer, True, None)
+
+    def __iter__(self):
+        stop = threading.Event()
+        threads = []
+        upstream = queue.Queue(maxsize=self.buffer)
+        threads.append(threading.Thread(target=self._feed, args=(iter(self.source), upstream, stop), daemon=True))
+        for stage in self._stages:
+            downstream = queue.Queue(maxsize=stage[3])
+            threads.append(threading.Thread(target=self._run_stage, args=(stage, upstream, downstream, stop),
+                                            daemon=True))
+            upstream = downstream
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = _get(upstream, stop)
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    async def __aiter__(self):
+        loop = asyncio.get_event_loop()
+        iterator = iter(self)
+        try:
+            while True:
+                item = await loop.run_in_executor(None, next, iterator, _DONE)
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            await loop.run_in_executor(None, iterator.close)
+
+    def run(self):
+        """
+        Runs the pipeline to completion, discarding the items of the last stage.
+
+        Returns:
+            int: Number of items that came out of the last stage.
+        """
+        count = 0
+        for _ in self:
+            count += 1
+        return count
+
+    @staticmethod
+    def _feed(iterator, downstream, stop):
+        try:
+            for item in iterator:
+                _put(downstream, item, stop)
+            _put(downstream, _DONE, stop)
+        except _Stopped:
+            pass
+        except Exception as e:
+            _put_final(downstream, _Failure(e), stop)
+
+    @staticmethod
+    def _run_stage(stage, upstream, downstream, stop):
+        kind, function, workers, _, ordered, on_error = stage
+        try:
+            if kind == 'batch':
+                _run_batch(function, upstream, downstream, stop)
+            elif workers == 1:
+                _run_serial(kind, function, on_error, upstream, downstream, stop)
+            else:
+                _run_parallel(kind, function, workers, ordered, on_error, upstream, downstream, stop)
+        except _Stopped:
+            pass
+        except Exception as e:
+            _put_final(downstream, _Failure(e), stop)
+
+
+def _get(source, stop):
+    while True:
+        try:
+            return source.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            if stop.is_set():
+                raise _Stopped()
+
+
+def _put(destination, item, stop):
+    while True:
+        if stop.is_set():
+            raise _Stopped()
+        try:
+            destination.put(item, timeout=_POLL_INTERVAL)
+            return
+        except queue.Full:
+            pass
+
+
+def _put_final(destination, item, stop):
+    try:
+        _put(destination, item, stop)
+    except _Stopped:
+        pass
+
+
+def _items(source, stop):
+    while True:
+        item = _get(source, stop)
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+def _apply(kind, function, item):
+    if kind == 'flat_map':
+        return list(function(item))
+    if kind == 'filter':
+        return [item] if function(item) else []
+    return [function(item)]
+
+
+def _run_serial(kind, function, on_error, upstream, downstream, stop):
+    for item in _items(upstream, stop):
+        try:
+            if kind == 'flat_map':
+                for result in function(item):
+                    _put(downstream, result, stop)
+                continue
+            results = _apply(kind, function, item)
+        except _Stopped:
+            raise
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(item, e)
+            continue
+        for result in results:
+            _put(downstream, result, stop)
+    _put(downstream, _DONE, stop)
+
+
+def _run_parallel(kind, function, workers, ordered, on_error, upstream, downstream, stop):
+    def emit(item, future):
+        try:
+            results = future.result()
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(item, e)
+            return
+        for result in results:
+            _put(downstream, result, stop)
+
+    pending = deque() if ordered else {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for item in _items(upstream, stop):
+                future = executor.submit(_apply, kind, function, item)
+                if ordered:
+                    pending.append((item, future))
+                    if len(pending) >= workers * 2:
+                        emit(*pending.popleft())
+                else:
+                    pending[future] = item
+                    if len(pending) >= workers * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            emit(pending.pop(future), future)
+            while pending:
+                if ordered:
+                    emit(*pending.popleft())
+                else:
+                    future = next(iter(wait(pending, return_when=FIRST_COMPLETED)[0]))
+                    emit(pending.pop(future), future)
+        finally:
+            for future in ([future for _, future in pending] if ordered else list(pending)):
+                future.cancel()
+    _put(downstream, _DONE, stop)
+
+
+def _run_batch(size, upstream, downstream, stop):
+    batch = []
+    for item in _items(upstream, stop):
+        batch.append(item)
+        if len(batch) >= size:
+            _put(downstream, batch, stop)
+            batch = []
+    if batch:
+        _put(downstream, batch, stop)
+    _put(downstream, _DONE, stop)
+
+
+def zone_records(records_api, record_type=None, host_like=None, rows_per_page=100):
+    """
+    Returns a `flat_map` function listing the records of a zone page by page.
+
+    Args:
+        records_api (RecordsAPI): Records API used to list records.
+        record_type (str, optional): Only records of this type.
+        host_like (str, optional): Only records whose host contains this string.
+        rows_per_page (int, optional): Records per `list_records` call. Defaults to 100.
+
+    Returns:
+        callable: Function of a domain name or zone dict, yielding (domain name, record dict) pairs.
+    """
+    def records(zone):
+        name = zone['name'] if isinstance(zone, dict) else zone
+        for page in records_api.iter_record_pages(name, host_like=host_like, record_type=record_type,
+                                                  rows_per_page=rows_per_page):
+            for record in page.values():
+                yield name, record
+    return records
+
+
+MODIFY_IGNORED_FIELDS = ('id', 'type', 'status', 'failover', 'dynamicurl_status')
+MODIFY_INTEGER_FIELDS = ('ttl', 'priority', 'weight', 'port', 'frame', 'redirect_type', 'fptype', 'caa_flag',
+                         'tlsa_usage', 'tlsa_selector', 'tlsa_matching_type')
+
+
+def _modify_fields(record):
+    fields = {key: value for key, value in record.items() if key not in MODIFY_IGNORED_FIELDS}
+    for key in MODIFY_INTEGER_FIELDS:
+        value = fields.get(key)
+        if value is None or value == '':
+            fields.pop(key, None)
+        elif isinstance(value, str) and value.lstrip('-').isdigit():
+            fields[key] = int(value)
+    return fields
+
+
+def modify_records(records_api):
+    """
+    Returns a `map` function saving (domain name, record dict) pairs with `RecordsAPI.modify_record`.
+
+    The record dict is in `list_records` form; 'id' selects the record and the other fields (except
+    read-only ones such as 'type' and 'status') are passed to `modify_record`, numeric fields such as 'ttl',
+    'priority' or 'caa_flag' converted from the strings `list_records` returns. A transform can drop the
+    records it does not change by returning None, followed by a `filter(None)` stage.
+
+    Args:
+        records_api (RecordsAPI): Records API used to modify records.
+
+    Returns:
+        callable: Function of a (domain name, record dict) pair returning (domain name, record dict, response).
+    """
+    def modify(item):
+        zone, record = item
+        return zone, record, records_api.modify_record(zone, record['id'], **_modify_fields(record))
+    return modify
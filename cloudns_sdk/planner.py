@@ -0,0 +1,194 @@
+import copy
+import math
+import re
+import threading
+from collections import Counter, namedtuple
+
+READ_ACTIONS = re.compile(r'^(get-|list-|is-|check-|available-|statistics-|records$|records-export$|soa-details$|'
+                          r'update-status$|failover-(settings|action-history|check-history)|mail-forwards$|'
+                          r'master-servers$|axfr-list$|export-secondary-zone$|freessl-get$|domain-info$|'
+                          r'pricing-list$|login$)')
+AUTH_PARAMS = ('auth-id', 'sub-auth-id', 'sub-auth-user', 'auth-password')
+DRY_RUN_RESPONSE = {'status': 'Success', 'statusDescription': 'Dry run: request not sent.'}
+
+PlannedCall = namedtuple('PlannedCall', ['endpoint', 'method', 'params', 'write'])
+PlanEstimate = namedtuple('PlanEstimate', ['calls', 'writes', 'reads', 'rate', 'concurrency', 'seconds'])
+
+
+def is_write_endpoint(endpoint):
+    """
+    Tells whether an API endpoint changes account data.
+
+    Args:
+        endpoint (str): API endpoint (e.g., 'dns/add-record.json').
+
+    Returns:
+        bool: False for endpoints that only read data, True otherwise.
+    """
+    action = endpoint.rsplit('/', 1)[-1]
+    if action.endswith('.json'):
+        action = action[:-5]
+    return not READ_ACTIONS.match(action)
+
+
+def _request_params(params):
+    pairs = params.items() if isinstance(params, dict) else params or ()
+    values = {}
+    for key, value in pairs:
+        if key not in AUTH_PARAMS:
+            values.setdefault(key, []).append(value)
+    return {key: value[0] if len(value) == 1 and not key.endswith('[]') else value for key, value in values.items()}
+
+
+class LatencyTracker:
+    """
+    Thread-safe record of observed request latencies, per endpoint.
+
+    Keeps an exponentially weighted moving average per endpoint and over all endpoints.
+
+    Args:
+        smoothing (float, optional): Weight of the newest observation. Defaults to 0.2.
+    """
+
+    def __init__(self, smoothing=0.2):
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._averages = {}
+        self._counts = Counter()
+
+    def record(self, endpoint, seconds):
+        """
+        Records the latency of a request.
+
+        Args:
+            endpoint (str): API endpoint of the request.
+            seconds (float): Time the request took.
+        """
+        with self._lock:
+            for key in (endpoint, None):
+                previous = self._averages.get(key)
+                self._averages[key] = seconds if previous is None else \
+                    previous + self.smoothing * (seconds - previous)
+                self._counts[key] += 1
+
+    def mean(self, endpoint=None, default=None):
+        """
+        Returns the average latency of an endpoint, falling back to the average over all endpoints.
+
+        Args:
+            endpoint (str, optional): API endpoint. Defaults to all endpoints.
+            default (float, optional): Returned when nothing was observed.
+
+        Returns:
+            float: Average latency in seconds.
+        """
+        with self._lock:
+            value = self._averages.get(endpoint)
+            return value if value is not None else self._averages.get(None, default)
+
+    def stats(self):
+        """
+        Returns the average latency and the number of observations of every endpoint.
+
+        Returns:
+            dict: Mapping of endpoints to {'mean', 'count'}; the None key covers all endpoints.
+        """
+        with self._lock:
+            return {key: {'mean': value, 'count': self._counts[key]} for key, value in self._averages.items()}
+
+
+class Plan:
+    """
+    Dry run of SDK calls: records the endpoint calls an operation would make without sending any write.
+
+    Run the operation against `plan.client`, a view of the client whose write requests are recorded and
+    answered with a synthetic success response instead of being sent. Read requests are sent (so that
+    operations which list records or zones before changing them plan exactly what they would do) and
+    recorded too; with `allow_reads=False` they are not sent either and are answered with an empty list.
+    Code relying on the content of write responses (e.g., the ID of an added record) cannot be planned.
+    Calls are recorded with their parameters, without credentials; repeated parameters (e.g., 'ns[]') are
+    recorded as lists.
+    A record cache of the client is copied, so planned writes it suppresses are left out of the plan without
+    the planned changes leaking into the real cache.
+
+    Args:
+        client (ClouDNSAPI): Client to plan against.
+        allow_reads (bool, optional): Send read requests. Defaults to True.
+
+    Example:
+        plan = api.dry_run()
+        BulkJob(plan.client, journal, 'ttl-change').run()
+        print(plan.summary(), plan.estimate(concurrency=8).seconds)
+    """
+
+    def __init__(self, client, allow_reads=True):
+        self.allow_reads = allow_reads
+        self.calls = []
+        self._lock = threading.Lock()
+        self._source = client
+        self.client = copy.copy(client)
+        self.client.make_request = self._make_request
+        if client.record_cache is not None:
+            self.client.record_cache = client.record_cache.copy()
+        self.client._init_apis()
+
+    def _make_request(self, endpoint, method='GET', params=None, data=None, lane=None):
+        write = is_write_endpoint(endpoint)
+        request_params = _request_params(params or data)
+        with self._lock:
+            self.calls.append(PlannedCall(endpoint, method, request_params, write))
+        if write:
+            return dict(DRY_RUN_RESPONSE)
+        if self.allow_reads:
+            return self._source.make_request(endpoint, method, params, data, lane)
+        return []
+
+    def __iter__(self):
+        return iter(self.calls)
+
+    def __len__(self):
+        return len(self.calls)
+
+    @property
+    def writes(self):
+        """
+        list: The planned write calls, in order.
+        """
+        return [call for call in self.calls if call.write]
+
+    def summary(self):
+        """
+        Counts the planned calls per endpoint.
+
+        Returns:
+            dict: Mapping of endpoints to numbers of calls, most frequent first.
+        """
+        return dict(Counter(call.endpoint for call in self.calls).most_common())
+
+    def estimate(self, rate=None, concurrency=1, latencies=None, default_latency=0.3, include_reads=True):
+        """
+        Estimates the wall time of running the planned calls.
+
+        The estimate is the larger of the time the rate limit needs to admit every call (plus the latency of
+        the last one) and the time `concurrency` workers need to run them back to back, using the observed
+        average latency of each endpoint.
+
+        Args:
+            rate (float, optional): Calls per second. Defaults to the current rate of the client's limiter.
+            concurrency (int, optional): Number of calls run in parallel. Defaults to 1.
+            latencies (LatencyTracker, optional): Observed latencies. Defaults to the client's.
+            default_latency (float, optional): Latency in seconds assumed for endpoints never observed.
+                Defaults to 0.3.
+            include_reads (bool, optional): Count read calls, which the real run makes again. Defaults to True.
+
+        Returns:
+            PlanEstimate: Numbers of calls, rate and concurrency used, and estimated seconds.
+        """
+        calls = self.calls if include_reads else self.writes
+        rate = rate or self._source.scheduler.limiter.rate
+        latencies = latencies or self._source.latencies
+        busy = sum(latencies.mean(call.endpoint, default_latency) for call in calls)
+        last_latency = latencies.mean(calls[-1].endpoint, default_latency) if calls else 0.0
+        seconds = max(len(calls) / rate + last_latency, busy / concurrency)
+        writes = sum(1 for call in calls if call.write)
+        return PlanEstimate(len(calls), writes, len(calls) - writes, rate, concurrency, math.ceil(seconds * 10) / 10)
@@ -0,0 +1,220 @@
+import os
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+from .bind import iter_bind_lines, parse_bind
+from .exceptions import ClouDNSAPIException
+from .snapshots import SnapshotDiff, normalize_records, read_blob, snapshot_content
+
+ProcessedZone = namedtuple('ProcessedZone', ['zone', 'result', 'error'])
+NormalizedZone = namedtuple('NormalizedZone', ['digest', 'lines'])
+
+
+def normalize_export(zone, content, context=None):
+    """
+    Processor normalizing a zone export (see `snapshots.normalize_records`).
+
+    Args:
+        zone (str): Domain name of the zone.
+        content (str): BIND content of the zone.
+        context: Ignored.
+
+    Returns:
+        NormalizedZone: SHA-256 digest of the normalized content and its lines.
+    """
+    lines = normalize_records(parse_bind(content, zone))
+    return NormalizedZone(snapshot_content(lines)[1], lines)
+
+
+class SnapshotDiffer:
+    """
+    Processor diffing a zone export against a snapshot of a `SnapshotStore`.
+
+    Only the store's blob files are read, so the processor can run in worker processes while the parent
+    keeps the store's index open. The context of each zone is the digest of the snapshot to diff against
+    (None for a zone without snapshot), as returned by `SnapshotDiffer.context`.
+
+    Args:
+        root (str): Directory of the SnapshotStore.
+
+    Example:
+        differ = SnapshotDiffer(store.root)
+        for item in pipeline.run(zones, differ, context=differ.context(store)):
+            ...
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def context(store):
+        """
+        Returns a context callable giving the digest of a zone's latest snapshot in `store`.
+
+        Args:
+            store (SnapshotStore): Store the exports are diffed against.
+
+        Returns:
+            callable: Function of a domain name returning a digest or None.
+        """
+        def latest_digest(zone):
+            snapshot = store.latest(zone)
+            return snapshot.digest if snapshot else None
+        return latest_digest
+
+    def __call__(self, zone, content, digest):
+        lines = normalize_records(parse_bind(content, zone))
+        if digest is not None and snapshot_content(lines)[1] == digest:
+            return SnapshotDiff([], [])
+        before = set(read_blob(self.root, digest)) if digest else set()
+        after = set(lines)
+        return SnapshotDiff(list(parse_bind(sorted(after - before), zone)),
+                            list(parse_bind(sorted(before - after), zone)))
+
+
+def _process_shared(processor, zone, name, size, context):
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        content = bytes(memory.buf[:size]).decode('utf-8')
+    finally:
+        memory.close()
+    return processor(zone, content, context)
+
+
+def _process_bytes(processor, zone, data, context):
+    return processor(zone, data.decode('utf-8'), context)
+
+
+class ProcessPipeline:
+    """
+    Fetches zones with the client's threads and processes them in a pool of worker processes.
+
+    The I/O stage runs in the parent: zone contents are fetched concurrently through the client (and
+    therefore its connection pool and rate limit). Each content is copied once into a shared memory buffer
+    whose name is handed to a worker process, which parses and processes it without the content being
+    pickled. CPU-bound stages (parsing, normalizing, diffing) thus use every core instead of contending for
+    the parent's GIL. Results stream back in the order of the zones, with at most `max_in_flight` zones
+    fetched or processed at a time.
+
+    Processors are picklable callables (module-level functions or instances of module-level classes)
+    called as `processor(zone, content, context)` in a worker process, `content` being the zone in BIND
+    format. Their results must be picklable too.
+
+    Args:
+        zone_api (DNSZoneAPI): Zone API used to fetch the zones.
+        processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        io_workers (int, optional): Number of concurrent fetches. Defaults to 8.
+        source (str, optional): 'export' fetches zones with `TransferAPI.export_records_in_bind`, 'records'
+            with `RecordsAPI.iter_record_pages` (converted to BIND in the parent). Defaults to 'export'.
+        max_in_flight (int, optional): Maximum number of zones being fetched or processed. Defaults to
+            (io_workers + processes) * 2.
+
+    Example:
+        with ProcessPipeline(api.zone, processes=32) as pipeline:
+            for item in pipeline.run(api.zone.iter_zones(), normalize_export):
+                print(item.zone, item.error or item.result.digest)
+    """
+
+    SOURCES = ('export', 'records')
+
+    def __init__(self, zone_api, processes=None, io_workers=8, source='export', max_in_flight=None):
+        if source not in self.SOURCES:
+            raise ValueError(f"Invalid source: {source}. Expected one of {', '.join(self.SOURCES)}.")
+        self.zone_api = zone_api
+        self.processes = processes or os.cpu_count() or 1
+        self.io_workers = io_workers
+        self.source = source
+        self.max_in_flight = max_in_flight or (io_workers + self.processes) * 2
+        self._fetch_slots = threading.BoundedSemaphore(io_workers)
+        self._process_pool = None
+
+    def __enter__(self):
+        self._pool()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _pool(self):
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._process_pool
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def fetch(self, zone):
+        """
+        Fetches the content of a zone in the parent process.
+
+        Args:
+            zone (str): Domain name of the zone.
+
+        Returns:
+            str: The zone in BIND format.
+
+        Raises:
+            ClouDNSAPIException: If the API reports a failure.
+        """
+        if self.source == 'records':
+            records = (record for page in self.zone_api.records.iter_record_pages(zone) for record in page.values())
+            return ''.join(iter_bind_lines(records, zone))
+        response = self.zone_api.transfer.export_records_in_bind(zone)
+        if not isinstance(response, dict) or response.get('status') == 'Failed':
+            raise ClouDNSAPIException(response if isinstance(response, dict) else {})
+        return response['zone']
+
+    def _fetch_and_process(self, zone, processor, context):
+        with self._fetch_slots:
+            data = self.fetch(zone).encode('utf-8')
+        context = context(zone) if context is not None else None
+        if shared_memory is None:
+            return self._pool().submit(_process_bytes, processor, zone, data, context).result()
+        memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        try:
+            memory.buf[:len(data)] = data
+            return self._pool().submit(_process_shared, processor, zone, memory.name, len(data), context).result()
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def run(self, zones, processor=normalize_export, context=None):
+        """
+        Fetches and processes zones, yielding results in the order of `zones`.
+
+        Args:
+            zones (iterable): Domain names, or zone dicts as returned by `list_zones`.
+            processor (callable, optional): Picklable processor. Defaults to `normalize_export`.
+            context (callable, optional): Called in the parent with each domain name; its (picklable) result
+                is passed to the processor.
+
+        Yields:
+            ProcessedZone: Domain name and either the processor's result or the error that stopped the zone.
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.io_workers + self.processes) as executor:
+            for zone in zones:
+                name = zone['name'] if isinstance(zone, dict) else zone
+                pending.append((name, executor.submit(self._fetch_and_process, name, processor, context)))
+                if len(pending) >= self.max_in_flight:
+                    yield self._outcome(*pending.popleft())
+            while pending:
+                yield self._outcome(*pending.popleft())
+
+    @staticmethod
+    def _outcome(zone, future):
+        try:
+            return ProcessedZone(zone, future.result(), None)
+        except Exception as e:
+            return ProcessedZone(zone, None, e)
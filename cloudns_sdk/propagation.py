@@ -0,0 +1,234 @@
+import asyncio
+import heapq
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .exceptions import ClouDNSAPIException
+
+_STOP_CHECK_INTERVAL = 0.2
+
+
+class PropagationWatch:
+    """
+    A single run of `PropagationWatcher` over a set of zones.
+
+    Iterating over the watch (with `for` or `async for`) polls the zones and yields each zone as soon as it
+    has converged, until all zones converged, failed, the timeout expired, or `stop` was called. Afterwards
+    the `converged`, `pending` and `failed` attributes describe the outcome.
+
+    Attributes:
+        converged (list): Zones that converged, in order of convergence.
+        pending (set): Zones that had not converged when the watch ended.
+        failed (dict): Zones that could not be polled, mapped to the last exception raised.
+    """
+
+    def __init__(self, watcher, zones, timeout=None):
+        self.watcher = watcher
+        self.timeout = timeout
+        self.converged = []
+        self.pending = set(zones)
+        self.failed = {}
+        self._started = False
+        self._stop = threading.Event()
+
+    def stop(self):
+        """
+        Ends the watch: polling stops within a fraction of a second and iteration ends.
+        """
+        self._stop.set()
+
+    @property
+    def done(self):
+        """
+        bool: True if every zone converged.
+        """
+        return self._started and not self.pending and not self.failed
+
+    def __iter__(self):
+        if self._started:
+            raise RuntimeError("A PropagationWatch can only be iterated once.")
+        self._started = True
+        watcher = self.watcher
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        schedule = [(0.0, zone) for zone in sorted(self.pending)]
+        intervals = {zone: watcher.initial_interval for zone in self.pending}
+        errors = {}
+        executor = ThreadPoolExecutor(max_workers=watcher.max_workers)
+        in_flight = {}
+
+        try:
+            while schedule or in_flight:
+                now = time.monotonic()
+                if self._stop.is_set() or (deadline is not None and now >= deadline):
+                    return
+                while schedule and schedule[0][0] <= now and len(in_flight) < watcher.max_workers:
+                    _, zone = heapq.heappop(schedule)
+                    in_flight[executor.submit(watcher.is_converged, zone)] = zone
+
+                wait_for = None
+                if schedule:
+                    wait_for = max(0.0, schedule[0][0] - now)
+                if deadline is not None:
+                    wait_for = deadline - now if wait_for is None else min(wait_for, deadline - now)
+                wait_for = _STOP_CHECK_INTERVAL if wait_for is None else min(wait_for, _STOP_CHECK_INTERVAL)
+                if not in_flight:
+                    self._stop.wait(wait_for)
+                    continue
+
+                done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    zone = in_flight.pop(future)
+                    try:
+                        converged = future.result()
+                    except Exception as e:
+                        errors[zone] = errors.get(zone, 0) + 1
+                        if errors[zone] >= watcher.max_errors:
+                            self.pending.discard(zone)
+                            self.failed[zone] = e
+                            continue
+                        converged = False
+                    if converged:
+                        self.pending.discard(zone)
+                        self.converged.append(zone)
+                        yield zone
+                    else:
+                        heapq.heappush(schedule, (time.monotonic() + intervals[zone], zone))
+                        intervals[zone] = min(intervals[zone] * watcher.backoff, watcher.max_interval)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    async def __aiter__(self):
+        loop = asyncio.get_event_loop()
+        queue = asyncio.Queue()
+        finished = object()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                self.stop()
+
+        def run():
+            try:
+                for zone in self:
+                    put(zone)
+                put(finished)
+            except Exception as e:
+                put(e)
+
+        loop.run_in_executor(None, run)
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self.stop()
+
+
+class PropagationWatcher:
+    """
+    Waits for DNS zone changes to propagate to all ClouDNS name servers.
+
+    Zones are polled concurrently with `DNSZoneAPI.is_updated` (or `DNSZoneAPI.get_update_status`). Each zone
+    that has not converged yet is polled again after an interval that grows by `backoff` up to `max_interval`,
+    so slow zones cost progressively fewer calls. All polls go through the client's `make_request` and share
+    its rate limit.
+
+    Args:
+        zone_api (DNSZoneAPI): Zone API used for polling.
+        max_workers (int, optional): Maximum number of concurrent polls. Defaults to 8.
+        initial_interval (float, optional): Seconds between the first polls of a zone. Defaults to 1.
+        max_interval (float, optional): Maximum seconds between polls of a zone. Defaults to 30.
+        backoff (float, optional): Factor applied to the interval after each unconverged poll. Defaults to 1.5.
+        max_errors (int, optional): Number of failed polls after which a zone is given up. Defaults to 3.
+        use_update_status (bool, optional): Poll `get_update_status` and require every name server to report
+            the zone as updated, instead of polling `is_updated`. Defaults to False.
+
+    Example:
+        watcher = PropagationWatcher(api.zone)
+        for zone in watcher.watch(touched_zones, timeout=600):
+            print(f"{zone} is live")
+    """
+
+    def __init__(self, zone_api, max_workers=8, initial_interval=1.0, max_interval=30.0, backoff=1.5,
+                 max_errors=3, use_update_status=False):
+        self.zone_api = zone_api
+        self.max_workers = max_workers
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_errors = max_errors
+        self.use_update_status = use_update_status
+
+    def is_converged(self, zone):
+        """
+        Polls a single zone once.
+
+        Args:
+            zone (str): Domain name or reverse zone name.
+
+        Returns:
+            bool: True if the zone is updated on all name servers.
+
+        Raises:
+            ClouDNSAPIException: If the API reports a failure.
+        """
+        if self.use_update_status:
+            response = self.zone_api.get_update_status(zone)
+            if isinstance(response, dict):
+                raise ClouDNSAPIException(response)
+            return bool(response) and all(server.get('updated') in (True, 1, '1', 'true') for server in response)
+
+        response = self.zone_api.is_updated(zone)
+        if isinstance(response, dict):
+            raise ClouDNSAPIException(response)
+        return response is True or response in (1, '1', 'true')
+
+    def watch(self, zones, timeout=None):
+        """
+        Creates a watch over the given zones.
+
+        Polling starts when the watch is iterated.
+
+        Args:
+            zones (iterable): Domain names to watch.
+            timeout (float, optional): Overall timeout in seconds. Defaults to no timeout.
+
+        Returns:
+            PropagationWatch: Iterable (sync and async) yielding zones as they converge.
+        """
+        return PropagationWatch(self, zones, timeout)
+
+    def wait(self, zones, timeout=None):
+        """
+        Watches the given zones in a background thread.
+
+        Args:
+            zones (iterable): Domain names to watch.
+            timeout (float, optional): Overall timeout in seconds. Defaults to no timeout.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the finished PropagationWatch.
+        """
+        future = Future()
+        watch = self.watch(zones, timeout)
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                for _ in watch:
+                    pass
+                future.set_result(watch)
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
@@ -1,5 +1,429 @@
+import mmap
+import os
+import re
+import socket
+import struct
+import tempfile
 import time
 import threading
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .exceptions import RateLimitQueueFull
+
+THROTTLE_PATTERN = re.compile(r'too many (requests|queries)|rate limit|try again later|temporarily blocked', re.I)
+
+
+def is_throttled(response):
+    """
+    Tells whether an API response means the request was throttled.
+
+    Throttling is reported either with HTTP 429, or with a 'Failed' status whose description matches
+    `THROTTLE_PATTERN`.
+
+    Args:
+        response (requests.Response): Response of the API.
+
+    Returns:
+        bool: True if the request was throttled.
+    """
+    if response.status_code == 429:
+        return True
+    if response.status_code != 200:
+        return False
+    try:
+        payload = response.json()
+    except ValueError:
+        return False
+    return (isinstance(payload, dict) and payload.get('status') == 'Failed'
+            and bool(THROTTLE_PATTERN.search(str(payload.get('statusDescription') or ''))))
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter allowing at most `max_per_second` calls to start per second.
+
+    Callers reserve the next free call slot under a lock and sleep outside of it, so concurrent callers
+    never hold the lock while they wait or while their call runs.
+
+    Args:
+        max_per_second (float): Maximum number of calls allowed per second.
+    """
+
+    def __init__(self, max_per_second):
+        self.max_per_second = max_per_second
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._pid = os.getpid()
+
+    @property
+    def rate(self):
+        """
+        float: Current maximum number of calls per second.
+        """
+        return self.max_per_second
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            self._after_fork()
+
+    def _after_fork(self):
+        pass
+
+    def _reserve(self, interval):
+        with self._lock:
+            now = time.perf_counter()
+            scheduled = max(now, self._next_slot)
+            self._next_slot = scheduled + interval
+        return scheduled - now
+
+    def acquire(self):
+        """
+        Blocks until the caller may start a call.
+        """
+        self._check_fork()
+        left_to_wait = self._reserve(1.0 / self.rate)
+        if left_to_wait > 0:
+            time.sleep(left_to_wait)
+
+    def record_success(self):
+        """
+        Reports a call that was not throttled. Ignored by fixed-rate limiters.
+        """
+
+    def record_throttle(self):
+        """
+        Reports a call that was throttled by the API. Ignored by fixed-rate limiters.
+        """
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Rate limiter that finds the highest rate the API sustains, using additive increase, multiplicative decrease.
+
+    Every throttled call multiplies the rate by `decrease`; throttled responses of calls that were already in
+    flight within `cooldown` seconds of a decrease do not decrease it again. Every successful call adds
+    `increase / rate` calls per second, so the rate grows by about `increase` per second of unthrottled
+    traffic, up to `max_per_second`.
+
+    Args:
+        max_per_second (float): Highest rate probed, in calls per second.
+        min_per_second (float, optional): Lowest rate. Defaults to 1.
+        initial_per_second (float, optional): Starting rate. Defaults to `max_per_second`.
+        increase (float, optional): Additive increase, in calls per second per second. Defaults to 1.
+        decrease (float, optional): Multiplicative decrease factor. Defaults to 0.5.
+        cooldown (float, optional): Seconds after a decrease during which no further decrease happens.
+            Defaults to 1.
+
+    Example:
+        limiter = AdaptiveRateLimiter(50, initial_per_second=20)
+        api = ClouDNSAPI(auth_id, auth_password, rate_limiter=limiter)
+        limiter.stats()['rate']
+    """
+
+    def __init__(self, max_per_second, min_per_second=1.0, initial_per_second=None, increase=1.0, decrease=0.5,
+                 cooldown=1.0):
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1.")
+        super().__init__(max_per_second)
+        self.min_per_second = min_per_second
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._rate = min(max(initial_per_second or max_per_second, min_per_second), max_per_second)
+        self._last_decrease = None
+        self.successes = 0
+        self.throttles = 0
+        self.decreases = 0
+
+    @property
+    def rate(self):
+        """
+        float: Current number of calls allowed per second.
+        """
+        return self._rate
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._rate = min(self.max_per_second, self._rate + self.increase / self._rate)
+
+    def record_throttle(self):
+        with self._lock:
+            self.throttles += 1
+            now = time.perf_counter()
+            if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.decreases += 1
+            self._rate = max(self.min_per_second, self._rate * self.decrease)
+            self._next_slot = max(self._next_slot, now + 1.0 / self._rate)
+
+    def stats(self):
+        """
+        Returns the current rate and the counters of the limiter.
+
+        Returns:
+            dict: 'rate', 'min_per_second', 'max_per_second', 'successes', 'throttles' and 'decreases'.
+        """
+        with self._lock:
+            return {'rate': self._rate, 'min_per_second': self.min_per_second,
+                    'max_per_second': self.max_per_second, 'successes': self.successes,
+                    'throttles': self.throttles, 'decreases': self.decreases}
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    Rate limiter sharing its state with every process on the host that uses the same file.
+
+    The next free call slot is kept as a timestamp in a small memory-mapped file, read and advanced under an
+    exclusive `fcntl.flock` lock (plus a thread lock within the process). Timestamps are wall-clock time,
+    which is shared by all processes of a host and survives reboots. The time of the last write is stored
+    next to the slot: when the clock is found to be earlier than that write (it was set back), the slot is
+    moved back by the same amount, keeping the backlog that was queued but not the jump. A backlog of any
+    depth is otherwise honoured. Gunicorn or Celery workers that use the same file therefore start at most
+    `max_per_second` calls per second in total.
+
+    The limiter is fork-safe: a forked child notices the new process ID and reopens the file, so it never
+    shares a lock handle with its parent.
+
+    Args:
+        max_per_second (float): Maximum number of calls allowed per second across all processes.
+        path (str, optional): Path of the state file. Defaults to 'cloudns_sdk.ratelimit' in the temp directory.
+
+    Raises:
+        OSError: If file locking is not available on this platform.
+
+    Example:
+        api = ClouDNSAPI(auth_id, auth_password, rate_limiter=FileRateLimiter(20, '/run/cloudns.ratelimit'))
+    """
+
+    STATE = struct.Struct('dd')
+
+    def __init__(self, max_per_second, path=None):
+        if fcntl is None:
+            raise OSError("FileRateLimiter requires fcntl file locking, which is not available on this platform.")
+        super().__init__(max_per_second)
+        self.path = path or os.path.join(tempfile.gettempdir(), 'cloudns_sdk.ratelimit')
+        self._open()
+
+    def _open(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < mmap.PAGESIZE:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(fd).st_size < mmap.PAGESIZE:
+                        os.ftruncate(fd, mmap.PAGESIZE)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            self._map = mmap.mmap(fd, mmap.PAGESIZE)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def _after_fork(self):
+        self.close()
+        self._open()
+
+    def close(self):
+        """
+        Closes the state file.
+        """
+        self._map.close()
+        os.close(self._fd)
+
+    def _reserve(self, interval):
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                stored, written = self.STATE.unpack_from(self._map, 0)
+                if now < written:
+                    stored -= written - now
+                scheduled = max(now, stored)
+                self.STATE.pack_into(self._map, 0, scheduled + interval, now)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return scheduled - now
+
+
+class _RedisReplyError(Exception):
+    pass
+
+
+class _RedisConnection:
+    """
+    Minimal client for the Redis serialization protocol (RESP), enough for scripted rate limiting.
+    """
+
+    def __init__(self, url, timeout):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+
+    def close(self):
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+        self._sock = self._file = None
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._file = self._sock.makefile('rb')
+        if self.password:
+            self._command('AUTH', self.password)
+        if self.db:
+            self._command('SELECT', self.db)
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError("Connection to the rate limit store was closed.")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b'+':
+            return payload.decode()
+        if prefix == b'-':
+            raise _RedisReplyError(payload.decode())
+        if prefix == b':':
+            return int(payload)
+        if prefix == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if prefix == b'*':
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from the rate limit store: {line!r}")
+
+    def _command(self, *args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            arg = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        self._sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def execute(self, *args):
+        if self._sock is None:
+            self._connect()
+        try:
+            return self._command(*args)
+        except (OSError, ConnectionError):
+            self.close()
+            raise
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Rate limiter sharing its state across hosts through a Redis-compatible store.
+
+    Call slots are reserved by a Lua script executed atomically by the store (GCRA, a token bucket expressed
+    as a "theoretical arrival time"). The script refills the bucket using the store's own clock, so clock
+    skew between nodes does not matter. All nodes that use the same store and key together start at most
+    `max_per_second` calls per second, with bursts of up to `burst` calls.
+
+    When the store cannot be reached, calls are limited by a local `fallback` limiter instead. Reconnection
+    is retried every `retry_interval` seconds.
+
+    Args:
+        max_per_second (float): Maximum number of calls allowed per second across all nodes.
+        url (str, optional): Store URL, e.g. 'redis://:password@redis.internal:6379/0'.
+            Defaults to 'redis://localhost:6379/0'.
+        key (str, optional): Key holding the limiter state. Defaults to 'cloudns_sdk:ratelimit'.
+        burst (int, optional): Number of calls that may start back to back. Defaults to 1.
+        timeout (float, optional): Socket timeout in seconds. Defaults to 0.5.
+        fallback (RateLimiter, optional): Limiter used while the store is unreachable. Defaults to a local
+            limiter allowing `max_per_second`; pass a per-node share to stay conservative.
+        retry_interval (float, optional): Seconds between reconnection attempts. Defaults to 5.
+
+    Example:
+        limiter = RedisRateLimiter(20, 'redis://redis.internal:6379/0', fallback=RateLimiter(2))
+        api = ClouDNSAPI(auth_id, auth_password, rate_limiter=limiter)
+    """
+
+    SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local wait = tat - tolerance - now
+if wait < 0 then wait = 0 end
+tat = tat + interval
+redis.call('SET', KEYS[1], tat, 'PX', math.ceil((tat - now) / 1000) + 1000)
+return wait
+"""
+
+    def __init__(self, max_per_second, url='redis://localhost:6379/0', key='cloudns_sdk:ratelimit', burst=1,
+                 timeout=0.5, fallback=None, retry_interval=5.0):
+        super().__init__(max_per_second)
+        self.url = url
+        self.key = key
+        self.burst = burst
+        self.timeout = timeout
+        self.fallback = fallback or RateLimiter(max_per_second)
+        self.retry_interval = retry_interval
+        self._connection = _RedisConnection(url, timeout)
+        self._script_sha = None
+        self._unavailable_until = 0.0
+
+    @property
+    def available(self):
+        """
+        bool: False while the limiter is using its local fallback.
+        """
+        return time.monotonic() >= self._unavailable_until
+
+    def _after_fork(self):
+        self._connection = _RedisConnection(self.url, self.timeout)
+
+    def _eval(self, interval, tolerance):
+        if self._script_sha is None:
+            self._script_sha = self._connection.execute('SCRIPT', 'LOAD', self.SCRIPT).decode()
+        try:
+            return self._connection.execute('EVALSHA', self._script_sha, 1, self.key, interval, tolerance)
+        except _RedisReplyError as e:
+            if not str(e).startswith('NOSCRIPT'):
+                raise
+            return self._connection.execute('EVAL', self.SCRIPT, 1, self.key, interval, tolerance)
+
+    def acquire(self):
+        """
+        Blocks until the caller may start a call.
+        """
+        self._check_fork()
+        if self.available:
+            interval = int(1000000 / self.max_per_second)
+            try:
+                with self._lock:
+                    wait = self._eval(interval, (self.burst - 1) * interval)
+            except (OSError, ConnectionError, _RedisReplyError, ValueError):
+                self._unavailable_until = time.monotonic() + self.retry_interval
+            else:
+                if wait > 0:
+                    time.sleep(wait / 1000000)
+                return
+        self.fallback.acquire()
+
 
 def rate_limited(max_per_second):
     """
@@ -13,7 +437,9 @@ def rate_limited(max_per_second):
 
     Usage:
         Apply this decorator to functions that need to be rate-limited to a specified maximum calls per second.
-        It uses threading.Lock to synchronize access and time.sleep to enforce rate limiting.
+        It uses a RateLimiter, which hands out call slots under a threading.Lock and waits for them with
+        time.sleep. The lock is not held while the decorated function runs, so concurrent callers overlap
+        their calls while still starting no more than max_per_second calls per second.
 
     Example:
         @rate_limited(10)  # Limits to 10 calls per second
@@ -21,18 +447,176 @@ def rate_limited(max_per_second):
             # Function code here
             pass
     """
-    min_interval = 1.0 / max_per_second
-    lock = threading.Lock()
-    last_time_called = [0.0]
+    limiter = RateLimiter(max_per_second)
 
     def decorator(func):
         def rate_limited_function(*args, **kwargs):
-            with lock:
-                elapsed = time.perf_counter() - last_time_called[0]
-                left_to_wait = min_interval - elapsed
-                if left_to_wait > 0:
-                    time.sleep(left_to_wait)
-                last_time_called[0] = time.perf_counter()
-                return func(*args, **kwargs)
+            limiter.acquire()
+            return func(*args, **kwargs)
         return rate_limited_function
-    return decorator
\ No newline at end of file
+    return decorator
+
+
+class Lane:
+    """
+    A priority lane of a `PriorityScheduler`.
+
+    Args:
+        name (str): Name of the lane (e.g., 'interactive').
+        weight (float, optional): Share of the call budget the lane gets while other lanes are busy. A lane with
+            weight 4 is granted four calls for every call of a lane with weight 1. Defaults to 1.
+        max_queue (int, optional): Maximum number of callers waiting in the lane. Further callers get
+            RateLimitQueueFull instead of queueing. Defaults to no limit.
+    """
+
+    def __init__(self, name, weight=1, max_queue=None):
+        if weight <= 0:
+            raise ValueError("Lane weight must be positive.")
+        self.name = name
+        self.weight = weight
+        self.max_queue = max_queue
+
+    def __repr__(self):
+        return f"Lane(name={self.name!r}, weight={self.weight!r}, max_queue={self.max_queue!r})"
+
+
+DEFAULT_LANES = (Lane('interactive', weight=4), Lane('bulk', weight=1))
+
+
+class PriorityScheduler:
+    """
+    Hands out the call budget of a rate limiter to weighted priority lanes.
+
+    Each call slot obtained from the underlying limiter is granted to a waiting caller of one of the lanes,
+    chosen by stride scheduling: lanes with waiting callers share the budget in proportion to their weights,
+    and a lane with no waiting callers leaves its share to the others. Within a lane, callers are served
+    first in, first out.
+
+    The lane of a call is, in order of precedence: the lane passed to `acquire`, the lane set for the current
+    thread with the `lane` context manager, or `default_lane`.
+
+    Args:
+        limiter (RateLimiter): Limiter providing the call slots.
+        lanes (iterable, optional): Lane instances. Defaults to 'interactive' (weight 4) and 'bulk' (weight 1).
+        default_lane (str, optional): Lane used when none is selected. Defaults to the first lane.
+
+    Example:
+        with scheduler.lane('bulk'):
+            ...  # calls made by this thread use the bulk lane
+    """
+
+    def __init__(self, limiter, lanes=None, default_lane=None):
+        lanes = list(lanes or DEFAULT_LANES)
+        self.limiter = limiter
+        self.lanes = {lane.name: lane for lane in lanes}
+        self.default_lane = default_lane or lanes[0].name
+        self._cond = threading.Condition()
+        self._queues = {name: deque() for name in self.lanes}
+        self._pass = {name: 0.0 for name in self.lanes}
+        self._virtual_time = 0.0
+        self._dispatching = False
+        self._granted = {name: 0 for name in self.lanes}
+        self._rejected = {name: 0 for name in self.lanes}
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._cond = threading.Condition()
+            self._queues = {name: deque() for name in self.lanes}
+            self._dispatching = False
+
+    def current_lane(self):
+        """
+        Returns the lane set for the current thread with `lane`, if any.
+
+        Returns:
+            str or None: Name of the lane.
+        """
+        return getattr(self._local, 'lane', None)
+
+    @contextmanager
+    def lane(self, name):
+        """
+        Context manager selecting the lane of all calls made by the current thread.
+
+        Args:
+            name (str): Name of the lane.
+        """
+        if name not in self.lanes:
+            raise ValueError(f"Unknown lane: {name}. Expected one of {', '.join(self.lanes)}.")
+        previous = self.current_lane()
+        self._local.lane = name
+        try:
+            yield
+        finally:
+            self._local.lane = previous
+
+    def _grant(self):
+        candidates = [name for name, queue in self._queues.items() if queue]
+        if not candidates:
+            return
+        name = min(candidates, key=lambda candidate: self._pass[candidate])
+        ticket = self._queues[name].popleft()
+        ticket[0] = True
+        self._virtual_time = self._pass[name]
+        self._pass[name] += 1.0 / self.lanes[name].weight
+        self._granted[name] += 1
+
+    def acquire(self, lane=None):
+        """
+        Blocks until the caller is granted a call slot in its lane.
+
+        Args:
+            lane (str, optional): Name of the lane. Defaults to the thread's lane or `default_lane`.
+
+        Raises:
+            ValueError: If the lane does not exist.
+            RateLimitQueueFull: If the lane already has `max_queue` waiting callers.
+        """
+        name = lane or self.current_lane() or self.default_lane
+        if name not in self.lanes:
+            raise ValueError(f"Unknown lane: {name}. Expected one of {', '.join(self.lanes)}.")
+        self._check_fork()
+        ticket = [False]
+        with self._cond:
+            queue = self._queues[name]
+            max_queue = self.lanes[name].max_queue
+            if max_queue is not None and len(queue) >= max_queue:
+                self._rejected[name] += 1
+                raise RateLimitQueueFull(name, max_queue)
+            if not queue:
+                self._pass[name] = max(self._pass[name], self._virtual_time)
+            queue.append(ticket)
+
+            while not ticket[0]:
+                if self._dispatching:
+                    self._cond.wait()
+                    continue
+                self._dispatching = True
+                self._cond.release()
+                try:
+                    self.limiter.acquire()
+                except BaseException:
+                    self._cond.acquire()
+                    self._dispatching = False
+                    if not ticket[0]:
+                        queue.remove(ticket)
+                    self._cond.notify_all()
+                    raise
+                self._cond.acquire()
+                self._dispatching = False
+                self._grant()
+                self._cond.notify_all()
+
+    def stats(self):
+        """
+        Returns per-lane counters.
+
+        Returns:
+            dict: Mapping of lane names to {'waiting', 'granted', 'rejected'} counts.
+        """
+        with self._cond:
+            return {name: {'waiting': len(self._queues[name]), 'granted': self._granted[name],
+                           'rejected': self._rejected[name]} for name in self.lanes}
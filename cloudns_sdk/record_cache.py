@@ -0,0 +1,159 @@
+import threading
+
+SUPPRESSED_RESPONSE = {'status': 'Success', 'statusDescription': 'Record not modified: it already has these values.'}
+NAME_FIELDS = ('host', 'record')
+
+
+def _same(field, cached, value):
+    if field in NAME_FIELDS:
+        return str(cached).lower().rstrip('.') == str(value).lower().rstrip('.')
+    return str(cached) == str(value)
+
+
+class RecordCache:
+    """
+    Per-zone cache of records, used to skip `RecordsAPI.modify_record` calls that would change nothing.
+
+    A zone is loaded with `list_records` the first time a record of it is modified, and is then kept
+    current by the SDK's own writes (modify_record, add_record, delete_record, change_record_status).
+    Changes made any other way (the control panel, zone imports, other processes) are not seen: call
+    `invalidate` after them, or use the cache only for the duration of a push.
+
+    A modify call is suppressed when the cached record has every field of the call with an equal value;
+    a field the cache does not know about is never assumed equal.
+
+    Example:
+        api = ClouDNSAPI(auth_id, auth_password, record_cache=RecordCache())
+        api.zone.records.modify_record('example.com', 123, host='www', record='1.2.3.4', ttl=300)
+        api.record_cache.suppressed
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._zones = {}
+        self._loading = {}
+        self.suppressed = 0
+        self.sent = 0
+
+    def _load(self, zone, records_api):
+        with self._lock:
+            if zone in self._zones:
+                return
+            loading = self._loading.get(zone)
+            if loading is None:
+                loading = self._loading[zone] = threading.Lock()
+        with loading:
+            with self._lock:
+                if zone in self._zones:
+                    return
+            records = {}
+            for page in records_api.iter_record_pages(zone):
+                for record in page.values():
+                    records[str(record['id'])] = dict(record)
+            with self._lock:
+                self._zones[zone] = records
+                self._loading.pop(zone, None)
+
+    def get(self, zone, record_id):
+        """
+        Returns a cached record.
+
+        Args:
+            zone (str): Domain name of the zone.
+            record_id (int or str): ID of the record.
+
+        Returns:
+            dict or None: Copy of the record in `list_records` form, or None if unknown.
+        """
+        with self._lock:
+            record = self._zones.get(zone, {}).get(str(record_id))
+            return dict(record) if record is not None else None
+
+    def is_noop(self, zone, record_id, fields, records_api):
+        """
+        Tells whether modifying a record with `fields` would leave it unchanged, loading the zone if needed.
+
+        Args:
+            zone (str): Domain name of the zone.
+            record_id (int or str): ID of the record.
+            fields (dict): Fields of the modify call (e.g., {'host': 'www', 'record': '1.2.3.4', 'ttl': 300}).
+            records_api (RecordsAPI): Records API used to load the zone.
+
+        Returns:
+            bool: True if the call can be skipped. Counted in `suppressed` or `sent`.
+        """
+        self._load(zone, records_api)
+        record = self.get(zone, record_id)
+        noop = record is not None and all(
+            any(key in record and _same(field, record[key], value) for key in (field, field.replace('_', '-')))
+            for field, value in fields.items())
+        with self._lock:
+            if noop:
+                self.suppressed += 1
+            else:
+                self.sent += 1
+        return noop
+
+    def update(self, zone, record_id, fields):
+        """
+        Applies the fields of a successful write to a cached record.
+
+        Args:
+            zone (str): Domain name of the zone.
+            record_id (int or str): ID of the record.
+            fields (dict): Written fields.
+        """
+        with self._lock:
+            records = self._zones.get(zone)
+            if records is None:
+                return
+            record = records.setdefault(str(record_id), {'id': str(record_id)})
+            record.update((field, str(value)) for field, value in fields.items())
+
+    def remove(self, zone, record_id):
+        """
+        Removes a record from the cache.
+
+        Args:
+            zone (str): Domain name of the zone.
+            record_id (int or str): ID of the record.
+        """
+        with self._lock:
+            self._zones.get(zone, {}).pop(str(record_id), None)
+
+    def invalidate(self, zone=None):
+        """
+        Drops the cached records of a zone, or of every zone. They are reloaded when next needed.
+
+        Args:
+            zone (str, optional): Domain name of the zone. Defaults to all zones.
+        """
+        with self._lock:
+            if zone is None:
+                self._zones.clear()
+            else:
+                self._zones.pop(zone, None)
+
+    def copy(self):
+        """
+        Returns an independent cache holding the same records, with its counters reset.
+
+        Returns:
+            RecordCache: The copy.
+        """
+        cache = RecordCache()
+        with self._lock:
+            cache._zones = {zone: {record_id: dict(record) for record_id, record in records.items()}
+                            for zone, records in self._zones.items()}
+        return cache
+
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: 'zones' and 'records' cached, modify calls 'suppressed' and 'sent'.
+        """
+        with self._lock:
+            return {'zones': len(self._zones), 'records': sum(len(records) for records in self._zones.values()),
+                    'suppressed': self.suppressed, 'sent': self.sent}
@@ -1,5 +1,13 @@
 from .validations import validate
 from .utils import process_params
+from .exceptions import ClouDNSAPIException
+from .record_cache import SUPPRESSED_RESPONSE
+
+CACHE_IGNORED_FIELDS = ('self', 'domain_name', 'record_id')
+
+
+def _succeeded(response):
+    return isinstance(response, dict) and response.get('status') == 'Success'
 
 
 class RecordsAPI:
@@ -8,6 +16,8 @@ class RecordsAPI:
 
     Attributes:
         VALID_ZONE_TYPES (list): List of valid zone types supported by the API.
+        record_cache (RecordCache): Optional cache used to skip `modify_record` calls that would change nothing,
+            set from `ClouDNSAPI(record_cache=...)`. None (the default) disables write suppression.
 
     Args:
         auth_params (callable): Function that returns authentication parameters for API requests.
@@ -17,6 +27,7 @@ class RecordsAPI:
     """
 
     VALID_ZONE_TYPES = ['domain', 'reverse', 'parked', 'master', 'slave', 'geodns']
+    record_cache = None
 
     def __init__(self, auth_params, make_request, auth_id, auth_password):
         self._auth_params = auth_params
@@ -78,6 +89,40 @@ class RecordsAPI:
         })
         return self.make_request('dns/records.json', method='GET', params=params)
 
+    def iter_record_pages(self, domain_name, host=None, host_like=None, record_type=None, rows_per_page=100,
+                          order_by=None):
+        """
+        Iterates over all pages of DNS records for a given domain.
+
+        Pages are requested lazily, one `list_records` call at a time, until a short or empty page is returned.
+
+        Args:
+            domain_name (str): Domain name or reverse zone name.
+            host (str, optional): Hostname of the records to list.
+            host_like (str, optional): Partial match for hostname.
+            record_type (str, optional): Type of the records to list.
+            rows_per_page (int, optional): Number of records per page. Can be 10, 20, 30, 50, or 100 (default 100).
+            order_by (str, optional): Field to order records by.
+
+        Yields:
+            dict: Response from the API for each page, keyed by record ID.
+
+        Raises:
+            ClouDNSAPIException: If the API reports a failure for the listing.
+        """
+        page = 1
+        while True:
+            response = self.list_records(domain_name, host=host, host_like=host_like, record_type=record_type,
+                                         rows_per_page=rows_per_page, page=page, order_by=order_by)
+            if not response:
+                return
+            if isinstance(response, dict) and response.get('status') == 'Failed':
+                raise ClouDNSAPIException(response)
+            yield response
+            if len(response) < rows_per_page:
+                return
+            page += 1
+
     def get_records_pages_count(self, domain_name, host=None, record_type=None, rows_per_page=20):
         """
         Retrieves the number of pages available for DNS records.
@@ -185,7 +230,16 @@ class RecordsAPI:
         if valid:
             cred = self._auth_params()
             params = process_params(record_data, cred)
-            return self.make_request('dns/add-record.json', method='POST', data=params)
+            response = self.make_request('dns/add-record.json', method='POST', data=params)
+            if self.record_cache is not None and _succeeded(response):
+                record_id = (response.get('data') or {}).get('id')
+                if record_id is None:
+                    self.record_cache.invalidate(domain_name)
+                else:
+                    fields = {key: value for key, value in record_data.items() if key not in CACHE_IGNORED_FIELDS}
+                    fields['type'] = fields.pop('record_type')
+                    self.record_cache.update(domain_name, record_id, fields)
+            return response
         else:
             raise ValueError(f"Error: {error}")
 
@@ -204,7 +258,10 @@ class RecordsAPI:
             'domain-name': domain_name,
             'record-id': record_id
         })
-        return self.make_request('dns/delete-record.json', method='POST', data=params)
+        response = self.make_request('dns/delete-record.json', method='POST', data=params)
+        if self.record_cache is not None and _succeeded(response):
+            self.record_cache.remove(domain_name, record_id)
+        return response
 
     def modify_record(self, domain_name, record_id, host='', record=None, ttl=3600, **kwargs):
         """
@@ -278,6 +335,9 @@ class RecordsAPI:
         cpu (str, optional): CPU of the server.
         os (str, optional): Operating system of the server.
 
+        When a record cache is enabled (`ClouDNSAPI(record_cache=...)`) and the cached record already has
+        all the given values, no request is sent and a success response is returned.
+
         Returns:
             dict: Response from the API confirming the record modification.
 
@@ -290,9 +350,15 @@ class RecordsAPI:
         valid, error = validate(record_data)
 
         if valid:
+            fields = {key: value for key, value in record_data.items() if key not in CACHE_IGNORED_FIELDS}
+            if self.record_cache is not None and self.record_cache.is_noop(domain_name, record_id, fields, self):
+                return dict(SUPPRESSED_RESPONSE)
             cred = self._auth_params()
             params = process_params(record_data, cred)
-            return self.make_request('dns/mod-record.json', method='POST', data=params)
+            response = self.make_request('dns/mod-record.json', method='POST', data=params)
+            if self.record_cache is not None and _succeeded(response):
+                self.record_cache.update(domain_name, record_id, fields)
+            return response
         else:
             raise ValueError(f"Error: {error}")
 
@@ -314,7 +380,10 @@ class RecordsAPI:
             'delete-current-records': 1 if delete_current_records else 0
         })
 
-        return self.make_request('dns/copy-records.json', method='POST', data=params)
+        response = self.make_request('dns/copy-records.json', method='POST', data=params)
+        if self.record_cache is not None:
+            self.record_cache.invalidate(domain_name)
+        return response
 
     def get_available_record_types(self, zone_type):
         """
@@ -483,6 +552,37 @@ class RecordsAPI:
         })
         return self.make_request('dns/get-dynamic-url-history.json', method='GET', params=params)
 
+    def iter_dynamic_url_history(self, domain_name, record_id, rows_per_page=20):
+        """
+        Iterates over the dynamic URL history of a record, newest pages first.
+
+        Pages are requested lazily, one `get_dynamic_url_history` call at a time, until a short or empty page
+        is returned.
+
+        Args:
+            domain_name (str): Domain name containing the record.
+            record_id (int): ID of the record.
+            rows_per_page (int, optional): Number of entries per page (default 20).
+
+        Yields:
+            dict: History entries (e.g., with 'ip' and 'date').
+
+        Raises:
+            ClouDNSAPIException: If the API reports a failure.
+        """
+        page = 1
+        while True:
+            response = self.get_dynamic_url_history(domain_name, record_id, rows_per_page=rows_per_page, page=page)
+            if not response:
+                return
+            if isinstance(response, dict) and response.get('status') == 'Failed':
+                raise ClouDNSAPIException(response)
+            entries = list(response.values()) if isinstance(response, dict) else list(response)
+            yield from entries
+            if len(entries) < rows_per_page:
+                return
+            page += 1
+
     def get_dynamic_url_history_pages(self, domain_name, record_id, rows_per_page=20):
         """
         Retrieves the number of pages available for dynamic URL history of a record.
@@ -519,7 +619,10 @@ class RecordsAPI:
             'record-id': record_id,
             'status': 1 if status else 0
         })
-        return self.make_request('dns/change-record-status.json', method='GET', params=params)
+        response = self.make_request('dns/change-record-status.json', method='GET', params=params)
+        if self.record_cache is not None and _succeeded(response):
+            self.record_cache.update(domain_name, record_id, {'status': 1 if status else 0})
+        return response
 
     def reset_soa_details(self, domain_name):
         """
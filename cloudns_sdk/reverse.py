@@ -0,0 +1,183 @@
+import ipaddress
+
+MAX_ZONE_PREFIX = {4: 24, 6: 124}
+LABEL_BITS = {4: 8, 6: 4}
+
+
+def reverse_zone_name(network):
+    """
+    Returns the name of the reverse zone of a network whose prefix is on a label boundary.
+
+    Args:
+        network (str or IPv4Network or IPv6Network): Network, e.g. '10.1.0.0/16' or '2001:db8::/32'.
+
+    Returns:
+        str: The zone name, e.g. '1.10.in-addr.arpa' or '8.b.d.0.1.0.0.2.ip6.arpa' (nibble format).
+
+    Raises:
+        ValueError: If the prefix length is not a multiple of 8 (IPv4) or 4 (IPv6).
+    """
+    network = ipaddress.ip_network(network)
+    bits = LABEL_BITS[network.version]
+    if network.prefixlen % bits:
+        raise ValueError(f"{network} does not start on a reverse zone boundary (a multiple of {bits} bits).")
+    labels = network.network_address.reverse_pointer.split('.')
+    return '.'.join(labels[len(labels) - 2 - network.prefixlen // bits:])
+
+
+def reverse_zones(network):
+    """
+    Lists the reverse zones covering a network.
+
+    Networks smaller than a zone (longer than /24 for IPv4, /124 for IPv6) are covered by their enclosing
+    zone; others are split into zones at the next label boundary (e.g., a /20 into sixteen /24 zones).
+
+    Args:
+        network (str or IPv4Network or IPv6Network): Network to cover.
+
+    Yields:
+        tuple: (zone name, subnet of `network` in that zone).
+    """
+    network = ipaddress.ip_network(network, strict=False)
+    bits = LABEL_BITS[network.version]
+    if network.prefixlen > MAX_ZONE_PREFIX[network.version]:
+        yield reverse_zone_name(network.supernet(new_prefix=MAX_ZONE_PREFIX[network.version])), network
+        return
+    zone_prefix = -(-network.prefixlen // bits) * bits
+    for subnet in network.subnets(new_prefix=zone_prefix):
+        yield reverse_zone_name(subnet), subnet
+
+
+def ptr_hostname(template, ip):
+    """
+    Builds the PTR target of an address from a template.
+
+    Args:
+        template (str or callable): Format string using the fields {ip}, {dashed} (the address with '-' instead
+            of '.' or ':'), {reverse} (its reverse pointer) and, for IPv4, {a}, {b}, {c}, {d} (its octets).
+            A callable is called with the address instead.
+        ip (IPv4Address or IPv6Address): The address.
+
+    Returns:
+        str: The hostname.
+    """
+    if callable(template):
+        return template(ip)
+    text = str(ip) if ip.version == 4 else ip.exploded
+    fields = {'ip': str(ip), 'dashed': text.replace('.', '-').replace(':', '-'), 'reverse': ip.reverse_pointer}
+    if ip.version == 4:
+        fields.update(zip('abcd', text.split('.')))
+    return template.format(**fields)
+
+
+def _excluded(network, hosts_only):
+    if not hosts_only or network.num_addresses <= 2:
+        return ()
+    if network.version == 4:
+        return (network.network_address, network.broadcast_address)
+    return (network.network_address,)
+
+
+def _ptr_records(subnet, template, zone_name, ttl, excluded):
+    suffix = f".{zone_name.rstrip('.').lower()}"
+    address = ipaddress.IPv4Address if subnet.version == 4 else ipaddress.IPv6Address
+    for value in range(int(subnet.network_address), int(subnet.broadcast_address) + 1):
+        ip = address(value)
+        if ip in excluded:
+            continue
+        pointer = ip.reverse_pointer
+        if not pointer.endswith(suffix):
+            raise ValueError(f"{ip} is not in the reverse zone {zone_name}.")
+        yield {'host': pointer[:-len(suffix)], 'type': 'PTR', 'record': ptr_hostname(template, ip), 'ttl': ttl}
+
+
+def iter_ptr_records(network, template, zone=None, ttl=3600, hosts_only=False):
+    """
+    Lazily yields the PTR records of every address of a network.
+
+    Addresses are generated one at a time, so networks of any size (a /16, an IPv6 /64) can be fed to
+    `ChunkedImporter.import_zone`, which builds and submits one chunk at a time, or to `BulkExecutor`,
+    without building lists.
+
+    Args:
+        network (str or IPv4Network or IPv6Network): Network whose addresses get PTR records.
+        template (str or callable): PTR target template, see `ptr_hostname`.
+        zone (str, optional): Reverse zone the hosts are relative to. Defaults to the zone covering each
+            address (see `reverse_zones`).
+        ttl (int, optional): TTL of the records. Defaults to 3600.
+        hosts_only (bool, optional): Leave out the network address of `network` (and its broadcast address
+            for IPv4). Defaults to False.
+
+    Yields:
+        dict: Record data with 'host', 'type' ('PTR'), 'record' and 'ttl', as used by `add_record` and
+        `iter_bind_chunks`.
+
+    Raises:
+        ValueError: If an address is not inside `zone`.
+    """
+    network = ipaddress.ip_network(network, strict=False)
+    excluded = _excluded(network, hosts_only)
+    for zone_name, subnet in ([(zone, network)] if zone else reverse_zones(network)):
+        yield from _ptr_records(subnet, template, zone_name, ttl, excluded)
+
+
+def _zone_records(zone_name, subnets, template, ttl):
+    for subnet, excluded in subnets:
+        yield from _ptr_records(subnet, template, zone_name, ttl, excluded)
+
+
+def iter_reverse_zone_records(networks, template, ttl=3600, hosts_only=False):
+    """
+    Lazily yields the PTR records of several networks, grouped by reverse zone.
+
+    The networks are split into reverse zones up front, so each zone is yielded once even when it covers
+    several of the networks; the records themselves are generated as the generator of a zone is consumed.
+
+    Args:
+        networks (iterable): Networks (strings or ipaddress networks).
+        template (str or callable): PTR target template, see `ptr_hostname`.
+        ttl (int, optional): TTL of the records. Defaults to 3600.
+        hosts_only (bool, optional): Leave out network and broadcast addresses. Defaults to False.
+
+    Yields:
+        tuple: (zone name, generator of record dicts).
+
+    Example:
+        importer = ChunkedImporter(api.zone.transfer, checkpoint_path='ptr-import.json')
+        for zone, records in iter_reverse_zone_records(['10.1.0.0/16'], '{dashed}.example.com'):
+            importer.import_zone(zone, records)
+    """
+    zones = {}
+    for network in networks:
+        network = ipaddress.ip_network(network, strict=False)
+        excluded = _excluded(network, hosts_only)
+        for zone_name, subnet in reverse_zones(network):
+            zones.setdefault(zone_name, []).append((subnet, excluded))
+    for zone_name, subnets in zones.items():
+        yield zone_name, _zone_records(zone_name, subnets, template, ttl)
+
+
+def submit_ptr_records(bulk, networks, template, ttl=3600, hosts_only=False):
+    """
+    Submits `add_record` calls for the PTR records of several networks to a bulk executor.
+
+    Records are generated as the executor accepts them (it blocks at its `max_pending` limit), so memory
+    stays bounded whatever the size of the networks, as long as the executor does not keep results.
+
+    Args:
+        bulk (BulkExecutor): Executor, e.g. from `ClouDNSAPI.bulk`.
+        networks (iterable): Networks (strings or ipaddress networks).
+        template (str or callable): PTR target template, see `ptr_hostname`.
+        ttl (int, optional): TTL of the records. Defaults to 3600.
+        hosts_only (bool, optional): Leave out network and broadcast addresses. Defaults to False.
+
+    Returns:
+        int: Number of submitted records.
+    """
+    count = 0
+    for zone_name, records in iter_reverse_zone_records(networks, template, ttl, hosts_only):
+        for record in records:
+            bulk.submit('zone.records.add_record', zone_name, 'PTR', record=record['record'], host=record['host'],
+                        ttl=record['ttl'])
+            count += 1
+    return count
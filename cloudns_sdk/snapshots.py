@@ -0,0 +1,297 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from .bind import format_bind_record, parse_bind
+
+Snapshot = namedtuple('Snapshot', ['zone', 'taken_at', 'digest', 'record_count'])
+SnapshotDiff = namedtuple('SnapshotDiff', ['added', 'removed'])
+
+
+def normalize_records(records, skip_types=('SOA',)):
+    """
+    Converts records to a canonical, sorted list of BIND lines.
+
+    Record IDs, ordering and the spelling of names are irrelevant to the result, so two exports of an
+    unchanged zone normalize to the same lines.
+
+    Args:
+        records (iterable): Record dicts as returned by `list_records` or `parse_bind`.
+        skip_types (iterable, optional): Record types left out. Defaults to ('SOA',), whose serial changes on
+            every update.
+
+    Returns:
+        list: Sorted, de-duplicated zone file lines (without $ORIGIN, hosts relative to the zone).
+    """
+    lines = set()
+    for record in records:
+        record_type = str(record.get('type', '')).upper()
+        if record_type in skip_types:
+            continue
+        record = {key: value for key, value in record.items() if key not in ('id', 'status', 'failover',
+                                                                            'dynamicurl_status')}
+        record['host'] = str(record.get('host') or '').lower()
+        record['ttl'] = int(record['ttl']) if record.get('ttl') not in (None, '') else None
+        lines.add(format_bind_record(record))
+    return sorted(lines)
+
+
+def snapshot_content(lines):
+    """
+    Encodes normalized lines into the content stored as a snapshot blob.
+
+    Args:
+        lines (list): Lines returned by `normalize_records`.
+
+    Returns:
+        tuple: (content, digest), the UTF-8 content and its SHA-256 hex digest.
+    """
+    content = ''.join(line + '\n' for line in lines).encode('utf-8')
+    return content, hashlib.sha256(content).hexdigest()
+
+
+def blob_path(root, digest):
+    """
+    Returns the path of a snapshot blob in a store directory.
+
+    Args:
+        root (str): Directory of the SnapshotStore.
+        digest (str): SHA-256 digest of the snapshot.
+
+    Returns:
+        str: Path of the gzip-compressed blob.
+    """
+    return os.path.join(root, 'blobs', digest[:2], f"{digest[2:]}.gz")
+
+
+def read_blob(root, digest):
+    """
+    Reads the normalized lines of a snapshot blob, without opening the store's index.
+
+    Args:
+        root (str): Directory of the SnapshotStore.
+        digest (str): SHA-256 digest of the snapshot.
+
+    Returns:
+        list: Normalized zone file lines.
+    """
+    with gzip.open(blob_path(root, digest), 'rt', encoding='utf-8') as file:
+        return file.read().splitlines()
+
+
+class SnapshotStore:
+    """
+    Local, content-addressed store of zone snapshots.
+
+    Each snapshot is normalized with `normalize_records` and stored as a gzip-compressed blob named after
+    the SHA-256 of its content, so a zone that did not change is stored only once no matter how often it is
+    snapshotted. A SQLite index maps (zone, timestamp) to blob digests, which makes finding changed zones a
+    pure index query and lets diffs between identical snapshots return without reading any blob.
+
+    Args:
+        root (str): Directory holding the index and the blobs. Created if needed.
+
+    Example:
+        store = SnapshotStore('snapshots')
+        store.add_export('example.com', api.zone.transfer.export_records_in_bind('example.com'))
+        store.diff_zone('example.com')
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, 'blobs'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS snapshots (zone TEXT NOT NULL, taken_at REAL NOT NULL, '
+                             'digest TEXT NOT NULL, record_count INTEGER NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS snapshots_zone ON snapshots (zone, taken_at)')
+
+    def close(self):
+        """
+        Closes the index database.
+        """
+        self._db.close()
+
+    def _blob_path(self, digest):
+        return blob_path(self.root, digest)
+
+    def add(self, zone, records, taken_at=None):
+        """
+        Stores a snapshot of a zone.
+
+        Args:
+            zone (str): Domain name of the zone.
+            records (iterable): Record dicts as returned by `list_records` or `parse_bind`.
+            taken_at (float, optional): UNIX time of the snapshot. Defaults to now.
+
+        Returns:
+            Snapshot: The stored snapshot.
+        """
+        lines = normalize_records(records)
+        content, digest = snapshot_content(lines)
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, 'wb') as file:
+                file.write(content)
+            os.replace(temp_path, path)
+
+        snapshot = Snapshot(zone, time.time() if taken_at is None else taken_at, digest, len(lines))
+        with self._lock, self._db:
+            self._db.execute('INSERT INTO snapshots VALUES (?, ?, ?, ?)', snapshot)
+        return snapshot
+
+    def add_export(self, zone, export, taken_at=None):
+        """
+        Stores a snapshot from a BIND export.
+
+        Args:
+            zone (str): Domain name of the zone.
+            export (dict or str): Response of `TransferAPI.export_records_in_bind`, or BIND content.
+            taken_at (float, optional): UNIX time of the snapshot. Defaults to now.
+
+        Returns:
+            Snapshot: The stored snapshot.
+        """
+        content = export['zone'] if isinstance(export, dict) else export
+        return self.add(zone, parse_bind(content, zone), taken_at)
+
+    def add_pages(self, zone, pages, taken_at=None):
+        """
+        Stores a snapshot from `list_records` pages.
+
+        Args:
+            zone (str): Domain name of the zone.
+            pages (iterable): `list_records` responses, e.g. from `RecordsAPI.iter_record_pages`.
+            taken_at (float, optional): UNIX time of the snapshot. Defaults to now.
+
+        Returns:
+            Snapshot: The stored snapshot.
+        """
+        records = (record for page in pages for record in (page.values() if isinstance(page, dict) else page))
+        return self.add(zone, records, taken_at)
+
+    def snapshots(self, zone):
+        """
+        Lists the snapshots of a zone, oldest first.
+
+        Args:
+            zone (str): Domain name of the zone.
+
+        Returns:
+            list: Snapshot tuples.
+        """
+        with self._lock:
+            rows = self._db.execute('SELECT zone, taken_at, digest, record_count FROM snapshots WHERE zone = ? '
+                                    'ORDER BY taken_at', (zone,)).fetchall()
+        return [Snapshot(*row) for row in rows]
+
+    def latest(self, zone, at=None):
+        """
+        Returns the latest snapshot of a zone taken at or before a point in time.
+
+        Args:
+            zone (str): Domain name of the zone.
+            at (float, optional): UNIX time. Defaults to now.
+
+        Returns:
+            Snapshot or None: The snapshot, or None if there is none.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT zone, taken_at, digest, record_count FROM snapshots WHERE zone = ? '
+                                   'AND taken_at <= ? ORDER BY taken_at DESC LIMIT 1',
+                                   (zone, time.time() if at is None else at)).fetchone()
+        return Snapshot(*row) if row else None
+
+    def zones(self):
+        """
+        Lists the zones that have at least one snapshot.
+
+        Returns:
+            list: Domain names, sorted.
+        """
+        with self._lock:
+            return [row[0] for row in self._db.execute('SELECT DISTINCT zone FROM snapshots ORDER BY zone')]
+
+    def load(self, digest):
+        """
+        Loads the normalized lines of a snapshot blob.
+
+        Args:
+            digest (str): SHA-256 digest of the snapshot.
+
+        Returns:
+            list: Normalized zone file lines.
+        """
+        return read_blob(self.root, digest)
+
+    def diff(self, before, after, zone=None):
+        """
+        Computes the record-level difference between two snapshots.
+
+        Args:
+            before (str or Snapshot): Digest or snapshot of the older state.
+            after (str or Snapshot): Digest or snapshot of the newer state.
+            zone (str, optional): Domain name used to resolve relative names in the returned records. Without
+                it, names are returned relative to the zone.
+
+        Returns:
+            SnapshotDiff: Lists of added and removed record dicts.
+        """
+        before = before.digest if isinstance(before, Snapshot) else before
+        after = after.digest if isinstance(after, Snapshot) else after
+        if before == after:
+            return SnapshotDiff([], [])
+        before_lines = set(self.load(before)) if before else set()
+        after_lines = set(self.load(after)) if after else set()
+        added = sorted(after_lines - before_lines)
+        removed = sorted(before_lines - after_lines)
+        origin = zone or ''
+        return SnapshotDiff(list(parse_bind(added, origin)), list(parse_bind(removed, origin)))
+
+    def diff_zone(self, zone, since=None, until=None):
+        """
+        Diffs the snapshots of a zone at two points in time.
+
+        Args:
+            zone (str): Domain name of the zone.
+            since (float, optional): UNIX time of the older state. Defaults to the snapshot before the latest one.
+            until (float, optional): UNIX time of the newer state. Defaults to now.
+
+        Returns:
+            SnapshotDiff: Lists of added and removed record dicts.
+        """
+        after = self.latest(zone, until)
+        if since is None:
+            history = [snapshot for snapshot in self.snapshots(zone) if after and snapshot.taken_at < after.taken_at]
+            before = history[-1] if history else None
+        else:
+            before = self.latest(zone, since)
+        return self.diff(before.digest if before else None, after.digest if after else None, zone)
+
+    def changed_zones(self, since, until=None):
+        """
+        Lists the zones whose content differs between two points in time.
+
+        Only the index is consulted; no blob is read.
+
+        Args:
+            since (float): UNIX time of the older state.
+            until (float, optional): UNIX time of the newer state. Defaults to now.
+
+        Returns:
+            list: Domain names whose latest snapshot digest differs between the two times.
+        """
+        until = time.time() if until is None else until
+        query = ('SELECT zone, digest FROM snapshots s WHERE taken_at = (SELECT MAX(taken_at) FROM snapshots '
+                 'WHERE zone = s.zone AND taken_at <= ?)')
+        with self._lock:
+            before = dict(self._db.execute(query, (since,)).fetchall())
+            after = dict(self._db.execute(query, (until,)).fetchall())
+        return sorted(zone for zone in set(before) | set(after) if before.get(zone) != after.get(zone))
@@ -10,6 +10,7 @@ from .groups import GroupsAPI
 from .dnssec import DNSSECAPI
 from .ssl import SSLAPI
 from .notes import NotesAPI
+from .exceptions import ClouDNSAPIException
 
 class DNSZoneAPI:
     """
@@ -51,6 +52,9 @@ class DNSZoneAPI:
         list_zones(page=1, rows_per_page=20, search=None, group_id=None, has_cloud_domains=None):
             Lists DNS zones with optional filters.
 
+        iter_zones(rows_per_page=100, search=None, group_id=None, has_cloud_domains=None):
+            Iterates over all DNS zones, page by page.
+
         get_pages_count(rows_per_page=10, search=None, group_id=None, has_cloud_domains=None):
             Retrieves the number of pages of DNS zones.
 
@@ -173,6 +177,39 @@ class DNSZoneAPI:
         })
         return self.make_request('dns/list-zones.json', method='GET', params=params)
 
+    def iter_zones(self, rows_per_page=100, search=None, group_id=None, has_cloud_domains=None):
+        """
+        Iterates over all DNS zones with optional filters.
+
+        Pages are requested lazily, one `list_zones` call at a time, until a short or empty page is returned.
+
+        Args:
+            rows_per_page (int, optional): Number of results per page. Can be 10, 20, 30, 50, or 100. Defaults to 100.
+            search (str, optional): Domain name, reverse zone name, or keyword to search for.
+            group_id (int, optional): ID of the group to filter zones by.
+            has_cloud_domains (int, optional): Flag to filter zones that have cloud domains.
+
+        Yields:
+            dict: Zone details as returned by `list_zones` (e.g., 'name', 'type', 'zone', 'status').
+
+        Raises:
+            ClouDNSAPIException: If the API reports a failure for the listing.
+        """
+        page = 1
+        while True:
+            response = self.list_zones(page=page, rows_per_page=rows_per_page, search=search, group_id=group_id,
+                                       has_cloud_domains=has_cloud_domains)
+            if not response:
+                return
+            if isinstance(response, dict):
+                if response.get('status') == 'Failed':
+                    raise ClouDNSAPIException(response)
+                response = list(response.values())
+            yield from response
+            if len(response) < rows_per_page:
+                return
+            page += 1
+
     def get_pages_count(self, rows_per_page=10, search=None, group_id=None, has_cloud_domains=None):
         """
         Retrieves the number of pages of DNS zones based on optional filters.
@@ -0,0 +1,67 @@
+import json
+import tarfile
+
+from cloudns_sdk.backup import AccountBackup, load_manifest
+
+
+class Records:
+    def __init__(self, zones):
+        self.zones = zones
+
+    def get_soa_details(self, domain_name):
+        return {'serialNumber': self.zones[domain_name]['serial']}
+
+
+class Transfer:
+    def __init__(self, zones):
+        self.zones = zones
+        self.exported = []
+
+    def export_records_in_bind(self, domain_name):
+        self.exported.append(domain_name)
+        if domain_name == 'broken.com':
+            return {'status': 'Failed', 'statusDescription': 'Export failed'}
+        return {'zone': self.zones[domain_name]['content']}
+
+
+class Zone:
+    def __init__(self):
+        self.zones = {
+            'a.com': {'serial': '1', 'content': 'www 3600 IN A 192.0.2.1\n'},
+            'b.com': {'serial': '1', 'content': 'www 3600 IN A 192.0.2.2\n'},
+            'broken.com': {'serial': '1', 'content': ''},
+        }
+        self.records = Records(self.zones)
+        self.transfer = Transfer(self.zones)
+
+    def iter_zones(self):
+        return [{'name': name, 'type': 'master'} for name in self.zones]
+
+
+def members(path):
+    with tarfile.open(path) as tar:
+        return {member.name: tar.extractfile(member).read() for member in tar}
+
+
+def test_full_then_incremental_backup(tmp_path):
+    zone = Zone()
+    first_path = str(tmp_path / 'first.tar.gz')
+    manifest = AccountBackup(zone, max_workers=2).run(first_path)
+    assert sorted(manifest['zones']) == ['a.com', 'b.com']
+    assert manifest['failed'] == {'broken.com': 'ClouDNSAPIException: Failed - Export failed'}
+    content = members(first_path)
+    assert content['zones/a.com.zone'] == b'www 3600 IN A 192.0.2.1\n'
+    assert json.loads(content['manifest.json'])['zones'] == manifest['zones']
+    assert load_manifest(first_path + '.manifest.json') == manifest
+
+    zone.zones['b.com']['serial'] = '2'
+    zone.zones['broken.com']['serial'] = '2'
+    zone.transfer.exported = []
+    second_path = str(tmp_path / 'second.tar')
+    second = AccountBackup(zone, compression=None).run(second_path, previous_manifest=first_path + '.manifest.json',
+                                                       zones=['a.com', 'b.com'])
+    assert zone.transfer.exported == ['b.com']
+    assert second['zones']['a.com']['unchanged'] and second['zones']['b.com']['unchanged']
+    assert second['zones']['b.com']['signature'] == '2'
+    assert second['zones']['a.com']['archive'] == 'first.tar.gz'
+    assert list(members(second_path)) == ['manifest.json']
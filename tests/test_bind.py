@@ -0,0 +1,97 @@
+import io
+
+import pytest
+
+from cloudns_sdk.bind import format_bind_record, parse_bind, parse_ttl, write_bind
+
+ZONE = """\
+$ORIGIN example.com.
+$TTL 1h
+@       IN  SOA ns1.example.com. admin.example.com. (
+            2024010101 ; serial
+            7200 3600 1209600 300 )
+        IN  NS  ns1
+        IN  MX  10 mail.example.com.
+www 300 IN  A   192.0.2.1
+        IN  AAAA 2001:db8::1  ; same owner
+txt     IN  TXT "v=spf1 include:example.net" " -all"
+_sip._tcp IN SRV 10 20 5060 sip
+caa     IN  CAA 0 issue "letsencrypt.org"
+"""
+
+
+def test_parse_ttl_units():
+    assert parse_ttl('3600') == 3600
+    assert parse_ttl('1h30m') == 5400
+    assert parse_ttl('1W') == 604800
+
+
+def test_parse_bind_records():
+    records = list(parse_bind(ZONE))
+    assert [(record['host'], record['type']) for record in records] == [
+        ('', 'SOA'), ('', 'NS'), ('', 'MX'), ('www', 'A'), ('www', 'AAAA'), ('txt', 'TXT'), ('_sip._tcp', 'SRV'),
+        ('caa', 'CAA')]
+    by_type = {record['type']: record for record in records}
+    assert by_type['NS'] == {'host': '', 'type': 'NS', 'ttl': 3600, 'record': 'ns1.example.com'}
+    assert by_type['MX']['priority'] == 10 and by_type['MX']['record'] == 'mail.example.com'
+    assert by_type['A']['ttl'] == 300 and by_type['AAAA']['ttl'] == 3600
+    assert by_type['TXT']['record'] == 'v=spf1 include:example.net -all'
+    assert by_type['SRV'] == {'host': '_sip._tcp', 'type': 'SRV', 'ttl': 3600, 'priority': 10, 'weight': 20,
+                              'port': 5060, 'record': 'sip.example.com'}
+    assert by_type['CAA']['caa_value'] == 'letsencrypt.org'
+
+
+def test_parse_bind_include(tmp_path):
+    (tmp_path / 'hosts.inc').write_text("db IN A 192.0.2.10\n")
+    main = tmp_path / 'example.com.zone'
+    main.write_text("$INCLUDE hosts.inc internal.example.com.\nwww IN A 192.0.2.1\n")
+    with open(main) as zone_file:
+        records = list(parse_bind(zone_file, 'example.com'))
+    assert [record['host'] for record in records] == ['db.internal', 'www']
+
+
+def test_format_and_reparse_round_trip():
+    records = [record for record in parse_bind(ZONE) if record['type'] != 'SOA']
+    output = io.StringIO()
+    assert write_bind(records, output, zone='example.com', ttl=3600) == len(records)
+    assert list(parse_bind(output.getvalue())) == records
+
+
+def test_format_bind_record_quotes_long_txt():
+    line = format_bind_record({'host': 'txt', 'type': 'TXT', 'record': 'a"b' + 'x' * 300, 'ttl': 60}, 'example.com')
+    assert line.startswith('txt.example.com.\t60\tIN\tTXT\t"a\\"b')
+    assert line.count('" "') == 1
+
+
+@pytest.mark.parametrize('record', [
+    {'host': 'txt', 'type': 'TXT', 'record': 'a' * 254 + '"' + 'b' * 10},
+    {'host': 'txt', 'type': 'TXT', 'record': 'a' * 254 + '\\' + 'b' * 10},
+    {'host': 'txt', 'type': 'TXT', 'record': 'say "hi" \\ bye'},
+    {'host': 'txt', 'type': 'TXT', 'record': ''},
+    {'host': '', 'type': 'CAA', 'caa_flag': 0, 'caa_type': 'iodef', 'caa_value': 'mailto:"ops"\\@example.com'},
+    {'host': '', 'type': 'NAPTR', 'order': '100', 'pref': '10', 'flag': 'U', 'params': 'E2U+sip',
+     'regexp': '!^.*$!sip:"info"\\@example.com!', 'replace': '.'},
+])
+def test_quoted_values_round_trip(record):
+    record = dict(record, ttl=300)
+    assert list(parse_bind(format_bind_record(record), 'example.com')) == [record]
+
+
+def test_txt_strings_are_split_by_utf8_bytes():
+    value = 'é' * 200
+    line = format_bind_record({'host': 'txt', 'type': 'TXT', 'record': value, 'ttl': 60})
+    strings = line.split('\t')[-1][1:-1].split('" "')
+    assert [len(string.encode('utf-8')) for string in strings] == [254, 146]
+    assert list(parse_bind(line, 'example.com'))[0]['record'] == value
+
+
+@pytest.mark.parametrize('source', ['@ IN A 192.0.2.1\n', 'www IN A 192.0.2.1\n', ' IN A 192.0.2.1\n',
+                                    'www.example.com. IN CNAME target\n'])
+def test_relative_names_without_origin_raise(source):
+    with pytest.raises(ValueError):
+        list(parse_bind(source))
+
+
+def test_absolute_names_without_origin():
+    records = list(parse_bind('www.example.com. 60 IN A 192.0.2.1\n'))
+    assert records == [{'host': 'www.example.com', 'type': 'A', 'ttl': 60, 'record': '192.0.2.1'}]
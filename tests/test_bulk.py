@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from cloudns_sdk.bulk import BulkExecutor, resolve_method
+from cloudns_sdk.exceptions import ClouDNSAPIException
+
+
+class Records:
+    def __init__(self):
+        self.deleted = []
+
+    def delete_record(self, domain_name, record_id):
+        self.deleted.append((domain_name, record_id))
+        if record_id == 3:
+            return {'status': 'Failed', 'statusDescription': 'Missing record.'}
+        return {'status': 'Success'}
+
+
+class Zone:
+    def __init__(self):
+        self.records = Records()
+
+
+class Client:
+    def __init__(self):
+        self.zone = Zone()
+
+
+def test_resolve_method():
+    client = Client()
+    assert resolve_method(client, 'zone.records.delete_record').__self__ is client.zone.records
+
+
+def test_results_in_submission_order_with_failures():
+    client = Client()
+    with BulkExecutor(client, max_workers=4, keep_results=True) as bulk:
+        bulk.map('zone.records.delete_record', [('example.com', record_id) for record_id in range(6)])
+    results = bulk.results()
+    assert [result.args[1] for result in results] == list(range(6))
+    assert isinstance(results[3].error, ClouDNSAPIException)
+    assert bulk.stats() == {'submitted': 6, 'completed': 6, 'failed': 1, 'pending': 0}
+
+
+def test_finished_tasks_are_not_retained_by_default():
+    client = Client()
+    progress = []
+    with BulkExecutor(client, max_workers=4, max_pending=8,
+                      on_progress=lambda completed, submitted, result: progress.append(result)) as bulk:
+        for record_id in range(500):
+            bulk.submit('zone.records.delete_record', 'example.com', record_id)
+            assert len(bulk.futures) <= 8
+    assert not bulk.futures and bulk._results == []
+    assert bulk.completed == len(progress) == 500 and bulk.failed == 1
+    with pytest.raises(RuntimeError):
+        bulk.results()
+
+
+def test_cancel_rejects_queued_tasks():
+    started, release = threading.Event(), threading.Event()
+    bulk = BulkExecutor(Client(), max_workers=1, max_pending=10)
+    bulk.submit(lambda: started.set() or release.wait())
+    started.wait()
+    futures = [bulk.submit(release.wait) for _ in range(3)]
+    assert bulk.cancel() == 3
+    assert all(future.cancelled() for future in futures)
+    with pytest.raises(RuntimeError):
+        bulk.submit(release.wait)
+    release.set()
+    bulk.shutdown()
+    assert bulk.stats()['pending'] == 0
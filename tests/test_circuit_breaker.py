@@ -0,0 +1,111 @@
+import threading
+from unittest import mock
+
+import pytest
+import requests
+
+from cloudns_sdk.api import ClouDNSAPI
+from cloudns_sdk.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, endpoint_family
+from cloudns_sdk.exceptions import CircuitOpenError
+from cloudns_sdk.rate_limit import RateLimiter
+
+
+def make_client(breaker, session, **kwargs):
+    return ClouDNSAPI('1', 'secret', rate_limiter=RateLimiter(1000), circuit_breaker=breaker, session=session,
+                      **kwargs)
+
+
+def test_endpoint_family():
+    assert endpoint_family('dns/records.json') == 'dns'
+    assert endpoint_family('dns/failover-settings.json') == 'failover'
+    assert endpoint_family('domains/domain-info.json') == 'domains'
+
+
+def test_opens_after_threshold_and_recovers_through_probe():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    for _ in range(2):
+        breaker.record_failure(breaker.before_call('dns/records.json'), 'boom')
+    assert breaker.state('dns') == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call('dns/records.json')
+    with mock.patch('cloudns_sdk.circuit_breaker.time.monotonic', return_value=10 ** 9):
+        assert breaker.state('dns') == HALF_OPEN
+        family = breaker.before_call('dns/records.json')
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call('dns/records.json')
+        breaker.record_success(family)
+        assert breaker.state('dns') == CLOSED
+
+
+def test_requests_are_sent_with_timeout():
+    session = mock.Mock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.json.return_value = {'ip': '192.0.2.1'}
+    client = make_client(CircuitBreaker(), session, timeout=2.5)
+    client.get_current_ip()
+    assert session.get.call_args.kwargs['timeout'] == 2.5
+    assert make_client(CircuitBreaker(), session).timeout == ClouDNSAPI.REQUEST_TIMEOUT
+
+
+def test_timeouts_open_the_circuit():
+    session = mock.Mock()
+    session.get.side_effect = requests.Timeout('read timed out')
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = make_client(breaker, session)
+    for _ in range(2):
+        with pytest.raises(requests.Timeout):
+            client.zone.records.list_records('example.com')
+    assert breaker.state('dns') == OPEN
+    with pytest.raises(CircuitOpenError):
+        client.zone.records.list_records('example.com')
+    assert session.get.call_count == 2
+
+
+def test_timed_out_probe_reopens_the_circuit():
+    session = mock.Mock()
+    session.get.side_effect = requests.Timeout('read timed out')
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    client = make_client(breaker, session)
+    for _ in range(3):
+        with pytest.raises(requests.Timeout):
+            client.zone.records.list_records('example.com')
+    assert breaker.stats()['dns']['opened'] == 3
+
+
+def test_queued_requests_are_not_sent_once_the_circuit_opens():
+    session = mock.Mock()
+    session.get.side_effect = requests.ConnectionError('connection refused')
+    breaker = CircuitBreaker(failure_threshold=3)
+    client = ClouDNSAPI('1', 'secret', rate_limiter=RateLimiter(50), circuit_breaker=breaker, session=session)
+    errors = []
+
+    def call():
+        try:
+            client.zone.records.list_records('example.com')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert session.get.call_count == 3
+    assert sum(isinstance(error, CircuitOpenError) for error in errors) == 27
+    assert breaker.stats()['dns']['rejected'] == 27
+
+
+def test_throttle_retries_stop_when_the_circuit_opens():
+    session = mock.Mock()
+    throttled = mock.Mock(status_code=429)
+    breaker = CircuitBreaker(failure_threshold=1)
+
+    def get(url, params=None, timeout=None):
+        breaker.record_failure('dns', 'opened by another caller')
+        return throttled
+
+    session.get.side_effect = get
+    client = make_client(breaker, session)
+    with pytest.raises(CircuitOpenError):
+        client.zone.records.list_records('example.com')
+    assert session.get.call_count == 1
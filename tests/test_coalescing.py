@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from cloudns_sdk.coalescing import WriteCoalescer
+
+
+class Records:
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+
+    def modify_record(self, domain_name, record_id, **fields):
+        if self.gate is not None:
+            self.gate.wait()
+        self.calls.append((domain_name, record_id, fields))
+        return {'status': 'Success', 'sent': len(self.calls)}
+
+
+def test_last_update_of_a_window_wins():
+    records = Records()
+    with WriteCoalescer(records, window=0.1) as coalescer:
+        first = coalescer.modify_record('example.com', 1, host='www', record='192.0.2.1', ttl=300, priority=10)
+        second = coalescer.modify_record('example.com', 1, host='www', record='192.0.2.2', ttl=60)
+        other = coalescer.modify_record('example.com', 2, host='api', record='192.0.2.9', ttl=60)
+    assert sorted(records.calls) == [
+        ('example.com', 1, {'host': 'www', 'record': '192.0.2.2', 'ttl': 60}),
+        ('example.com', 2, {'host': 'api', 'record': '192.0.2.9', 'ttl': 60}),
+    ]
+    assert first.result() is second.result()
+    assert other.result()['status'] == 'Success'
+    assert coalescer.stats() == {'submitted': 3, 'sent': 2, 'pending': 0, 'merged': 1}
+
+
+def test_updates_during_a_request_are_sent_after_it():
+    gate = threading.Event()
+    records = Records(gate)
+    coalescer = WriteCoalescer(records, window=0.01)
+    first = coalescer.modify_record('example.com', 1, record='192.0.2.1')
+    while coalescer.stats()['sent'] == 0:
+        threading.Event().wait(0.005)
+    second = coalescer.modify_record('example.com', 1, record='192.0.2.2')
+    gate.set()
+    coalescer.close()
+    assert [fields['record'] for _, _, fields in records.calls] == ['192.0.2.1', '192.0.2.2']
+    assert first.result()['sent'] == 1 and second.result()['sent'] == 2
+
+
+def test_closed_coalescer_rejects_updates():
+    coalescer = WriteCoalescer(Records())
+    coalescer.close()
+    with pytest.raises(RuntimeError):
+        coalescer.modify_record('example.com', 1, ttl=60)
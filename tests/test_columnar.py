@@ -0,0 +1,77 @@
+import pytest
+
+from cloudns_sdk import columnar
+from cloudns_sdk.columnar import RecordColumns, StringTable
+
+PAGE = {
+    '1': {'id': '1', 'host': 'www', 'type': 'A', 'record': '10.0.0.1', 'ttl': '3600', 'status': '1'},
+    '2': {'id': '2', 'host': 'api', 'type': 'A', 'record': '192.0.2.1', 'ttl': '300', 'status': '0'},
+    '3': {'id': '3', 'host': '', 'type': 'MX', 'record': 'mail.example.com', 'ttl': '86400', 'status': 1},
+    '4': {'id': '4', 'host': 'v6', 'type': 'AAAA', 'record': '2001:db8::1', 'ttl': '3600', 'status': 1},
+}
+
+
+BACKENDS = ['python'] + (['numpy'] if columnar.numpy is not None else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def columns(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(columnar, 'numpy', None)
+    return RecordColumns.from_pages([PAGE, []], zone='example.com')
+
+
+def test_string_table_interns_values():
+    table = StringTable()
+    assert table.code('a') == table.code('a') == 0
+    assert table.code('b') == 1 and table.lookup('c') is None
+    assert table.codes_where(lambda value: value > 'a') == {1}
+
+
+def test_rows_round_trip(columns):
+    assert len(columns) == 4
+    assert columns.row(0) == {'id': 1, 'zone': 'example.com', 'host': 'www', 'type': 'A', 'record': '10.0.0.1',
+                              'ttl': 3600, 'status': 1}
+
+
+@pytest.mark.parametrize('status, expected', [(1, [0, 2, 3]), ('1', [0, 2, 3]), (0, [1]), ('0', [1]),
+                                              ('inactive', [])])
+def test_status_filter_accepts_int_and_str(columns, status, expected):
+    assert columns.where(status=status) == expected
+
+
+def test_combined_filters(columns):
+    assert columns.where(record_type='A', network='10.0.0.0/8') == [0]
+    assert columns.where(record_type=('A', 'AAAA'), ttl_gt='1000') == [0, 3]
+    assert columns.where(zone='example.com', host='api') == [1]
+    assert columns.where(zone='example.org') == []
+    assert columns.where(record_like='example', ttl_lt=100000) == [2]
+    assert list(columns.rows(columns.where(record_type='MX')))[0]['record'] == 'mail.example.com'
+
+
+def test_empty_store_and_no_filters(columns):
+    assert RecordColumns().where(record_type='A') == []
+    assert columns.where() == [0, 1, 2, 3]
+    assert columns.where(network='198.51.100.0/24') == []
+
+
+def test_rows_can_be_appended_after_filtering(columns):
+    assert columns.where(record_type='A', ttl_gt=3000) == [0]
+    columns.append({'id': '5', 'host': 'new', 'type': 'A', 'record': '10.0.0.9', 'ttl': '7200', 'status': '1'},
+                   zone='example.com')
+    assert columns.where(record_type='A', ttl_gt=3000) == [0, 4]
+
+
+def test_numpy_and_python_filters_agree(monkeypatch):
+    pytest.importorskip('numpy')
+    columns = RecordColumns()
+    for index in range(2000):
+        columns.append({'id': index, 'host': f'h{index % 7}', 'type': ('A', 'AAAA', 'MX')[index % 3],
+                        'record': f'10.{index % 4}.0.{index % 250}', 'ttl': (300, 3600, 86400)[index % 3] + index,
+                        'status': index % 2}, zone=f'z{index % 5}.com')
+    queries = [{'record_type': ('A', 'MX'), 'ttl_gt': 3600}, {'zone': 'z1.com', 'status': '0', 'ttl_lt': 5000},
+               {'network': '10.2.0.0/16', 'host': 'h3'}, {'record_like': '.0.1'}]
+    expected = [columns.where(**query) for query in queries]
+    monkeypatch.setattr(columnar, 'numpy', None)
+    assert [columns.where(**query) for query in queries] == expected
+    assert all(expected)
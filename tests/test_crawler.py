@@ -0,0 +1,74 @@
+import json
+
+from cloudns_sdk.crawler import IncrementalCrawler
+
+
+class Records:
+    def __init__(self):
+        self.serials = {'a.com': 1, 'b.com': 1}
+        self.listed = []
+
+    def get_soa_details(self, domain_name):
+        if domain_name not in self.serials:
+            return {'status': 'Failed', 'statusDescription': 'Missing domain-name'}
+        return {'serialNumber': str(self.serials[domain_name])}
+
+    def get_records_count(self, domain_name):
+        return 3
+
+    def iter_record_pages(self, domain_name, rows_per_page=100):
+        self.listed.append(domain_name)
+        yield {'1': {'id': '1', 'host': '', 'type': 'A', 'record': '192.0.2.1'}}
+
+
+class Zone:
+    def __init__(self):
+        self.records = Records()
+
+    def iter_zones(self, rows_per_page=100):
+        return [{'name': name} for name in list(self.records.serials)]
+
+
+def test_only_changed_zones_are_listed(tmp_path):
+    zone = Zone()
+    state_path = str(tmp_path / 'signatures.json')
+    seen = {}
+    result = IncrementalCrawler(zone, state_path=state_path, max_workers=2).crawl(on_changed=seen.__setitem__)
+    assert sorted(result.changed) == ['a.com', 'b.com'] and seen['a.com'][0]['record'] == '192.0.2.1'
+
+    zone.records.serials['b.com'] = 2
+    zone.records.listed = []
+    result = IncrementalCrawler(zone, state_path=state_path).crawl()
+    assert result.changed == ['b.com'] and result.unchanged == ['a.com']
+    assert zone.records.listed == ['b.com']
+    with open(state_path) as file:
+        assert json.load(file) == {'a.com': '1', 'b.com': '2'}
+
+
+def test_removed_and_failed_zones():
+    zone = Zone()
+    crawler = IncrementalCrawler(zone, signature='soa+count')
+    crawler.crawl()
+    assert crawler.signatures['a.com'] == '1/3'
+
+    del zone.records.serials['b.com']
+    removed = []
+    result = crawler.crawl(on_removed=removed.append)
+    assert result.removed == removed == ['b.com']
+    assert 'b.com' not in crawler.signatures
+
+    result = crawler.crawl(zones=['a.com', 'gone.com'])
+    assert list(result.failed) == ['gone.com'] and result.removed == []
+
+
+def test_failed_callback_keeps_old_signature():
+    zone = Zone()
+    crawler = IncrementalCrawler(zone)
+
+    def fail(zone_name, records):
+        raise RuntimeError('boom')
+
+    result = crawler.crawl(zones=['a.com'], on_changed=fail)
+    assert isinstance(result.failed['a.com'], RuntimeError)
+    assert crawler.signatures == {}
+    assert crawler.crawl(zones=['a.com']).changed == ['a.com']
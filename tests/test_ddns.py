@@ -0,0 +1,83 @@
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from cloudns_sdk.ddns import FAILED, UNCHANGED, UPDATED, DynamicDNSUpdater
+
+
+class Response:
+    def __init__(self, status_code=200, text='OK'):
+        self.status_code = status_code
+        self.text = text
+
+
+class Session:
+    def __init__(self):
+        self.requests = []
+        self.invalid = set()
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.requests.append((url, params))
+        return Response(text='Invalid request.' if url in self.invalid else 'OK')
+
+
+class Records:
+    def __init__(self):
+        self.url_calls = 0
+
+    def get_dynamic_url(self, domain_name, record_id):
+        self.url_calls += 1
+        return {'host': 'home', 'url': f'https://ddns.example/{domain_name}/{record_id}/{self.url_calls}'}
+
+
+def make_updater(tmp_path, session=None, records=None):
+    return DynamicDNSUpdater(records or Records(), ip_param='ip', state_path=str(tmp_path / 'ddns.json'),
+                             session=session or Session())
+
+
+def test_push_sends_changed_ips_only(tmp_path):
+    session = Session()
+    updater = make_updater(tmp_path, session)
+    results = updater.push([('example.com', 1, '198.51.100.1'), ('example.com', 2, '198.51.100.2'),
+                            ('example.com', 1, '198.51.100.3')])
+    assert [(result.record_id, result.ip, result.status) for result in results] == [
+        (1, '198.51.100.3', UPDATED), (2, '198.51.100.2', UPDATED)]
+    assert updater.push([('example.com', 1, '198.51.100.3')])[0].status == UNCHANGED
+    assert sorted(params['ip'] for _, params in session.requests) == ['198.51.100.2', '198.51.100.3']
+
+
+def test_state_survives_restarts_and_is_private(tmp_path):
+    records = Records()
+    make_updater(tmp_path, records=records).push([('example.com', 1, '198.51.100.1')])
+    path = tmp_path / 'ddns.json'
+    assert json.loads(path.read_text())['ips'] == {'example.com/1': '198.51.100.1'}
+    if os.name == 'posix':
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    session = Session()
+    result, = make_updater(tmp_path, session, records).push([('example.com', 1, '198.51.100.1')])
+    assert result.status == UNCHANGED and not session.requests and records.url_calls == 1
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="POSIX file modes")
+def test_state_file_permissions_are_tightened(tmp_path):
+    path = tmp_path / 'ddns.json'
+    path.write_text('{}')
+    os.chmod(path, 0o644)
+    make_updater(tmp_path).save_state()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_rejected_url_is_refetched(tmp_path):
+    session = Session()
+    records = Records()
+    updater = make_updater(tmp_path, session, records)
+    session.invalid.add('https://ddns.example/example.com/1/1')
+    result, = updater.push([('example.com', 1, '198.51.100.1')])
+    assert result.status == FAILED
+    result, = updater.push([('example.com', 1, '198.51.100.1')])
+    assert result.status == UPDATED and records.url_calls == 2
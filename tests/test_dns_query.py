@@ -0,0 +1,144 @@
+import asyncio
+import struct
+
+import pytest
+
+from cloudns_sdk.dns_query import (RECORD_TYPE_CODES, DNSQueryClient, PropagationVerifier, build_query,
+                                   parse_response)
+from cloudns_sdk.exceptions import DNSQueryError
+
+ZONE = {
+    ('example.com', 'MX'): [struct.pack('!H', 10) + b'\x04mail\x07example\x03com\x00'],
+    ('www.example.com', 'A'): [bytes([192, 0, 2, 1])],
+    ('txt.example.com', 'TXT'): [b'\x05hello\x06 world'],
+    ('big.example.com', 'A'): [bytes([192, 0, 2, i]) for i in range(1, 41)],
+}
+
+
+def encode_name(name):
+    return b''.join(bytes([len(label)]) + label.encode() for label in name.split('.')) + b'\x00'
+
+
+def read_question(query):
+    offset, labels = 12, []
+    while query[offset]:
+        labels.append(query[offset + 1:offset + 1 + query[offset]].decode())
+        offset += 1 + query[offset]
+    type_code = struct.unpack('!H', query[offset + 1:offset + 3])[0]
+    record_type = next(name for name, code in RECORD_TYPE_CODES.items() if code == type_code)
+    return '.'.join(labels), record_type, query[12:offset + 5]
+
+
+def answer(query, tcp):
+    query_id = query[:2]
+    name, record_type, question = read_question(query)
+    if name == 'bad.example.com':
+        return query_id + struct.pack('!HHHHH', 0x8400, 1, 1, 0, 0) + question + b'\xc0\x0c\x00\x01'
+    rdatas = ZONE.get((name, record_type), [])
+    truncated = len(rdatas) > 20 and not tcp
+    if truncated:
+        rdatas = []
+    rcode = 0 if any(key[0] == name for key in ZONE) else 3
+    flags = 0x8400 | (0x0200 if truncated else 0) | rcode
+    records = b''.join(b'\xc0\x0c' + struct.pack('!HHIH', RECORD_TYPE_CODES[record_type], 1, 300, len(rdata))
+                       + rdata for rdata in rdatas)
+    return query_id + struct.pack('!HHHHH', flags, 1, len(rdatas), 0, 0) + question + records
+
+
+class StubUDP(asyncio.DatagramProtocol):
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.transport.sendto(answer(data, tcp=False), addr)
+
+
+async def handle_tcp(reader, writer):
+    length = struct.unpack('!H', await reader.readexactly(2))[0]
+    response = answer(await reader.readexactly(length), tcp=True)
+    writer.write(struct.pack('!H', len(response)) + response)
+    await writer.drain()
+    writer.close()
+
+
+async def start_stub():
+    loop = asyncio.get_event_loop()
+    transport, _ = await loop.create_datagram_endpoint(StubUDP, local_addr=('127.0.0.1', 0))
+    port = transport.get_extra_info('sockname')[1]
+    server = await asyncio.start_server(handle_tcp, '127.0.0.1', port)
+    return transport, server, port
+
+
+def run_with_stub(test):
+    async def main():
+        transport, server, port = await start_stub()
+        try:
+            return await test(port)
+        finally:
+            transport.close()
+            server.close()
+            await server.wait_closed()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+def test_build_and_parse_round_trip():
+    query_id, message = build_query('www.example.com', 'A', query_id=7)
+    response = parse_response(answer(message, tcp=False), query_id)
+    assert response.rcode == 0 and response.authoritative
+    assert [(a.name, a.type, a.value) for a in response.answers] == [('www.example.com', 'A', '192.0.2.1')]
+    with pytest.raises(DNSQueryError):
+        parse_response(answer(message, tcp=False), 8)
+
+
+@pytest.mark.parametrize('cut', [5, 13, 30, 40, 45])
+def test_truncated_packets_raise_dns_query_error(cut):
+    _, message = build_query('www.example.com', 'A', query_id=7)
+    with pytest.raises(DNSQueryError):
+        parse_response(answer(message, tcp=False)[:cut])
+
+
+@pytest.mark.parametrize('record_type, rdata', [('A', b'\x01\x02'), ('SOA', b'\x00'), ('CAA', b'\x00'),
+                                                 ('MX', b'\x00\x0a')])
+def test_malformed_rdata_raises_dns_query_error(record_type, rdata):
+    message = (struct.pack('!HHHHHH', 1, 0x8400, 0, 1, 0, 0) + b'\x00'
+               + struct.pack('!HHIH', RECORD_TYPE_CODES[record_type], 1, 300, len(rdata)) + rdata)
+    with pytest.raises(DNSQueryError):
+        parse_response(message)
+
+
+def test_queries_against_stub_server():
+    async def test(port):
+        client = DNSQueryClient(timeout=1.0, retries=1, port=port)
+        return await client.query_many([
+            ('127.0.0.1', 'www.example.com', 'A'),
+            ('127.0.0.1', 'example.com', 'MX'),
+            ('127.0.0.1', 'txt.example.com', 'TXT'),
+            ('127.0.0.1', 'big.example.com', 'A'),
+            ('127.0.0.1', 'bad.example.com', 'A'),
+            ('127.0.0.1', 'missing.example.org', 'A'),
+        ])
+
+    www, mx, txt, big, bad, missing = run_with_stub(test)
+    assert www.answers[0].value == '192.0.2.1'
+    assert mx.answers[0].value == 'mail.example.com'
+    assert txt.answers[0].value == 'hello world'
+    assert len(big.answers) == 40 and not big.truncated
+    assert isinstance(bad, DNSQueryError)
+    assert missing.rcode == 3
+
+
+def test_verifier_reports_convergence_per_server():
+    async def test(port):
+        verifier = PropagationVerifier(client=DNSQueryClient(timeout=1.0, retries=1, port=port))
+        return await verifier.verify_async('example.com', [('www', 'A', '192.0.2.1'), ('', 'MX', None),
+                                                           ('www', 'A', '192.0.2.99'), ('bad', 'A', None)],
+                                           servers={'ns1': '127.0.0.1'})
+
+    result = run_with_stub(test)
+    assert result == {'ns1': {('www', 'A'): False, ('', 'MX'): True, ('bad', 'A'): False}}
+    assert not PropagationVerifier.converged(result)
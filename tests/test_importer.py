@@ -0,0 +1,121 @@
+import pytest
+
+from cloudns_sdk.importer import ChunkedImporter, iter_bind_chunks
+
+
+class TransferAPI:
+    def __init__(self, fail_on=()):
+        self.calls = []
+        self.fail_on = set(fail_on)
+
+    def import_records(self, domain_name, format='bind', content='', delete_existing_records=False,
+                       record_types=None):
+        index = len(self.calls)
+        self.calls.append((content, delete_existing_records))
+        if index in self.fail_on:
+            return {'status': 'Failed', 'statusDescription': 'Import failed.'}
+        return {'status': 'Success'}
+
+
+def make_records(count, prefix='host'):
+    return [{'host': f'{prefix}{i}', 'type': 'A', 'record': f'192.0.2.{i % 250 + 1}', 'ttl': 3600}
+            for i in range(count)]
+
+
+def make_importer(transfer_api, tmp_path):
+    return ChunkedImporter(transfer_api, max_records=10, retries=1, retry_delay=0,
+                           checkpoint_path=str(tmp_path / 'progress.json'))
+
+
+def test_chunks_respect_limits():
+    chunks = list(iter_bind_chunks(make_records(25) + [{'host': '', 'type': 'SOA', 'record': 'x'}], 'example.com',
+                                   max_records=10))
+    assert [count for _, count in chunks] == [10, 10, 5]
+    assert all(content.startswith('$ORIGIN example.com.\n') for content, _ in chunks)
+
+
+def test_only_first_chunk_deletes_existing_records(tmp_path):
+    transfer = TransferAPI()
+    result = make_importer(transfer, tmp_path).import_zone('example.com', make_records(25),
+                                                           delete_existing_records=True)
+    assert result == ('example.com', 3, 25, 0)
+    assert [delete for _, delete in transfer.calls] == [True, False, False]
+
+
+def test_interrupted_import_resumes_after_last_chunk(tmp_path):
+    transfer = TransferAPI(fail_on={1})
+    with pytest.raises(Exception):
+        make_importer(transfer, tmp_path).import_zone('example.com', make_records(25))
+    transfer.fail_on.clear()
+    result = make_importer(transfer, tmp_path).import_zone('example.com', make_records(25))
+    assert result.skipped_chunks == 1 and result.records == 15
+    assert len(transfer.calls) == 4
+
+
+def test_completed_import_is_not_sent_again(tmp_path):
+    transfer = TransferAPI()
+    make_importer(transfer, tmp_path).import_zone('example.com', make_records(25))
+    result = make_importer(transfer, tmp_path).import_zone('example.com', make_records(25))
+    assert result == ('example.com', 3, 0, 3)
+    assert len(transfer.calls) == 3
+
+
+def test_changed_content_starts_fresh(tmp_path):
+    transfer = TransferAPI()
+    make_importer(transfer, tmp_path).import_zone('example.com', make_records(25), delete_existing_records=True)
+    result = make_importer(transfer, tmp_path).import_zone('example.com', make_records(25, 'web'),
+                                                           delete_existing_records=True)
+    assert result == ('example.com', 3, 25, 0)
+    assert transfer.calls[3][1] is True and 'web0' in transfer.calls[3][0]
+
+
+def test_zone_file_checkpoint_follows_file_content(tmp_path):
+    zone_file = tmp_path / 'example.com.zone'
+    zone_file.write_text('$ORIGIN example.com.\n$TTL 3600\nwww IN A 192.0.2.1\napi IN A 192.0.2.2\n')
+    transfer = TransferAPI()
+    make_importer(transfer, tmp_path).import_zones({'example.com': str(zone_file)})
+    make_importer(transfer, tmp_path).import_zones({'example.com': str(zone_file)})
+    assert len(transfer.calls) == 1
+    zone_file.write_text('$ORIGIN example.com.\n$TTL 3600\nwww IN A 192.0.2.9\n')
+    results = make_importer(transfer, tmp_path).import_zones({'example.com': str(zone_file)})
+    assert results['example.com'].records == 1 and len(transfer.calls) == 2
+
+
+def test_records_are_streamed_into_chunks(tmp_path):
+    consumed = []
+
+    def records():
+        for record in make_records(100):
+            consumed.append(record)
+            yield record
+
+    class Recording(TransferAPI):
+        def import_records(self, domain_name, **kwargs):
+            self.consumed_at_first_call = getattr(self, 'consumed_at_first_call', len(consumed))
+            return super().import_records(domain_name, **kwargs)
+
+    transfer = Recording()
+    result = make_importer(transfer, tmp_path).import_zone('example.com', records())
+    assert result == ('example.com', 10, 100, 0)
+    assert transfer.consumed_at_first_call == 11
+
+
+def test_changed_tail_continues_from_first_changed_chunk(tmp_path):
+    transfer = TransferAPI()
+    make_importer(transfer, tmp_path).import_zone('example.com', make_records(25))
+    changed = make_records(20) + make_records(8, 'web')
+    result = make_importer(transfer, tmp_path).import_zone('example.com', changed)
+    assert result == ('example.com', 3, 8, 2)
+    assert 'web0' in transfer.calls[3][0] and len(transfer.calls) == 4
+
+
+def test_changed_tail_with_delete_requires_a_fresh_import(tmp_path):
+    transfer = TransferAPI()
+    make_importer(transfer, tmp_path).import_zone('example.com', make_records(25), delete_existing_records=True)
+    with pytest.raises(ValueError):
+        make_importer(transfer, tmp_path).import_zone('example.com', make_records(20),
+                                                      delete_existing_records=True)
+    result = make_importer(transfer, tmp_path).import_zone('example.com', make_records(20),
+                                                           delete_existing_records=True)
+    assert result == ('example.com', 2, 20, 0)
+    assert transfer.calls[3][1] is True and len(transfer.calls) == 5
@@ -0,0 +1,70 @@
+from cloudns_sdk.index import IndexEntry, ReverseIndex, normalize_value
+
+
+class Records:
+    def __init__(self, zones):
+        self.zones = zones
+
+    def iter_record_pages(self, domain_name, rows_per_page=100):
+        yield self.zones[domain_name]
+        yield []
+
+
+ZONES = {
+    'example.com': {
+        '1': {'id': '1', 'host': 'www', 'type': 'A', 'record': '10.0.0.1'},
+        '2': {'id': '2', 'host': 'v6', 'type': 'AAAA', 'record': '2001:0db8::0001'},
+        '3': {'id': '3', 'host': 'cdn', 'type': 'CNAME', 'record': 'LB1.example.net.'},
+    },
+    'example.org': {
+        '7': {'id': '7', 'host': '', 'type': 'A', 'record': '10.0.0.1'},
+        '8': {'id': '8', 'host': 'db', 'type': 'A', 'record': '192.0.2.5'},
+    },
+}
+
+
+def build():
+    return ReverseIndex(Records(ZONES)).build(ZONES)
+
+
+def test_normalize_value():
+    assert normalize_value(' 2001:0DB8::0001 ') == '2001:db8::1'
+    assert normalize_value('LB1.Example.NET.') == 'lb1.example.net'
+
+
+def test_lookup_across_zones():
+    index = build()
+    assert len(index) == 5
+    assert index.lookup('10.0.0.1') == [IndexEntry('example.com', '1', 'www', 'A'),
+                                        IndexEntry('example.org', '7', '', 'A')]
+    assert index.lookup('2001:db8::1')[0].host == 'v6'
+    assert index.lookup('lb1.example.net')[0].record_id == '3'
+
+
+def test_lookup_network():
+    index = build()
+    assert [entry.record_id for entry in index.lookup_network('10.0.0.0/8')] == ['1', '7']
+    assert [entry.record_id for entry in index.lookup_network('192.0.2.0/24')] == ['8']
+    assert [entry.record_id for entry in index.lookup_network('2001:db8::/32')] == ['2']
+
+
+def test_refresh_replaces_only_that_zone():
+    index = build()
+    index.lookup_network('10.0.0.0/8')
+    index.set_zone_records('example.org', [{'id': '9', 'host': 'new', 'type': 'A', 'record': '10.0.0.2'}])
+    assert [entry.record_id for entry in index.lookup('10.0.0.1')] == ['1']
+    assert [entry.record_id for entry in index.lookup_network('10.0.0.0/8')] == ['1', '9']
+    assert index.lookup('192.0.2.5') == []
+    index.remove_zone('example.com')
+    assert list(index.zones) == ['example.org']
+    assert index.lookup('lb1.example.net') == []
+
+
+def test_save_and_load(tmp_path):
+    index = build()
+    for name in ('index.json', 'index.json.gz'):
+        path = str(tmp_path / name)
+        index.save(path)
+        loaded = ReverseIndex.load(path)
+        assert loaded.zones == index.zones
+        assert loaded.lookup_network('0.0.0.0/0') == index.lookup_network('0.0.0.0/0')
@@ -0,0 +1,102 @@
+import pytest
+
+from cloudns_sdk.inventory import AccountInventory
+
+
+class Fake:
+    def __init__(self, zones):
+        self.zones = zones
+        self.calls = []
+        self.broken_notes = set()
+        self.zone = self
+        self.records = self.forward = self.notes = self.cloud = self.dnssec = self.groups = self.failover = self
+
+    def iter_zones(self, rows_per_page=100, has_cloud_domains=None):
+        return [{'name': name, 'type': 'master'} for name in self.zones
+                if not has_cloud_domains or name == 'a.com']
+
+    def iter_record_pages(self, domain_name, rows_per_page=100):
+        self.calls.append(('records', domain_name))
+        yield {'1': {'id': '1', 'host': 'www', 'type': 'A', 'record': '192.0.2.1', 'ttl': '3600', 'failover': '1'},
+               '2': {'id': '2', 'host': '', 'type': 'MX', 'record': 'mail', 'ttl': '3600', 'failover': '0'}}
+
+    def get_failover_settings(self, domain_name, record_id):
+        self.calls.append(('failover', domain_name, record_id))
+        return {'check_type': '1'}
+
+    def get_note(self, domain_name):
+        self.calls.append(('notes', domain_name))
+        if domain_name in self.broken_notes:
+            raise RuntimeError('boom')
+        return {'note': domain_name}
+
+    def list_cloud_domains(self, domain_name):
+        self.calls.append(('cloud_domains', domain_name))
+        return {}
+
+    def get_soa_details(self, domain_name):
+        return {'serialNumber': '1'}
+
+    def list_mail_forwards(self, domain_name):
+        return []
+
+    def is_dnssec_available(self, domain_name):
+        return {'status': 'Success'}
+
+    def get_ds_records(self, domain_name):
+        return {}
+
+    def list_groups(self):
+        return [{'id': '1', 'name': 'Default'}]
+
+
+@pytest.fixture
+def fake():
+    return Fake(['a.com', 'b.com'])
+
+
+def test_crawl_fetches_only_what_the_account_needs(fake, tmp_path):
+    with AccountInventory(fake, str(tmp_path / 'inventory.db'), max_workers=2) as inventory:
+        result = inventory.run()
+        assert result.zones == 2 and sorted(result.completed) == ['a.com', 'b.com'] and not result.failed
+        assert sorted(call for call in fake.calls if call[0] in ('failover', 'cloud_domains')) == [
+            ('cloud_domains', 'a.com'), ('failover', 'a.com', '1'), ('failover', 'b.com', '1')]
+        assert inventory.query("SELECT zone, id, type FROM records WHERE failover = '1' ORDER BY zone") == [
+            ('a.com', '1', 'A'), ('b.com', '1', 'A')]
+        assert inventory.query("SELECT data FROM account_data WHERE section = 'groups'") == [
+            ('[{"id": "1", "name": "Default"}]',)]
+
+
+def test_resume_fetches_only_failed_sections(fake, tmp_path):
+    path = str(tmp_path / 'inventory.db')
+    fake.broken_notes.add('b.com')
+    with AccountInventory(fake, path, sections=['records', 'failover', 'notes']) as inventory:
+        result = inventory.run()
+        assert result.completed == ['a.com'] and list(result.failed['b.com']) == ['notes']
+        assert inventory.query("SELECT error FROM checkpoints WHERE zone = 'b.com' AND section = 'notes'") == [
+            ('RuntimeError: boom',)]
+
+    fake.broken_notes.clear()
+    fake.calls = []
+    with AccountInventory(fake, path, sections=['records', 'failover', 'notes']) as inventory:
+        result = inventory.run()
+        assert result.skipped == ['a.com'] and result.completed == ['b.com']
+        assert fake.calls == [('notes', 'b.com')]
+        assert inventory.query('SELECT COUNT(*) FROM runs WHERE finished IS NULL') == [(0,)]
+
+
+def test_finished_run_drops_removed_zones(fake, tmp_path):
+    path = str(tmp_path / 'inventory.db')
+    with AccountInventory(fake, path, sections=['records']) as inventory:
+        inventory.run()
+        fake.zones.remove('b.com')
+        inventory.run()
+        assert inventory.query('SELECT name FROM zones') == [('a.com',)]
+        assert inventory.query('SELECT DISTINCT zone FROM records') == [('a.com',)]
+
+
+def test_invalid_sections(fake, tmp_path):
+    with pytest.raises(ValueError):
+        AccountInventory(fake, str(tmp_path / 'inventory.db'), sections=['failover'])
+    with pytest.raises(ValueError):
+        AccountInventory(fake, str(tmp_path / 'inventory.db'), sections=['unknown'])
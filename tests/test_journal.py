@@ -0,0 +1,96 @@
+import pytest
+import requests
+
+from cloudns_sdk.journal import FAILED, IN_DOUBT, PLANNED, STARTED, SUCCEEDED, BulkJob, Journal
+
+
+class Records:
+    def __init__(self, errors=None):
+        self.errors = errors or {}
+        self.added = []
+
+    def add_record(self, domain_name, record_type, host):
+        self.added.append(host)
+        error = self.errors.pop(host, None)
+        if error is not None:
+            raise error
+        if host == 'rejected':
+            return {'status': 'Failed', 'statusDescription': 'Invalid record.'}
+        return {'status': 'Success', 'data': {'id': len(self.added)}}
+
+
+class Client:
+    def __init__(self, records):
+        self.zone = type('Zone', (), {})()
+        self.zone.records = records
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = Journal(str(tmp_path / 'journal.sqlite'))
+    yield journal
+    journal.close()
+
+
+def make_job(client, journal, hosts, **kwargs):
+    job = BulkJob(client, journal, 'add-records', **kwargs)
+    for host in hosts:
+        job.add(f'add:{host}', 'zone.records.add_record', 'example.com', 'A', host=host)
+    return job
+
+
+def test_succeeded_operations_are_not_repeated(journal):
+    records = Records()
+    assert make_job(Client(records), journal, ['www', 'api']).run().succeeded == ['add:www', 'add:api']
+    result = make_job(Client(records), journal, ['www', 'api', 'mail']).run()
+    assert result.skipped == ['add:www', 'add:api'] and result.succeeded == ['add:mail']
+    assert records.added == ['www', 'api', 'mail']
+
+
+def test_api_rejections_fail_and_are_retried(journal):
+    records = Records()
+    result = make_job(Client(records), journal, ['rejected']).run()
+    assert list(result.failed) == ['add:rejected']
+    assert journal.statuses('add-records') == {'add:rejected': FAILED}
+    make_job(Client(records), journal, ['rejected']).run(retry_failed=True)
+    assert records.added == ['rejected', 'rejected']
+
+
+def test_transport_errors_are_in_doubt_and_not_replayed(journal):
+    records = Records({'www': requests.ReadTimeout('read timed out')})
+    result = make_job(Client(records), journal, ['www']).run()
+    assert 'ReadTimeout' in result.in_doubt['add:www'] and not result.failed
+    assert journal.statuses('add-records') == {'add:www': IN_DOUBT}
+    result = make_job(Client(records), journal, ['www']).run(retry_failed=True)
+    assert list(result.in_doubt) == ['add:www']
+    assert records.added == ['www']
+
+
+def test_in_doubt_operations_are_resolved_with_check(journal):
+    records = Records({'www': requests.ConnectionError('connection reset')})
+    make_job(Client(records), journal, ['www']).run()
+    job = BulkJob(Client(records), journal, 'add-records')
+    job.add('add:www', 'zone.records.add_record', 'example.com', 'A', host='www', check=lambda client: True)
+    assert job.run().succeeded == ['add:www']
+    assert records.added == ['www']
+    assert journal.statuses('add-records') == {'add:www': SUCCEEDED}
+
+
+def test_interrupted_operations_follow_the_in_doubt_policy(journal):
+    journal.plan('add-records', 'add:www', 'zone.records.add_record', {})
+    journal.mark('add-records', 'add:www', STARTED)
+    records = Records()
+    assert list(make_job(Client(records), journal, ['www']).run().in_doubt) == ['add:www']
+    assert make_job(Client(records), journal, ['www'], in_doubt='retry').run().succeeded == ['add:www']
+    assert records.added == ['www']
+
+
+def test_history_keeps_every_attempt(journal):
+    records = Records({'www': ValueError('Invalid TTL')})
+    assert list(make_job(Client(records), journal, ['www']).run().failed) == ['add:www']
+    assert make_job(Client(records), journal, ['www']).run().succeeded == ['add:www']
+    history = journal.history('add-records', 'add:www')
+    assert [entry.status for entry in history] == [PLANNED, STARTED, FAILED, STARTED, SUCCEEDED]
+    assert history[2].error == 'Invalid TTL' and history[4].result == {'status': 'Success', 'data': {'id': 2}}
+    assert [entry.status for entry in journal.entries('add-records')] == [SUCCEEDED]
+    assert journal.entries('add-records', FAILED) == []
@@ -0,0 +1,39 @@
+from cloudns_sdk.models import Record
+
+ROW = {'id': '42', 'host': 'www', 'type': 'MX', 'record': 'mail.example.com', 'ttl': '3600', 'status': '1',
+       'failover': '0', 'dynamicurl_status': '0', 'priority': '10'}
+
+
+def test_numeric_fields_are_converted_lazily():
+    record = Record.from_dict(ROW, zone='example.com')
+    assert record._ttl == '3600'
+    assert record.ttl == 3600 and record._ttl == 3600
+    assert (record.id, record.status, record.failover, record.dynamicurl_status) == (42, 1, 0, 0)
+
+
+def test_non_numeric_values_are_kept():
+    assert Record('abc', ttl='').ttl == ''
+    assert Record(None).id is None
+
+
+def test_type_specific_fields_go_to_extra():
+    record = Record.from_dict(ROW)
+    assert record.extra == {'priority': '10'}
+    assert record.get('priority') == '10' and record.get('ttl') == 3600
+    assert record.get('port', 0) == 0
+    assert Record.from_dict({'id': '1', 'host': 'a', 'type': 'A', 'record': '192.0.2.1'})._extra is None
+
+
+def test_to_dict_round_trip():
+    record = Record.from_dict(ROW, zone='example.com')
+    assert record.to_dict() == dict(ROW, id=42, ttl=3600, status=1, failover=0, dynamicurl_status=0)
+    assert Record.from_dict(record.to_dict(), zone='example.com') == record
+
+
+def test_from_pages_handles_empty_pages():
+    pages = [{'42': ROW}, [], {'43': dict(ROW, id='43')}]
+    records = list(Record.from_pages(pages, zone='example.com'))
+    assert [record.id for record in records] == [42, 43]
+    assert records[0].host is records[1].host
+    assert records[0].key() == ('example.com', 'www', 'MX', 'mail.example.com', 3600)
+    assert len({records[0], Record.from_dict(ROW, zone='example.com')}) == 1
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from cloudns_sdk.api import ClouDNSAPI
+from cloudns_sdk.pipeline import Pipeline, modify_records, zone_records
+
+
+class RecordingClient:
+    def __init__(self, pages=None):
+        self.calls = []
+        self.pages = pages or {}
+        self.api = ClouDNSAPI('1', 'secret')
+        self.api.make_request = self.make_request
+        self.api._init_apis()
+
+    def make_request(self, endpoint, method='GET', params=None, data=None, lane=None):
+        self.calls.append((endpoint, dict(data or params)))
+        if endpoint == 'dns/records.json':
+            return self.pages.get(params['page'], [])
+        return {'status': 'Success'}
+
+
+LISTED_RECORDS = [
+    {'id': '1', 'type': 'MX', 'host': '', 'record': 'mail.example.com', 'ttl': '3600', 'priority': '10',
+     'status': 1, 'failover': '0'},
+    {'id': '2', 'type': 'SRV', 'host': '_sip._tcp', 'record': 'sip.example.com', 'ttl': '300', 'priority': '10',
+     'weight': '5', 'port': '5060', 'status': 1},
+    {'id': '3', 'type': 'CAA', 'host': '', 'record': '', 'ttl': '3600', 'caa_flag': '0', 'caa_type': 'issue',
+     'caa_value': 'letsencrypt.org', 'status': 1},
+    {'id': '4', 'type': 'A', 'host': 'www', 'record': '192.0.2.1', 'ttl': '3600', 'priority': '', 'status': 1},
+]
+
+
+def test_modify_records_converts_numeric_fields():
+    client = RecordingClient()
+    modify = modify_records(client.api.zone.records)
+    for record in LISTED_RECORDS:
+        zone, _, response = modify(('example.com', record))
+        assert zone == 'example.com' and response == {'status': 'Success'}
+    sent = {data['record-id']: data for endpoint, data in client.calls}
+    assert sent['1']['priority'] == 10 and sent['1']['ttl'] == 3600
+    assert (sent['2']['weight'], sent['2']['port']) == (5, 5060)
+    assert sent['3']['caa_flag'] == 0
+    assert 'priority' not in sent['4']
+    assert all('type' not in data and 'status' not in data for data in sent.values())
+
+
+def test_pipeline_from_listing_to_modify():
+    pages = {1: {record['id']: record for record in LISTED_RECORDS[:2]}}
+    client = RecordingClient(pages)
+    records = client.api.zone.records
+
+    def lower_ttl(item):
+        zone, record = item
+        return (zone, dict(record, ttl='300')) if record['ttl'] != '300' else None
+
+    pipeline = (Pipeline(['example.com'])
+                .flat_map(zone_records(records, rows_per_page=10))
+                .map(lower_ttl)
+                .filter(None)
+                .map(modify_records(records), workers=2))
+    results = list(pipeline)
+    assert [record['id'] for _, record, _ in results] == ['1']
+    assert client.calls[-1][1]['ttl'] == 300
+
+
+def test_stage_errors_reach_the_consumer_or_on_error():
+    def fail(item):
+        if item == 2:
+            raise RuntimeError('bad item')
+        return item
+
+    with pytest.raises(RuntimeError):
+        list(Pipeline(range(5)).map(fail, workers=2))
+    errors = []
+    assert list(Pipeline(range(5)).map(fail, on_error=lambda item, e: errors.append(item))) == [0, 1, 3, 4]
+    assert errors == [2]
+
+
+def test_batch_and_async_iteration():
+    async def consume():
+        return [batch async for batch in Pipeline(range(7)).batch(3)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(consume()) == [[0, 1, 2], [3, 4, 5], [6]]
+    finally:
+        loop.close()
+
+
+def test_early_close_stops_the_stages():
+    produced = []
+
+    def source():
+        for item in range(10 ** 6):
+            produced.append(item)
+            yield item
+
+    for item in Pipeline(source(), buffer=4).map(lambda item: item * 2):
+        if item >= 10:
+            break
+    assert len(produced) < 100
@@ -0,0 +1,49 @@
+from cloudns_sdk.api import ClouDNSAPI
+from cloudns_sdk.planner import DRY_RUN_RESPONSE, is_write_endpoint
+
+
+def make_plan(allow_reads=False):
+    return ClouDNSAPI('1', 'secret').dry_run(allow_reads=allow_reads)
+
+
+def test_is_write_endpoint():
+    assert is_write_endpoint('dns/add-record.json')
+    assert is_write_endpoint('dns/import-records.json')
+    assert not is_write_endpoint('dns/records.json')
+    assert not is_write_endpoint('dns/list-zones.json')
+
+
+def test_register_domain_zone_with_list_params():
+    plan = make_plan()
+    response = plan.client.zone.register_domain_zone('example.com', 'master', ns=['ns1.example.com', 'ns2.example.com'])
+    assert response == DRY_RUN_RESPONSE
+    call, = plan.writes
+    assert call.endpoint == 'dns/register.json'
+    assert call.params == {'domain-name': 'example.com', 'zone-type': 'master',
+                           'ns[]': ['ns1.example.com', 'ns2.example.com']}
+
+
+def test_import_records_keeps_repeated_keys_and_drops_credentials():
+    plan = make_plan()
+    plan.client.zone.transfer.import_records('example.com', content='www 300 IN A 192.0.2.1',
+                                             record_types=['A', 'MX'])
+    call, = plan.writes
+    assert call.params['record-types[]'] == ['A', 'MX']
+    assert call.params['content'] == 'www 300 IN A 192.0.2.1'
+    assert 'auth-id' not in call.params and 'auth-password' not in call.params
+
+
+def test_reads_are_answered_empty_without_allow_reads():
+    plan = make_plan()
+    assert plan.client.zone.records.list_records('example.com') == []
+    assert len(plan) == 1 and not plan.writes
+
+
+def test_estimate_is_bounded_by_rate_and_concurrency():
+    plan = make_plan()
+    for record_id in range(10):
+        plan.client.zone.records.delete_record('example.com', record_id)
+    estimate = plan.estimate(rate=5, concurrency=1, default_latency=1.0)
+    assert estimate.writes == 10
+    assert estimate.seconds == 10.0
+    assert plan.estimate(rate=5, concurrency=10, default_latency=1.0).seconds == 3.0
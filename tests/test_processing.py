@@ -0,0 +1,58 @@
+from cloudns_sdk.exceptions import ClouDNSAPIException
+from cloudns_sdk.processing import ProcessPipeline, SnapshotDiffer, normalize_export
+from cloudns_sdk.snapshots import SnapshotStore, normalize_records
+
+
+class Transfer:
+    CONTENTS = {
+        'a.com': 'www 3600 IN A 192.0.2.1\n@ 3600 IN MX 10 mail.a.com.\n',
+        'b.com': 'www 3600 IN A 192.0.2.9\n',
+    }
+
+    def export_records_in_bind(self, domain_name):
+        if domain_name not in self.CONTENTS:
+            return {'status': 'Failed', 'statusDescription': 'Missing domain-name'}
+        return {'zone': self.CONTENTS[domain_name]}
+
+
+class Records:
+    def iter_record_pages(self, domain_name):
+        yield {'1': {'id': '1', 'host': 'www', 'type': 'A', 'record': '192.0.2.1', 'ttl': '3600'}}
+
+
+class Zone:
+    transfer = Transfer()
+    records = Records()
+
+
+def test_results_stream_in_order_with_errors():
+    with ProcessPipeline(Zone(), processes=2, io_workers=2, max_in_flight=2) as pipeline:
+        items = list(pipeline.run(['a.com', {'name': 'missing.com'}, 'b.com']))
+    assert [item.zone for item in items] == ['a.com', 'missing.com', 'b.com']
+    assert items[0].result == normalize_export('a.com', Transfer.CONTENTS['a.com'])
+    assert len(items[0].result.lines) == 2
+    assert isinstance(items[1].error, ClouDNSAPIException) and items[1].result is None
+
+
+def test_records_source():
+    pipeline = ProcessPipeline(Zone(), processes=1, source='records')
+    try:
+        item, = pipeline.run(['a.com'])
+    finally:
+        pipeline.close()
+    assert item.result.lines == ['www\t3600\tIN\tA\t192.0.2.1']
+
+
+def test_snapshot_differ(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.add('a.com', [{'host': 'www', 'type': 'A', 'record': '192.0.2.1', 'ttl': 3600},
+                        {'host': '', 'type': 'MX', 'record': 'mail.a.com', 'priority': 10, 'ttl': 3600}])
+    store.add('b.com', [{'host': 'www', 'type': 'A', 'record': '192.0.2.2', 'ttl': 3600}])
+    differ = SnapshotDiffer(store.root)
+    with ProcessPipeline(Zone(), processes=2) as pipeline:
+        items = {item.zone: item.result for item in pipeline.run(['a.com', 'b.com'], differ, differ.context(store))}
+    store.close()
+    assert items['a.com'] == ([], [])
+    assert [record['record'] for record in items['b.com'].added] == ['192.0.2.9']
+    assert [record['record'] for record in items['b.com'].removed] == ['192.0.2.2']
+    assert normalize_records(items['b.com'].added) == ['www\t3600\tIN\tA\t192.0.2.9']
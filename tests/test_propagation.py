@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+
+from cloudns_sdk.propagation import PropagationWatcher
+
+
+class ZoneAPI:
+    def __init__(self, converge_after):
+        self.converge_after = converge_after
+        self.polls = {}
+        self._lock = threading.Lock()
+
+    def is_updated(self, zone):
+        with self._lock:
+            self.polls[zone] = self.polls.get(zone, 0) + 1
+            polls = self.polls[zone]
+        if zone == 'broken.com':
+            return {'status': 'Failed', 'statusDescription': 'Missing domain-name.'}
+        return polls >= self.converge_after.get(zone, float('inf'))
+
+    def total(self):
+        with self._lock:
+            return sum(self.polls.values())
+
+
+def make_watcher(zone_api):
+    return PropagationWatcher(zone_api, max_workers=4, initial_interval=0.01, max_interval=0.02, max_errors=2)
+
+
+def test_zones_are_yielded_as_they_converge():
+    zone_api = ZoneAPI({'fast.com': 1, 'slow.com': 3})
+    watch = make_watcher(zone_api).watch(['slow.com', 'fast.com', 'broken.com'], timeout=5)
+    assert list(watch) == ['fast.com', 'slow.com']
+    assert list(watch.failed) == ['broken.com'] and not watch.pending and not watch.done
+
+
+def test_timeout_leaves_zones_pending():
+    watch = make_watcher(ZoneAPI({})).watch(['never.com'], timeout=0.1)
+    assert list(watch) == [] and watch.pending == {'never.com'}
+
+
+def test_async_consumer_breaking_early_stops_polling():
+    zone_api = ZoneAPI({'fast.com': 1})
+    watch = make_watcher(zone_api).watch(['fast.com', 'never.com'])
+
+    async def consume():
+        iterator = watch.__aiter__()
+        try:
+            async for zone in iterator:
+                return zone
+        finally:
+            await iterator.aclose()
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(consume()) == 'fast.com'
+    finally:
+        loop.close()
+    time.sleep(0.5)
+    polls = zone_api.total()
+    time.sleep(0.3)
+    assert zone_api.total() == polls
+
+
+def test_stop_ends_iteration_from_another_thread():
+    zone_api = ZoneAPI({})
+    watch = make_watcher(zone_api).watch(['never.com'])
+    threading.Timer(0.1, watch.stop).start()
+    started = time.monotonic()
+    assert list(watch) == []
+    assert time.monotonic() - started < 1.0 and watch.pending == {'never.com'}
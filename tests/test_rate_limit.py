@@ -0,0 +1,326 @@
+import hashlib
+import os
+import socket
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from cloudns_sdk.api import ClouDNSAPI
+from cloudns_sdk.exceptions import RateLimitQueueFull
+from cloudns_sdk.rate_limit import (AdaptiveRateLimiter, FileRateLimiter, Lane, PriorityScheduler, RateLimiter,
+                                    RedisRateLimiter, is_throttled, rate_limited)
+
+requires_fork = pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+
+
+def elapsed(limiter, calls):
+    started = time.monotonic()
+    for _ in range(calls):
+        limiter.acquire()
+    return time.monotonic() - started
+
+
+def response(status_code=200, payload=None):
+    return mock.Mock(status_code=status_code, json=mock.Mock(return_value=payload or {}))
+
+
+def test_rate_limiter_spaces_calls():
+    assert 0.15 <= elapsed(RateLimiter(50), 11) < 0.5
+
+
+def test_is_throttled():
+    assert is_throttled(response(429))
+    assert is_throttled(response(payload={'status': 'Failed', 'statusDescription': 'Too many requests.'}))
+    assert not is_throttled(response(payload={'status': 'Failed', 'statusDescription': 'Invalid record-id.'}))
+    assert not is_throttled(response(payload={'status': 'Success'}))
+    assert not is_throttled(response(502))
+
+
+def test_adaptive_limiter_decreases_once_per_cooldown_and_recovers():
+    limiter = AdaptiveRateLimiter(10, min_per_second=2, increase=2, cooldown=60)
+    limiter.record_throttle()
+    limiter.record_throttle()
+    assert limiter.rate == 5
+    for _ in range(3):
+        limiter.record_success()
+    assert 5 < limiter.rate <= 10
+    assert limiter.stats()['throttles'] == 2 and limiter.stats()['decreases'] == 1
+    for _ in range(100):
+        limiter.record_success()
+    assert limiter.rate == 10
+    limiter.cooldown = 0
+    for _ in range(5):
+        limiter.record_throttle()
+    assert limiter.rate == 2
+
+
+def test_throttled_requests_are_retried_and_reported():
+    limiter = AdaptiveRateLimiter(1000, cooldown=0)
+    session = mock.Mock()
+    session.get.side_effect = [response(429), response(payload={'status': 'Success'})]
+    api = ClouDNSAPI('1', 'secret', rate_limiter=limiter, session=session)
+    assert api.make_request('dns/records.json') == {'status': 'Success'}
+    assert session.get.call_count == 2
+    assert limiter.stats()['throttles'] == 1 and limiter.stats()['successes'] == 1
+
+
+class GatedLimiter:
+    def __init__(self):
+        self.slots = threading.Semaphore(0)
+
+    def acquire(self):
+        self.slots.acquire()
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_scheduler_shares_slots_by_lane_weight():
+    limiter = GatedLimiter()
+    scheduler = PriorityScheduler(limiter)
+    threads = [threading.Thread(target=scheduler.acquire, args=(lane,)) for lane in ['interactive', 'bulk'] * 8]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: sum(lane['waiting'] for lane in scheduler.stats().values()) == 16)
+
+    for _ in range(5):
+        limiter.slots.release()
+    wait_until(lambda: sum(lane['granted'] for lane in scheduler.stats().values()) == 5)
+    stats = scheduler.stats()
+    assert stats['interactive']['granted'] == 4 and stats['bulk']['granted'] == 1
+
+    for _ in range(11):
+        limiter.slots.release()
+    for thread in threads:
+        thread.join(5)
+    assert scheduler.stats()['bulk'] == {'waiting': 0, 'granted': 8, 'rejected': 0}
+
+
+def test_scheduler_lane_selection_and_queue_limit():
+    limiter = GatedLimiter()
+    scheduler = PriorityScheduler(limiter, [Lane('interactive'), Lane('bulk', max_queue=1)])
+    with pytest.raises(ValueError):
+        scheduler.acquire('unknown')
+    waiter = threading.Thread(target=scheduler.acquire, args=('bulk',))
+    waiter.start()
+    wait_until(lambda: scheduler.stats()['bulk']['waiting'] == 1)
+    with scheduler.lane('bulk'):
+        assert scheduler.current_lane() == 'bulk'
+        with pytest.raises(RateLimitQueueFull):
+            scheduler.acquire()
+    assert scheduler.current_lane() is None
+    limiter.slots.release()
+    waiter.join(5)
+    assert scheduler.stats()['bulk'] == {'waiting': 0, 'granted': 1, 'rejected': 1}
+
+
+@pytest.fixture
+def file_limiter(tmp_path):
+    pytest.importorskip('fcntl')
+    limiter = FileRateLimiter(50, str(tmp_path / 'ratelimit'))
+    yield limiter
+    limiter.close()
+
+
+def test_file_limiter_shares_slots_between_instances(file_limiter):
+    other = FileRateLimiter(50, file_limiter.path)
+    try:
+        started = time.monotonic()
+        for _ in range(5):
+            file_limiter.acquire()
+            other.acquire()
+        assert time.monotonic() - started >= 0.15
+    finally:
+        other.close()
+
+
+def test_file_limiter_recovers_from_a_clock_set_back(file_limiter):
+    now = time.time()
+    file_limiter.STATE.pack_into(file_limiter._map, 0, now + 3 * 24 * 3600 + 0.01, now + 3 * 24 * 3600)
+    assert elapsed(file_limiter, 2) < 0.1
+
+
+def test_file_limiter_keeps_a_legitimate_backlog(file_limiter):
+    now = time.time()
+    file_limiter.STATE.pack_into(file_limiter._map, 0, now + 0.2, now)
+    assert elapsed(file_limiter, 1) >= 0.15
+
+
+def test_file_limiter_keeps_a_deep_backlog(tmp_path):
+    pytest.importorskip('fcntl')
+    limiters = [FileRateLimiter(1, str(tmp_path / 'ratelimit')) for _ in range(2)]
+    try:
+        waits = [limiters[index % 2]._reserve(1.0) for index in range(120)]
+    finally:
+        for limiter in limiters:
+            limiter.close()
+    assert waits[0] <= 0 and 118 < waits[-1] <= 119
+    assert all(later > earlier for earlier, later in zip(waits, waits[1:]))
+
+
+@requires_fork
+def test_file_limiter_closes_inherited_descriptors_after_fork(file_limiter):
+    file_limiter.acquire()
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            before = len(os.listdir('/proc/self/fd'))
+            for _ in range(3):
+                file_limiter._pid = -1
+                file_limiter.acquire()
+            status = 0 if len(os.listdir('/proc/self/fd')) == before else 2
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+
+class FakeRedis:
+    """
+    RESP server emulating the commands RedisRateLimiter uses, with the GCRA script run in Python.
+    """
+
+    def __init__(self, password=None):
+        self.password = password
+        self.commands = []
+        self.scripts = {}
+        self.values = {}
+        self._lock = threading.Lock()
+        self._server = socket.socket()
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen()
+        self.port = self._server.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self):
+        self._server.close()
+
+    def flush_scripts(self):
+        with self._lock:
+            self.scripts.clear()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        reader = connection.makefile('rb')
+        with connection, reader:
+            while True:
+                line = reader.readline()
+                if not line:
+                    return
+                command = []
+                for _ in range(int(line[1:])):
+                    length = int(reader.readline()[1:])
+                    command.append(reader.read(length + 2)[:-2].decode())
+                connection.sendall(self._handle(command))
+
+    def _gcra(self, key, interval, tolerance):
+        now = int(time.time() * 1000000)
+        tat = max(self.values.get(key, now), now)
+        self.values[key] = tat + interval
+        return max(tat - tolerance - now, 0)
+
+    def _handle(self, command):
+        name = command[0].upper()
+        with self._lock:
+            self.commands.append(name)
+            if name == 'AUTH':
+                return b'+OK\r\n' if command[1] == self.password else b'-WRONGPASS invalid password\r\n'
+            if name == 'SELECT':
+                return b'+OK\r\n'
+            if name == 'SCRIPT' and command[1].upper() == 'LOAD':
+                sha = hashlib.sha1(command[2].encode()).hexdigest()
+                self.scripts[sha] = command[2]
+                return b'$40\r\n%s\r\n' % sha.encode()
+            if name == 'EVALSHA' and command[1] not in self.scripts:
+                return b'-NOSCRIPT No matching script. Please use EVAL.\r\n'
+            if name == 'EVAL':
+                self.scripts[hashlib.sha1(command[1].encode()).hexdigest()] = command[1]
+            if name in ('EVAL', 'EVALSHA'):
+                return b':%d\r\n' % self._gcra(command[3], int(command[4]), int(command[5]))
+        return b'-ERR unknown command\r\n'
+
+
+@pytest.fixture
+def redis_server():
+    server = FakeRedis(password='secret')
+    yield server
+    server.close()
+
+
+def redis_limiter(server, max_per_second=50, **kwargs):
+    return RedisRateLimiter(max_per_second, f'redis://:secret@127.0.0.1:{server.port}/2', **kwargs)
+
+
+def test_redis_limiter_paces_calls_across_instances(redis_server):
+    first, second = redis_limiter(redis_server), redis_limiter(redis_server)
+    started = time.monotonic()
+    for _ in range(5):
+        first.acquire()
+        second.acquire()
+    assert time.monotonic() - started >= 0.15
+    assert first.available and second.available
+    assert redis_server.commands[:3] == ['AUTH', 'SELECT', 'SCRIPT']
+    assert redis_server.commands.count('EVALSHA') == 10
+
+
+def test_redis_limiter_allows_bursts(redis_server):
+    assert elapsed(redis_limiter(redis_server, 10, burst=5), 5) < 0.1
+
+
+def test_redis_limiter_falls_back_to_eval_on_noscript(redis_server):
+    limiter = redis_limiter(redis_server)
+    limiter.acquire()
+    redis_server.flush_scripts()
+    limiter.acquire()
+    limiter.acquire()
+    assert redis_server.commands[-4:] == ['EVALSHA', 'EVALSHA', 'EVAL', 'EVALSHA']
+    assert limiter.available
+
+
+def test_redis_limiter_uses_fallback_while_store_is_down():
+    server = FakeRedis()
+    port = server.port
+    server.close()
+    fallback = RateLimiter(1000)
+    limiter = RedisRateLimiter(50, f'redis://127.0.0.1:{port}/0', fallback=fallback, retry_interval=60)
+    limiter.acquire()
+    assert not limiter.available
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started < 0.1
+
+
+def test_rate_limited_decorator_overlaps_calls():
+    running, overlapped = [0], [False]
+    lock = threading.Lock()
+
+    @rate_limited(100)
+    def call():
+        with lock:
+            running[0] += 1
+            overlapped[0] = overlapped[0] or running[0] > 1
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlapped[0] and time.monotonic() - started < 0.15
@@ -0,0 +1,65 @@
+from cloudns_sdk.api import ClouDNSAPI
+from cloudns_sdk.record_cache import SUPPRESSED_RESPONSE, RecordCache
+
+PAGE = {
+    '1': {'id': '1', 'host': 'www', 'type': 'A', 'record': '192.0.2.1', 'ttl': '3600', 'status': '1'},
+    '2': {'id': '2', 'host': '', 'type': 'CNAME', 'record': 'target.example.net', 'ttl': '300', 'status': '1'},
+}
+
+
+class Client:
+    def __init__(self, cache):
+        self.calls = []
+        self.api = ClouDNSAPI('1', 'secret', record_cache=cache)
+        self.api.make_request = self.make_request
+        self.api._init_apis()
+
+    def make_request(self, endpoint, method='GET', params=None, data=None, lane=None):
+        self.calls.append(endpoint)
+        if endpoint == 'dns/records.json':
+            return PAGE if params['page'] == 1 else []
+        if endpoint == 'dns/add-record.json':
+            return {'status': 'Success', 'data': {'id': 3}}
+        return {'status': 'Success'}
+
+    def writes(self):
+        return [endpoint for endpoint in self.calls if endpoint != 'dns/records.json']
+
+
+def test_unchanged_modify_is_suppressed():
+    cache = RecordCache()
+    client = Client(cache)
+    records = client.api.zone.records
+    assert records.modify_record('example.com', 1, host='WWW', record='192.0.2.1', ttl=3600) == SUPPRESSED_RESPONSE
+    assert records.modify_record('example.com', 2, record='target.example.net.', ttl=300) == SUPPRESSED_RESPONSE
+    assert client.calls == ['dns/records.json']
+    assert records.modify_record('example.com', 1, host='www', record='192.0.2.2', ttl=3600)['status'] == 'Success'
+    assert records.modify_record('example.com', 1, host='www', record='192.0.2.2', ttl=3600) == SUPPRESSED_RESPONSE
+    assert client.writes() == ['dns/mod-record.json']
+    assert cache.stats() == {'zones': 1, 'records': 2, 'suppressed': 3, 'sent': 1}
+
+
+def test_unknown_fields_are_never_assumed_equal():
+    client = Client(RecordCache())
+    client.api.zone.records.modify_record('example.com', 1, host='www', record='192.0.2.1', ttl=3600, priority=10)
+    client.api.zone.records.modify_record('example.com', 99, host='x', record='192.0.2.9')
+    assert client.writes() == ['dns/mod-record.json', 'dns/mod-record.json']
+
+
+def test_sdk_writes_keep_the_cache_current():
+    cache = RecordCache()
+    client = Client(cache)
+    records = client.api.zone.records
+    records.modify_record('example.com', 1, host='www', record='192.0.2.1', ttl=3600)
+    records.add_record('example.com', 'A', record='192.0.2.3', host='new', ttl=60)
+    assert cache.get('example.com', 3) == {'id': '3', 'host': 'new', 'type': 'A', 'record': '192.0.2.3',
+                                           'ttl': '60'}
+    records.change_record_status('example.com', 1, status=False)
+    assert cache.get('example.com', 1)['status'] == '0'
+    records.delete_record('example.com', 2)
+    assert cache.get('example.com', 2) is None
+
+    copy = cache.copy()
+    cache.invalidate('example.com')
+    assert cache.stats()['zones'] == 0
+    assert copy.stats() == {'zones': 1, 'records': 2, 'suppressed': 0, 'sent': 0}
@@ -0,0 +1,78 @@
+import pytest
+
+from cloudns_sdk.bulk import BulkExecutor
+from cloudns_sdk.importer import ChunkedImporter
+from cloudns_sdk.reverse import (iter_ptr_records, iter_reverse_zone_records, ptr_hostname, reverse_zone_name,
+                                 reverse_zones, submit_ptr_records)
+
+
+def test_reverse_zone_name():
+    assert reverse_zone_name('10.1.0.0/16') == '1.10.in-addr.arpa'
+    assert reverse_zone_name('2001:db8::/32') == '8.b.d.0.1.0.0.2.ip6.arpa'
+    with pytest.raises(ValueError):
+        reverse_zone_name('10.1.0.0/20')
+
+
+def test_reverse_zones_split_and_enclose():
+    assert [zone for zone, _ in reverse_zones('10.1.0.0/22')] == [f'{i}.1.10.in-addr.arpa' for i in range(4)]
+    assert [zone for zone, _ in reverse_zones('10.1.2.128/25')] == ['2.1.10.in-addr.arpa']
+
+
+def test_ptr_records():
+    records = list(iter_ptr_records('192.0.2.0/30', '{dashed}.example.com', hosts_only=True))
+    assert records == [
+        {'host': '1', 'type': 'PTR', 'record': '192-0-2-1.example.com', 'ttl': 3600},
+        {'host': '2', 'type': 'PTR', 'record': '192-0-2-2.example.com', 'ttl': 3600},
+    ]
+    assert ptr_hostname('host-{d}.{c}', next(iter(reverse_zones('192.0.2.7/32')))[1][0]) == 'host-7.2'
+
+
+def test_networks_sharing_a_zone_are_yielded_once():
+    pairs = list(iter_reverse_zone_records(['10.1.2.0/25', '10.1.3.0/24', '10.1.2.128/25'], '{dashed}.example.com'))
+    assert [zone for zone, _ in pairs] == ['2.1.10.in-addr.arpa', '3.1.10.in-addr.arpa']
+    assert sum(1 for _ in pairs[0][1]) == 256
+
+
+def test_ptr_import_starts_before_the_range_is_exhausted():
+    consumed = [0]
+
+    def records():
+        for record in iter_ptr_records('10.1.0.0/16', '{dashed}.example.com', zone='1.10.in-addr.arpa'):
+            consumed[0] += 1
+            yield record
+
+    class Transfer:
+        consumed_at_first_call = None
+
+        def import_records(self, domain_name, **kwargs):
+            if self.consumed_at_first_call is None:
+                self.consumed_at_first_call = consumed[0]
+            return {'status': 'Success'}
+
+    transfer = Transfer()
+    result = ChunkedImporter(transfer, max_records=1000).import_zone('1.10.in-addr.arpa', records())
+    assert result.records == 65536 and result.chunks == 66
+    assert transfer.consumed_at_first_call == 1001
+
+
+class Records:
+    def __init__(self):
+        self.added = 0
+
+    def add_record(self, domain_name, record_type, **kwargs):
+        self.added += 1
+        return {'status': 'Success'}
+
+
+class Client:
+    def __init__(self):
+        self.zone = type('Zone', (), {})()
+        self.zone.records = Records()
+
+
+def test_submit_ptr_records_with_bounded_executor():
+    client = Client()
+    with BulkExecutor(client, max_workers=4, max_pending=16) as bulk:
+        assert submit_ptr_records(bulk, ['10.1.0.0/22'], '{dashed}.example.com') == 1024
+    assert client.zone.records.added == 1024
+    assert bulk.stats()['pending'] == 0
@@ -0,0 +1,64 @@
+import pytest
+
+from cloudns_sdk.snapshots import SnapshotStore, blob_path, normalize_records, read_blob, snapshot_content
+
+RECORDS = [
+    {'id': '1', 'host': 'WWW', 'type': 'A', 'record': '192.0.2.1', 'ttl': '3600', 'status': '1'},
+    {'id': '2', 'host': '', 'type': 'MX', 'record': 'mail.example.com', 'ttl': '3600', 'priority': '10'},
+    {'id': '3', 'host': '', 'type': 'SOA', 'record': 'ns1.example.com', 'ttl': '3600'},
+]
+EXPORT = """\
+$ORIGIN example.com.
+@   3600 IN SOA ns1.example.com. admin.example.com. 2 7200 3600 1209600 300
+@   3600 IN MX  10 mail.example.com.
+www 3600 IN A   192.0.2.1
+"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    yield store
+    store.close()
+
+
+def test_normalize_ignores_ids_order_and_soa():
+    lines = normalize_records(RECORDS)
+    assert lines == normalize_records([dict(record, id='9') for record in reversed(RECORDS)])
+    assert lines == ['@\t3600\tIN\tMX\t10 mail.example.com.', 'www\t3600\tIN\tA\t192.0.2.1']
+
+
+def test_unchanged_zone_shares_one_blob(store):
+    first = store.add('example.com', RECORDS, taken_at=100)
+    second = store.add_export('example.com', {'zone': EXPORT}, taken_at=200)
+    third = store.add_pages('example.com', [{record['id']: record for record in RECORDS}, []], taken_at=300)
+    assert first.digest == second.digest == third.digest and first.record_count == 2
+    assert read_blob(store.root, first.digest) == normalize_records(RECORDS)
+    assert snapshot_content(normalize_records(RECORDS))[1] == first.digest
+    assert blob_path(store.root, first.digest).endswith(f"{first.digest[2:]}.gz")
+    assert store.diff_zone('example.com') == ([], [])
+    assert store.changed_zones(since=100, until=300) == []
+
+
+def test_diff_and_changed_zones(store):
+    store.add('example.com', RECORDS, taken_at=100)
+    store.add('example.org', RECORDS, taken_at=100)
+    changed = [dict(RECORDS[0], record='192.0.2.2'), RECORDS[1]]
+    store.add('example.com', changed, taken_at=200)
+
+    assert store.zones() == ['example.com', 'example.org']
+    assert store.latest('example.com', at=150).taken_at == 100
+    assert store.changed_zones(since=150, until=250) == ['example.com']
+    assert store.changed_zones(since=50, until=150) == ['example.com', 'example.org']
+
+    diff = store.diff_zone('example.com', until=250)
+    assert diff.added == [{'host': 'www', 'type': 'A', 'ttl': 3600, 'record': '192.0.2.2'}]
+    assert diff.removed == [{'host': 'www', 'type': 'A', 'ttl': 3600, 'record': '192.0.2.1'}]
+    assert store.diff_zone('example.com', since=50, until=250).removed == []
+
+
+def test_diff_without_zone_keeps_relative_names(store):
+    before = store.add('example.com', RECORDS[:1], taken_at=100)
+    after = store.add('example.com', RECORDS[:2], taken_at=200)
+    diff = store.diff(before, after)
+    assert diff.added == [{'host': '', 'type': 'MX', 'ttl': 3600, 'priority': 10, 'record': 'mail.example.com'}]